@@ -0,0 +1,89 @@
+"""
+Component data codecs compared: builds the same synthetic pages (card-heavy,
+like real content) once per codec and prints the database file size after
+VACUUM, the time to encode every component, and get_page_components latency.
+
+    python -m benchmarks.bench_codecs
+    python -m benchmarks.bench_codecs --pages 2000 --cards 8 --codecs json packed zlib
+"""
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+
+from database import codecs
+from database.db_handler import DBHandler
+
+
+def _card(rng, p, c):
+    return {
+        "image_src": f"https://cdn.example.com/images/{p}/{c}-{rng.randrange(10 ** 6)}.jpg",
+        "image_alt": f"Photo {c} for page {p}",
+        "title": rng.choice(["Admissions", "Research", "Campus life", "Alumni", "Events"]) + f" {c}",
+        "button_text": rng.choice(["Learn more", "Apply now", "Read the story"]),
+        "button_link": f"https://www.example.com/pages/{p}/section-{c}",
+        "bordered": rng.random() < 0.5,
+    }
+
+
+def _pages(count: int, cards: int, seed: int = 1):
+    rng = random.Random(seed)
+    for p in range(count):
+        yield f"Page {p}", [
+            ("header_section", {"heading": f"Welcome to page {p}", "text": "Lorem ipsum dolor sit amet. " * 4}),
+            ("cards_section", {"cards": [_card(rng, p, c) for c in range(cards)]}),
+            ("card_grid_4", {"cards": [_card(rng, p, c) for c in range(4)]}),
+            ("facts_table", {"rows": [{"label": f"Fact {r}", "value": str(rng.randrange(10 ** 4))} for r in range(6)]}),
+        ]
+
+
+def run(pages: int, cards: int, reads: int, codec_names):
+    tmp = tempfile.mkdtemp()
+    corpus = list(_pages(pages, cards))
+    components = [data for _, comps in corpus for _, data in comps]
+
+    print(f"{'codec':<8} {'DB MB':>7} {'vs json':>8} {'encode us':>10} {'load ms':>8} {'p95 ms':>7}")
+    baseline = None
+    for name in codec_names:
+        start = time.perf_counter()
+        for data in components:
+            codecs.encode(data, name)
+        encode_us = (time.perf_counter() - start) / len(components) * 1e6
+
+        db_path = os.path.join(tmp, f"{name}.db")
+        db = DBHandler(db_path)
+        db.set_codec(name)
+        with db.transaction():
+            for title, comps in corpus:
+                page_id = db.create_page(title)
+                for position, (ctype, data) in enumerate(comps, start=1):
+                    db.add_component(page_id, ctype, data, position)
+        db.conn.execute("VACUUM")
+        size = os.path.getsize(db_path)
+        baseline = baseline or size
+
+        page_ids = [row['id'] for row in db.get_pages()]
+        rng = random.Random(2)
+        timings = []
+        for _ in range(reads):
+            page_id = rng.choice(page_ids)
+            start = time.perf_counter()
+            db.get_page_components(page_id)
+            timings.append((time.perf_counter() - start) * 1000)
+        timings.sort()
+        print(
+            f"{name:<8} {size / (1024 * 1024):>7.2f} {size / baseline:>8.2f} {encode_us:>10.1f} "
+            f"{statistics.median(timings):>8.3f} {timings[int(len(timings) * 0.95)]:>7.3f}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", type=int, default=1000)
+    parser.add_argument("--cards", type=int, default=6, help="Cards in each page's cards section")
+    parser.add_argument("--reads", type=int, default=2000)
+    parser.add_argument("--codecs", nargs="+", choices=codecs.CODECS, default=list(codecs.CODECS))
+    args = parser.parse_args()
+    run(args.pages, args.cards, args.reads, args.codecs)
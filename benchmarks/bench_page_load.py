@@ -0,0 +1,100 @@
+"""
+Page load latency at scale: builds a synthetic database (default 10k pages,
+500k components) and times what RightPanel.load_page_details does.
+
+    python -m benchmarks.bench_page_load
+    python -m benchmarks.bench_page_load --pages 1000 --components-per-page 20
+
+Compares the indexed direct lookups (get_page + get_page_components) with the
+old pattern of filtering get_pages() in Python.
+"""
+import argparse
+import json
+import os
+import random
+import statistics
+import sqlite3
+import tempfile
+import time
+
+from database.db_handler import DBHandler, SORT_KEY_GAP
+
+_SAMPLE_DATA = json.dumps({"heading": "Heading", "paragraphs": ["Lorem ipsum dolor sit amet."] * 3})
+
+
+def build_db(path: str, pages: int, per_page: int) -> DBHandler:
+    db = DBHandler(path)
+    conn = db.conn
+    with db.transaction():
+        conn.executemany(
+            "INSERT INTO pages (id, title) VALUES (?, ?)",
+            ((i, f"Page {i}") for i in range(1, pages + 1)),
+        )
+        conn.executemany(
+            "INSERT INTO components (page_id, component_type, component_data, sort_key) VALUES (?, ?, ?, ?)",
+            (
+                (page_id, "info_section", _SAMPLE_DATA, pos * SORT_KEY_GAP)
+                for page_id in range(1, pages + 1)
+                for pos in range(1, per_page + 1)
+            ),
+        )
+    return db
+
+
+def _time_ms(fn, samples):
+    timings = []
+    for arg in samples:
+        start = time.perf_counter()
+        fn(arg)
+        timings.append((time.perf_counter() - start) * 1000)
+    timings.sort()
+    return {
+        "median_ms": statistics.median(timings),
+        "p95_ms": timings[int(len(timings) * 0.95) - 1],
+        "max_ms": timings[-1],
+    }
+
+
+def run(pages: int, per_page: int, samples: int):
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bench.db")
+        start = time.perf_counter()
+        db = build_db(path, pages, per_page)
+        print(f"Built {pages:,} pages / {pages * per_page:,} components in {time.perf_counter() - start:.1f}s")
+
+        page_ids = [random.randint(1, pages) for _ in range(samples)]
+
+        def load_direct(page_id):
+            db.get_page(page_id)
+            db.get_page_components(page_id)
+
+        def load_scan(page_id):
+            [p for p in db.get_pages() if p['id'] == page_id][0]
+            db.get_page_components(page_id)
+
+        results = {
+            "get_page + get_page_components": _time_ms(load_direct, page_ids),
+            "get_page_summary": _time_ms(db.get_page_summary, page_ids),
+            "get_pages() filter (old)": _time_ms(load_scan, page_ids[: max(1, samples // 10)]),
+        }
+
+        # Same query without the (page_id, sort_key) index, for comparison
+        db.conn.execute("DROP INDEX idx_components_page_sort")
+        results["get_page_components without index"] = _time_ms(
+            db.get_page_components, page_ids[: max(1, samples // 10)]
+        )
+
+        width = max(len(name) for name in results)
+        for name, r in results.items():
+            print(f"{name:<{width}}  median {r['median_ms']:8.3f} ms  p95 {r['p95_ms']:8.3f} ms  max {r['max_ms']:8.3f} ms")
+        db.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", type=int, default=10_000)
+    parser.add_argument("--components-per-page", type=int, default=50)
+    parser.add_argument("--samples", type=int, default=200)
+    args = parser.parse_args()
+    print(f"SQLite {sqlite3.sqlite_version}")
+    run(args.pages, args.components_per_page, args.samples)
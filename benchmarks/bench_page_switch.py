@@ -0,0 +1,69 @@
+"""
+Page switching latency and memory over a long session: loads pages into the
+real RightPanel (offscreen, no display needed) hundreds of times and prints
+latency and resident memory per block of switches. Both should stay flat.
+
+    python -m benchmarks.bench_page_switch
+    python -m benchmarks.bench_page_switch --switches 1000 --components-per-page 5
+"""
+import argparse
+import os
+import statistics
+import tempfile
+import time
+
+from controllers import component_registry
+from database.db_handler import DBHandler
+
+_TYPES = component_registry.type_names()
+
+
+def run(pages: int, per_page: int, switches: int, block: int):
+    tmp = tempfile.mkdtemp()
+    db_path = os.path.join(tmp, "bench.db")
+    db = DBHandler(db_path)
+    with db.transaction():
+        for p in range(pages):
+            page_id = db.create_page(f"Page {p}")
+            for pos in range(per_page):
+                ctype = _TYPES[(p + pos) % len(_TYPES)]
+                db.add_component(page_id, ctype, {"heading": f"Heading {p}.{pos}"}, pos + 1)
+    page_ids = [row['id'] for row in db.get_pages()]
+
+    # The panels open the default DB; point them at the synthetic one
+    os.environ["COMPONENTS_GENERATOR_DB"] = db_path
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from PyQt5.QtWidgets import QApplication
+    from PyQt5.QtCore import QEvent
+    from views.right_panel import RightPanel, _current_rss_bytes
+
+    app = QApplication.instance() or QApplication([])
+    panel = RightPanel()
+    panel.show()
+
+    print(f"{'switches':>9} {'median ms':>10} {'max ms':>8} {'RSS MB':>8} {'created':>8} {'reused':>7}")
+    timings = []
+    for i in range(1, switches + 1):
+        start = time.perf_counter()
+        panel.load_page_details(page_ids[i % len(page_ids)])
+        app.processEvents()
+        # Flush deleteLater() the way returning to the event loop would
+        app.sendPostedEvents(None, QEvent.DeferredDelete)
+        timings.append((time.perf_counter() - start) * 1000)
+        if i % block == 0:
+            rss = _current_rss_bytes()
+            print(
+                f"{i:>9} {statistics.median(timings):>10.2f} {max(timings):>8.2f} "
+                f"{(rss or 0) / (1024 * 1024):>8.1f} {panel.form_pool.created:>8} {panel.form_pool.reused:>7}"
+            )
+            timings = []
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", type=int, default=20)
+    parser.add_argument("--components-per-page", type=int, default=5)
+    parser.add_argument("--switches", type=int, default=500)
+    parser.add_argument("--block", type=int, default=50)
+    args = parser.parse_args()
+    run(args.pages, args.components_per_page, args.switches, args.block)
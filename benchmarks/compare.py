@@ -0,0 +1,83 @@
+"""
+Compare two benchmark suite result files (see suite.py), corpus by corpus:
+
+    python -m benchmarks.compare baseline.json candidate.json
+    python -m benchmarks.compare baseline.json candidate.json --threshold 5 --all
+
+Metrics ending in _per_sec are better when higher; every other metric (_ms,
+_bytes, _s) is better when lower. Exits with status 1 if any metric got worse
+by more than --threshold percent, so it can gate CI. Single worst-case
+timings (_max_ms) are shown but never count as regressions: one scheduler
+hiccup moves them by more than any threshold.
+"""
+import argparse
+import json
+import sys
+
+
+# Corpus sizes recorded alongside the metrics; not better or worse
+_COUNTS = {"pages", "components"}
+
+
+def _key(result):
+    c = result["corpus"]
+    return c["pages"], tuple(c["components"]), c["seed"]
+
+
+def higher_is_better(metric: str) -> bool:
+    return metric.endswith("_per_sec")
+
+
+def compare(baseline, candidate, threshold):
+    """[(corpus key, metric, old, new, change %, regressed)] for metrics in both runs."""
+    old_results = {_key(r): r["metrics"] for r in baseline["results"]}
+    rows = []
+    for result in candidate["results"]:
+        key = _key(result)
+        old_metrics = old_results.get(key)
+        if old_metrics is None:
+            continue
+        for metric, new in result["metrics"].items():
+            old = old_metrics.get(metric)
+            if not isinstance(old, (int, float)) or not isinstance(new, (int, float)) or not old:
+                continue
+            change = (new - old) / old * 100
+            worse = -change if higher_is_better(metric) else change
+            gated = not metric.endswith("_max_ms") and metric not in _COUNTS
+            rows.append((key, metric, old, new, change, gated and worse > threshold))
+    return rows
+
+
+def _format(value):
+    return f"{value:,.3f}" if isinstance(value, float) else f"{value:,}"
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("baseline")
+    parser.add_argument("candidate")
+    parser.add_argument("--threshold", type=float, default=10.0, help="Regression threshold in percent (default: 10)")
+    parser.add_argument("--all", action="store_true", help="Show every metric, not just changes beyond the threshold")
+    args = parser.parse_args()
+
+    with open(args.baseline, encoding="utf-8") as f:
+        baseline = json.load(f)
+    with open(args.candidate, encoding="utf-8") as f:
+        candidate = json.load(f)
+
+    print(f"baseline:  {baseline['environment'].get('commit')} ({baseline['environment'].get('time')})")
+    print(f"candidate: {candidate['environment'].get('commit')} ({candidate['environment'].get('time')})")
+    rows = compare(baseline, candidate, args.threshold)
+    regressions = 0
+    current = None
+    for key, metric, old, new, change, regressed in rows:
+        if not (args.all or regressed or abs(change) > args.threshold):
+            continue
+        if key != current:
+            current = key
+            print(f"\n{key[0]} pages x {key[1][0]}-{key[1][1]} components (seed {key[2]})")
+        regressions += regressed
+        flag = "REGRESSED" if regressed else ""
+        print(f"    {metric:<34} {_format(old):>16} -> {_format(new):>16} {change:+8.1f}%  {flag}")
+    print(f"\n{regressions} regression(s) beyond {args.threshold:g}%")
+    sys.exit(1 if regressions else 0)
@@ -0,0 +1,166 @@
+"""
+Synthetic page corpora for the benchmarks: databases of any size (1 to 100k+
+pages, any number of components per page) mixing all registered component
+types, with data shaped like what the editor forms produce. Corpora are
+deterministic for a given seed, so runs on different machines or commits
+measure the same content.
+
+    python -m benchmarks.corpus out.db --pages 10000 --components 1 50
+"""
+import argparse
+import os
+import random
+import time
+from typing import Dict, Iterator, Optional, Tuple
+
+from controllers import component_registry
+from database.db_handler import DBHandler
+
+_WORDS = (
+    "campus research student faculty program degree alumni community science "
+    "history library admissions event health art music engineering global "
+    "innovation future learning discovery library partnership award"
+).split()
+
+
+def _sentence(rng: random.Random, words: int) -> str:
+    return " ".join(rng.choice(_WORDS) for _ in range(words)).capitalize() + "."
+
+
+def _image(rng: random.Random) -> str:
+    return f"https://cdn.example.com/images/{rng.randrange(10 ** 6)}.jpg"
+
+
+def _link(rng: random.Random) -> str:
+    return f"https://www.example.com/{rng.choice(_WORDS)}/{rng.randrange(10 ** 4)}"
+
+
+def _card(rng: random.Random, description: bool) -> Dict:
+    card = {
+        "image_src": _image(rng),
+        "image_alt": _sentence(rng, 3),
+        "title": _sentence(rng, 2),
+        "button_text": rng.choice(["Learn more", "Apply now", "Read the story"]),
+        "button_link": _link(rng),
+        "bordered": rng.random() < 0.5,
+    }
+    if description:
+        card["description"] = _sentence(rng, 12)
+    return card
+
+
+def component_data(component_type: str, rng: random.Random) -> Dict:
+    """Data for one component, shaped like the type's editor form output."""
+    if component_type == "header_section":
+        return {
+            "heading": _sentence(rng, 4),
+            "paragraphs": [_sentence(rng, rng.randint(10, 40)) for _ in range(rng.randint(1, 3))],
+            "buttons": [{"text": _sentence(rng, 2), "link": _link(rng)} for _ in range(rng.randint(0, 2))],
+            "image_src": _image(rng),
+            "image_alt": _sentence(rng, 3),
+            "image_caption": _sentence(rng, 6),
+        }
+    if component_type == "info_section":
+        return {
+            "heading": _sentence(rng, 4),
+            "paragraphs": [_sentence(rng, rng.randint(10, 40)) for _ in range(rng.randint(1, 4))],
+            "button_text": _sentence(rng, 2),
+            "button_link": _link(rng),
+            "image_src": _image(rng),
+            "image_alt": _sentence(rng, 3),
+        }
+    if component_type == "cards_section":
+        return {"cards": [_card(rng, False) for _ in range(rng.randint(2, 8))]}
+    if component_type == "card_grid_4":
+        return {"cards": [_card(rng, True) for _ in range(4)]}
+    if component_type == "facts_table":
+        return {
+            "facts": [
+                {"number": f"{rng.randrange(10 ** 5):,}", "description": _sentence(rng, 5)}
+                for _ in range(rng.randint(3, 8))
+            ]
+        }
+    # A type registered after this module was written: a generic heading
+    return {"heading": _sentence(rng, 4)}
+
+
+def iter_pages(
+    pages: int, components: Tuple[int, int], seed: int = 0
+) -> Iterator[Tuple[str, list]]:
+    """(title, [(type, data)]) for each page; components is a (min, max) count per page."""
+    rng = random.Random(seed)
+    types = component_registry.type_names()
+    for p in range(pages):
+        count = rng.randint(*components)
+        comps = []
+        for _ in range(count):
+            component_type = rng.choice(types)
+            comps.append((component_type, component_data(component_type, rng)))
+        yield f"{_sentence(rng, 3)[:-1]} {p}", comps
+
+
+def build(
+    path: str,
+    pages: int,
+    components: Tuple[int, int] = (1, 20),
+    seed: int = 0,
+    progress=None,
+    chunk_pages: int = 1000,
+) -> DBHandler:
+    """Create a corpus database at path (which must not exist yet)."""
+    if os.path.exists(path):
+        raise FileExistsError(path)
+    db = DBHandler(path)
+    done = 0
+    page_iter = iter_pages(pages, components, seed)
+    while done < pages:
+        chunk = [(title, None, comps) for title, comps in _take(page_iter, chunk_pages)]
+        with db.transaction():
+            db.insert_pages(chunk)
+        done += len(chunk)
+        if progress:
+            progress(done, pages)
+    return db
+
+
+def cached(
+    directory: str, pages: int, components: Tuple[int, int], seed: int = 0, progress=None
+) -> Tuple[str, Optional[float]]:
+    """
+    Path of a corpus database in directory, building it on first use (they
+    take a while at 100k pages). Returns (path, build seconds or None if reused).
+    """
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, f"corpus-{pages}p-{components[0]}-{components[1]}c-s{seed}.db")
+    if os.path.exists(path):
+        return path, None
+    start = time.perf_counter()
+    partial = path + ".partial"
+    if os.path.exists(partial):
+        os.remove(partial)
+    build(partial, pages, components, seed, progress).close()
+    os.replace(partial, path)
+    return path, time.perf_counter() - start
+
+
+def _take(iterator, n):
+    for _ in range(n):
+        item = next(iterator, None)
+        if item is None:
+            return
+        yield item
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("path")
+    parser.add_argument("--pages", type=int, default=1000)
+    parser.add_argument("--components", type=int, nargs=2, default=(1, 20), metavar=("MIN", "MAX"))
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    start = time.perf_counter()
+    build(
+        args.path, args.pages, tuple(args.components), args.seed,
+        progress=lambda done, total: print(f"\r{done}/{total} pages", end=""),
+    )
+    print(f"\nBuilt {args.path} in {time.perf_counter() - start:.1f}s")
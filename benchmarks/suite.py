@@ -0,0 +1,245 @@
+"""
+Benchmark suite: builds synthetic corpora (see corpus.py), then measures page
+load and save latency (PageController), render throughput (PageGenerator,
+with and without render cache hits), database size and peak memory for each.
+Runs headless; nothing here imports PyQt5.
+
+    python -m benchmarks.suite                      # quick preset
+    python -m benchmarks.suite --preset full        # up to 100k pages
+    python -m benchmarks.suite --corpus 5000:1-200 --samples 100 -o results.json
+
+Each corpus runs in a fresh process, so peak memory is per corpus. Results
+are written as JSON (benchmarks/results/<time>-<commit>.json by default);
+compare two runs with benchmarks/compare.py. Corpora are cached between runs
+in --corpus-dir, keyed by size and seed.
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import shutil
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+
+from benchmarks import corpus
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# (pages, (min components, max components)) per corpus
+PRESETS = {
+    "quick": [(1, (1, 1)), (100, (1, 20)), (1000, (1, 50))],
+    "full": [(1, (1, 1)), (100, (1, 20)), (1000, (1, 50)), (1000, (150, 200)), (10_000, (1, 50)), (100_000, (1, 10))],
+}
+
+_RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+
+
+def _latency(timings):
+    timings = sorted(timings)
+    return {
+        "median_ms": statistics.median(timings),
+        "p95_ms": timings[max(0, int(len(timings) * 0.95) - 1)],
+        "max_ms": timings[-1],
+    }
+
+
+def _timed(fn, args):
+    timings = []
+    for arg in args:
+        start = time.perf_counter()
+        fn(arg)
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def _db_bytes(path):
+    return sum(os.path.getsize(p) for p in (path, path + "-wal") if os.path.exists(p))
+
+
+def _peak_rss_bytes():
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes on Linux, bytes on macOS
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def _flatten(prefix, stats):
+    return {f"{prefix}_{name}": value for name, value in stats.items()}
+
+
+def measure(path, samples, seed=0):
+    """Every metric for one corpus database; runs in its own process (see run())."""
+    from controllers.page_controller import PageController
+    from controllers.page_generator import PageGenerator
+    from database.db_handler import DBHandler
+
+    metrics = {"db_bytes": _db_bytes(path)}
+    rng = random.Random(seed)
+
+    # Saves modify the database, so they run against a copy
+    work_dir = tempfile.mkdtemp()
+    work_path = os.path.join(work_dir, "work.db")
+    shutil.copyfile(path, work_path)
+    try:
+        db = DBHandler(work_path)
+        controller = PageController(db)
+        page_ids = [row[0] for row in db.conn.execute("SELECT id FROM pages")]
+        sample = [rng.choice(page_ids) for _ in range(samples)]
+        metrics["pages"] = len(page_ids)
+        metrics["components"] = db.conn.execute("SELECT COUNT(*) FROM components").fetchone()[0]
+
+        # ---- load ----
+        metrics.update(_flatten("load", _latency(_timed(controller.get_page_details, sample))))
+        details = {page_id: controller.get_page_details(page_id) for page_id in set(sample)}
+
+        # ---- render: cold (every component rendered by Jinja2), then warm (cache hits) ----
+        generator = PageGenerator()
+
+        def render(page_id):
+            return "".join(generator.iter_page_content(details[page_id]['components'], True, True))
+
+        def render_cold(page_id):
+            generator.render_cache.clear()
+            return render(page_id)
+
+        render(sample[0])  # compile templates, read CSS
+        component_count = sum(len(details[page_id]['components']) for page_id in sample)
+        output_bytes = sum(len(render(page_id).encode("utf-8")) for page_id in sample)
+        for mode, fn in (("cold", render_cold), ("warm", render)):
+            start = time.perf_counter()
+            for page_id in sample:
+                fn(page_id)
+            elapsed = time.perf_counter() - start
+            metrics[f"render_{mode}_pages_per_sec"] = len(sample) / elapsed
+            metrics[f"render_{mode}_components_per_sec"] = component_count / elapsed
+            metrics[f"render_{mode}_mb_per_sec"] = output_bytes / elapsed / (1024 * 1024)
+
+        # ---- save: one changed component, then every component changed ----
+        def save(page_id, changed):
+            components = [
+                dict(comp, data=dict(comp['data'], bench_edit=time.perf_counter_ns()) if i < changed else comp['data'])
+                for i, comp in enumerate(details[page_id]['components'])
+            ]
+            controller.save_page(page_id, details[page_id]['page']['title'], components)
+
+        metrics.update(_flatten("save_one", _latency(_timed(lambda p: save(p, 1), sample))))
+        metrics.update(_flatten("save_all", _latency(_timed(lambda p: save(p, len(details[p]['components'])), sample))))
+
+        # ---- memory: Python allocations while loading and rendering the sample ----
+        generator.render_cache.clear()
+        tracemalloc.start()
+        for page_id in sample:
+            components = controller.get_page_details(page_id)['components']
+            "".join(generator.iter_page_content(components, True, True))
+        metrics["peak_traced_bytes"] = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        metrics["peak_rss_bytes"] = _peak_rss_bytes()
+        db.close()
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+    return metrics
+
+
+def _environment():
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True,
+            cwd=os.path.dirname(_RESULTS_DIR),
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "time": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "commit": commit,
+        "python": platform.python_version(),
+        "sqlite": sqlite3.sqlite_version,
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+    }
+
+
+def run(corpora, samples, corpus_dir, seed=0):
+    results = []
+    for pages, components in corpora:
+        path, build_s = corpus.cached(
+            corpus_dir, pages, components, seed,
+            progress=lambda done, total: print(f"\r  building: {done}/{total} pages", end="", file=sys.stderr),
+        )
+        if build_s is not None:
+            print(file=sys.stderr)
+        # A fresh process per corpus keeps peak memory (and caches) separate
+        with ProcessPoolExecutor(max_workers=1, mp_context=get_context("spawn")) as pool:
+            metrics = pool.submit(measure, path, samples, seed).result()
+        if build_s is not None:
+            metrics["build_s"] = build_s
+        result = {
+            "corpus": {"pages": pages, "components": list(components), "seed": seed, "samples": samples},
+            "metrics": metrics,
+        }
+        results.append(result)
+        _print_result(result)
+    return {"environment": _environment(), "results": results}
+
+
+def _print_result(result):
+    c, m = result["corpus"], result["metrics"]
+    print(
+        f"{c['pages']:>7} pages x {c['components'][0]}-{c['components'][1]} components "
+        f"({m['components']:,} total, {m['db_bytes'] / (1024 * 1024):.1f} MB)\n"
+        f"    load      median {m['load_median_ms']:7.3f} ms   p95 {m['load_p95_ms']:7.3f} ms\n"
+        f"    save one  median {m['save_one_median_ms']:7.3f} ms   p95 {m['save_one_p95_ms']:7.3f} ms\n"
+        f"    save all  median {m['save_all_median_ms']:7.3f} ms   p95 {m['save_all_p95_ms']:7.3f} ms\n"
+        f"    render    cold {m['render_cold_pages_per_sec']:9.1f} pages/s   "
+        f"warm {m['render_warm_pages_per_sec']:9.1f} pages/s\n"
+        f"    memory    traced peak {m['peak_traced_bytes'] / (1024 * 1024):.1f} MB   "
+        f"RSS peak {(m['peak_rss_bytes'] or 0) / (1024 * 1024):.1f} MB"
+    )
+
+
+def _parse_corpus(spec):
+    """"PAGES:MIN-MAX" or "PAGES:N" -> (pages, (min, max))"""
+    try:
+        pages, _, components = spec.partition(":")
+        low, _, high = (components or "1-20").partition("-")
+        return int(pages), (int(low), int(high or low))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected PAGES:MIN-MAX, got {spec!r}") from None
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--preset", choices=sorted(PRESETS), default="quick")
+    parser.add_argument(
+        "--corpus", type=_parse_corpus, action="append",
+        help="PAGES:MIN-MAX components per page (repeatable; replaces the preset)",
+    )
+    parser.add_argument("--samples", type=int, default=200, help="Pages sampled per measurement")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--corpus-dir", default=os.path.join(tempfile.gettempdir(), "components-generator-bench"),
+        help="Where corpus databases are cached",
+    )
+    parser.add_argument("-o", "--output", help="Results file (default: benchmarks/results/<time>-<commit>.json)")
+    args = parser.parse_args()
+
+    report = run(args.corpus or PRESETS[args.preset], args.samples, args.corpus_dir, args.seed)
+    output = args.output
+    if output is None:
+        os.makedirs(_RESULTS_DIR, exist_ok=True)
+        stamp = time.strftime("%Y%m%d-%H%M%S")
+        output = os.path.join(_RESULTS_DIR, f"{stamp}-{report['environment']['commit'] or 'nogit'}.json")
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"Results written to {output}")
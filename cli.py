@@ -0,0 +1,295 @@
+"""
+Headless command line interface: render, export, list and import pages
+without starting the PyQt5 UI (safe to run in CI without a display server).
+
+    python -m cli list
+    python -m cli search "cdn.example.com"
+    python -m cli render 12 -o page_12.txt
+    python -m cli export out_dir --pages 1 2 3 --workers 4
+    python -m cli export site_dir --shared-css --css-url /sites/default/files/css/
+    python -m cli import pages.json            (or .ndjson, one page per line)
+    python -m cli codec packed
+    python -m cli compile-templates            (build step: precompile templates)
+    python -m cli --trace trace.json export out_dir
+
+--trace records query/render timings (controllers/instrumentation.py), writes
+them as a Chrome trace and prints the slowest operations to stderr.
+
+Never import PyQt5 (directly or through views/) from this module.
+"""
+import argparse
+import sys
+import time
+
+from controllers import instrumentation
+from database import codecs
+from database.db_handler import DBHandler
+
+
+def _open_db(args) -> DBHandler:
+    return DBHandler(args.db)
+
+
+def cmd_list(args) -> int:
+    db = _open_db(args)
+    for page in db.get_pages():
+        print(f"{page['id']}\t{page['title']}\t{page['created_at']}")
+    return 0
+
+
+def cmd_search(args) -> int:
+    db = _open_db(args)
+    pages = db.search(" ".join(args.text), limit=args.limit)
+    for page in pages:
+        print(f"{page['id']}\t{page['title']}")
+        for comp in page['components']:
+            snippet = " · ".join(comp['snippet'].split("\n"))
+            print(f"\tcomponent {comp['id']} ({comp['type']}): {snippet}")
+    return 0 if pages else 1
+
+
+def cmd_render(args) -> int:
+    # Imported here so list/import don't pay for Jinja2
+    from controllers.page_generator import get_page_generator
+
+    db = _open_db(args)
+    components = db.get_page_components(args.page_id)
+    if not components:
+        print(f"Page {args.page_id} has no components (or does not exist).", file=sys.stderr)
+        return 1
+
+    components = [{'type': c['type'], 'data': c['data']} for c in components]
+    generator = get_page_generator()
+    if not args.no_render_cache:
+        generator.render_cache.attach(db)
+    if args.output:
+        generator.export_page_to_file(components, args.output, minify_css=args.minify, merge_css=args.merge_css)
+    else:
+        generator.write_page_content(components, sys.stdout, minify_css=args.minify, merge_css=args.merge_css)
+    return 0
+
+
+def cmd_export(args) -> int:
+    from controllers.batch_exporter import BatchExporter
+
+    def on_progress(done, total, pages_per_sec):
+        if not args.quiet:
+            print(f"\r{done}/{total} pages ({pages_per_sec:.1f} pages/sec)", end="", file=sys.stderr)
+
+    db = _open_db(args)
+    exporter = BatchExporter(db, workers=args.workers, persist_render_cache=not args.no_render_cache)
+    result = exporter.export(
+        args.out_dir, args.pages, minify_css=args.minify, merge_css=args.merge_css,
+        progress=on_progress, incremental=args.incremental,
+        shared_css=args.shared_css, css_url=args.css_url, inline_fallback=args.inline_css_fallback,
+    )
+    if not args.quiet:
+        print(file=sys.stderr)
+    print(
+        f"Exported {result['exported']} page(s) to {result['output_dir']} "
+        f"in {result['elapsed']:.2f}s ({result['pages_per_sec']:.1f} pages/sec)"
+    )
+    if args.incremental:
+        print(f"Skipped {result['skipped']} unchanged page(s), removed {result['removed']} deleted page(s)")
+    if result['stylesheet']:
+        report = result['stylesheet_report']
+        print(
+            f"Shared stylesheet {result['stylesheet']}: {report['component_types']} component type(s), "
+            f"{report['output_bytes']:,} bytes"
+        )
+    for page_id, error in result['failed']:
+        print(f"Page {page_id} failed: {error}", file=sys.stderr)
+    return 1 if result['failed'] else 0
+
+
+def cmd_import(args) -> int:
+    """
+    Import pages from a JSON or NDJSON file: one page object, a list of them,
+    or one per line, each shaped like {"title": str, "components": [{"type":
+    str, "data": {...}}]}. Streams the file; an interrupted import resumes
+    where it stopped when run again (see controllers/page_importer.py).
+    """
+    from controllers.page_importer import PageImporter
+
+    def on_progress(bytes_read, size, totals):
+        if not args.quiet:
+            print(
+                f"\r{bytes_read * 100 // max(size, 1)}%  {totals['pages']} pages, "
+                f"{totals['components']} components ({totals['rows_per_sec']:.0f} rows/sec)",
+                end="", file=sys.stderr,
+            )
+
+    db = _open_db(args)
+    importer = PageImporter(db, chunk_size=args.chunk_size, strict=args.strict)
+    checkpoint = None if args.restart else importer.checkpoint(args.file)
+    if checkpoint is not None and not args.quiet:
+        print(f"Resuming after page {checkpoint['pages_read']} (byte {checkpoint['offset']})", file=sys.stderr)
+    try:
+        result = importer.import_file(args.file, progress=on_progress, restart=args.restart)
+    except ValueError as e:
+        if not args.quiet:
+            print(file=sys.stderr)
+        print(f"Import stopped: {e}", file=sys.stderr)
+        return 1
+    if not args.quiet:
+        print(file=sys.stderr)
+    print(
+        f"Imported {result['pages']} page(s), {result['components']} component(s) "
+        f"in {result['elapsed']:.2f}s ({result['rows_per_sec']:.0f} rows/sec)"
+    )
+    for page_number, error in result['errors']:
+        print(f"Skipped page {page_number}: {error}", file=sys.stderr)
+    if result['skipped'] > len(result['errors']):
+        print(f"... {result['skipped'] - len(result['errors'])} more page(s) skipped", file=sys.stderr)
+    return 1 if result['skipped'] else 0
+
+
+def cmd_codec(args) -> int:
+    """Show the component data codec, or switch to another and re-encode stored rows."""
+    db = _open_db(args)
+    if args.name is None:
+        print(db.codec)
+        return 0
+
+    def on_progress(done, total):
+        if not args.quiet:
+            print(f"\r{done}/{total} components", end="", file=sys.stderr)
+
+    rewritten = db.set_codec(args.name, progress=on_progress)
+    if not args.quiet:
+        print(file=sys.stderr)
+    print(f"Component data codec: {args.name} ({rewritten} component(s) re-encoded)")
+    if args.vacuum:
+        db.conn.execute("VACUUM")
+    return 0
+
+
+def cmd_rebalance(args) -> int:
+    """Respace component sort keys; saves do this for a page when they run out of room."""
+    db = _open_db(args)
+    pages, rows = db.rebalance_sort_keys(args.pages, only_cramped=not args.all)
+    print(f"Rebalanced {pages} page(s), {rows} component(s) rewritten")
+    return 0
+
+
+def cmd_compile_templates(args) -> int:
+    """Precompile the component templates into Python modules (a build step)."""
+    from controllers.page_generator import compile_templates
+
+    sources = compile_templates(args.out)
+    print(f"Compiled {len(sources)} template(s)")
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="cli", description="Components Generator (headless)")
+    parser.add_argument("--db", help="Path to the SQLite database (defaults to the app's user data DB)")
+    parser.add_argument("--timing", action="store_true", help="Print elapsed wall time to stderr")
+    parser.add_argument("--trace", metavar="FILE", help="Record query/render timings; write a Chrome trace to FILE")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p_list = sub.add_parser("list", help="List pages")
+    p_list.set_defaults(func=cmd_list)
+
+    p_search = sub.add_parser("search", help="Find pages by title or component content")
+    p_search.add_argument("text", nargs="+")
+    p_search.add_argument("--limit", type=int, default=50, help="Maximum number of pages (default: 50)")
+    p_search.set_defaults(func=cmd_search)
+
+    p_render = sub.add_parser("render", help="Render one page to stdout or a file")
+    p_render.add_argument("page_id", type=int)
+    p_render.add_argument("-o", "--output", help="Write to this file instead of stdout")
+    p_render.add_argument("--minify", action="store_true", help="Minify the page CSS")
+    p_render.add_argument(
+        "--merge-css", action="store_true", help="Merge repeated selectors and @media blocks in the page CSS"
+    )
+    p_render.add_argument("--no-render-cache", action="store_true", help="Don't read or write the DB render cache")
+    p_render.set_defaults(func=cmd_render)
+
+    p_export = sub.add_parser("export", help="Export many pages into a directory")
+    p_export.add_argument("out_dir")
+    p_export.add_argument("--pages", type=int, nargs="+", help="Page ids (default: all pages)")
+    p_export.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    p_export.add_argument("--minify", action="store_true", help="Minify the page CSS")
+    p_export.add_argument(
+        "--merge-css", action="store_true", help="Merge repeated selectors and @media blocks in the page CSS"
+    )
+    p_export.add_argument("--no-render-cache", action="store_true", help="Don't read or write the DB render cache")
+    p_export.add_argument(
+        "--incremental", action="store_true",
+        help="Only re-render pages changed since the last export into out_dir (per its export manifest)"
+    )
+    p_export.add_argument(
+        "--shared-css", action="store_true",
+        help="Write one content-hashed stylesheet for all exported pages and link it instead of inlining CSS"
+    )
+    p_export.add_argument(
+        "--css-url", default="", metavar="PREFIX",
+        help="URL prefix of the shared stylesheet in page links (default: same directory as the pages)"
+    )
+    p_export.add_argument(
+        "--inline-css-fallback", action="store_true",
+        help="With --shared-css, also keep each page's own <style> block (for fields that strip <link>)"
+    )
+    p_export.add_argument("-q", "--quiet", action="store_true", help="No progress output")
+    p_export.set_defaults(func=cmd_export)
+
+    p_import = sub.add_parser("import", help="Import pages from a JSON or NDJSON file")
+    p_import.add_argument("file")
+    p_import.add_argument("--chunk-size", type=int, default=500, help="Pages per transaction (default: 500)")
+    p_import.add_argument("--strict", action="store_true", help="Stop at the first invalid page instead of skipping it")
+    p_import.add_argument("--restart", action="store_true", help="Ignore the checkpoint of an interrupted import")
+    p_import.add_argument("-q", "--quiet", action="store_true", help="No progress output")
+    p_import.set_defaults(func=cmd_import)
+
+    p_codec = sub.add_parser("codec", help="Show or change how component data is stored")
+    p_codec.add_argument("name", nargs="?", choices=codecs.CODECS)
+    p_codec.add_argument("--vacuum", action="store_true", help="VACUUM afterwards to give freed space back to the OS")
+    p_codec.add_argument("-q", "--quiet", action="store_true", help="No progress output")
+    p_codec.set_defaults(func=cmd_codec)
+
+    p_rebalance = sub.add_parser("rebalance", help="Respace the sort keys that order components on a page")
+    p_rebalance.add_argument("--pages", type=int, nargs="+", help="Page ids (default: all pages)")
+    p_rebalance.add_argument("--all", action="store_true", help="Renumber every page, not only crowded ones")
+    p_rebalance.set_defaults(func=cmd_rebalance)
+
+    p_compile = sub.add_parser(
+        "compile-templates", help="Precompile component templates so the app never parses them at runtime"
+    )
+    p_compile.add_argument("--out", help="Output directory (default: templates/components_compiled)")
+    p_compile.set_defaults(func=cmd_compile_templates)
+    return parser
+
+
+def _write_trace(path, top=15):
+    instrumentation.export_chrome_trace(path)
+    print(f"Trace written to {path}; slowest operations (total ms):", file=sys.stderr)
+    for summary in instrumentation.histograms()[:top]:
+        print(
+            f"  {summary['total_ms']:10.1f}  {summary['count']:>7}x  p95 {summary['p95_ms']:8.3f}  "
+            f"{summary['category']}: {summary['name']}",
+            file=sys.stderr,
+        )
+
+
+def main(argv=None) -> int:
+    start = time.perf_counter()
+    args = build_parser().parse_args(argv)
+    if args.trace:
+        instrumentation.enable()
+    else:
+        instrumentation.enable_from_environment()
+    try:
+        return args.func(args)
+    finally:
+        if args.trace:
+            _write_trace(args.trace)
+        if args.timing:
+            print(f"[{args.command}] {(time.perf_counter() - start) * 1000:.1f} ms", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    # Bulk export uses a process pool; required if this is ever frozen
+    import multiprocessing
+    multiprocessing.freeze_support()
+    sys.exit(main())
@@ -0,0 +1,299 @@
+import hashlib
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from controllers import component_registry
+from controllers.export_manifest import ExportManifest, page_hash, settings_hash
+from controllers.page_generator import get_page_generator
+from controllers.render_cache import STORE_MAX_BYTES
+from database.db_handler import DBHandler
+
+# progress(done, total, pages_per_sec)
+ProgressCallback = Callable[[int, int, float], None]
+
+
+def export_file_name(page_id: int) -> str:
+    # Same naming as the single-page export dialog's default
+    return f"page_{page_id}.txt"
+
+
+def stylesheet_file_name(css: str) -> str:
+    # Named by content, so it can be cached forever: changed CSS gets a new name
+    return f"site.{hashlib.sha1(css.encode('utf-8')).hexdigest()[:12]}.css"
+
+
+def _is_stylesheet_file(name: str) -> bool:
+    return name.startswith("site.") and name.endswith(".css")
+
+
+def _init_worker(render_cache_db: Optional[str] = None):
+    # Warm the per-process generator once, before the first page arrives
+    generator = get_page_generator()
+    if render_cache_db is not None:
+        # Unchanged components are read back from the DB instead of re-rendered
+        generator.render_cache.attach(DBHandler(render_cache_db))
+
+
+def _render_page_job(job: Tuple[int, List[Dict[str, Any]], str, Dict[str, Any]]) -> Tuple[int, str]:
+    """Render one page and write it to out_dir. Runs inside a worker process."""
+    page_id, components, out_dir, options = job
+    path = os.path.join(out_dir, export_file_name(page_id))
+    get_page_generator().export_page_to_file(
+        [{'type': c['type'], 'data': c['data']} for c in components],
+        path,
+        minify_css=options['minify_css'],
+        merge_css=options['merge_css'],
+        stylesheet_href=options['stylesheet_href'],
+        inline_css=options['inline_css'],
+    )
+    return page_id, path
+
+
+class BatchExporter:
+    """
+    Exports many pages in one run: pages are streamed from the DB and rendered
+    in parallel across a process pool, one output file per page, listed in the
+    directory's export manifest.
+    """
+
+    def __init__(
+        self,
+        db: Optional[DBHandler] = None,
+        workers: Optional[int] = None,
+        persist_render_cache: bool = True,
+    ):
+        self.db = db or DBHandler()
+        self.workers = workers if workers is not None else (os.cpu_count() or 1)
+        # Keep rendered components in the DB so the next export can skip Jinja2
+        self.persist_render_cache = persist_render_cache
+
+    def export(
+        self,
+        out_dir: str,
+        page_ids: Optional[List[int]] = None,
+        minify_css: bool = False,
+        merge_css: bool = False,
+        progress: Optional[ProgressCallback] = None,
+        is_cancelled: Optional[Callable[[], bool]] = None,
+        incremental: bool = False,
+        shared_css: bool = False,
+        css_url: str = "",
+        inline_fallback: bool = False,
+    ) -> Dict[str, Any]:
+        """
+        Export page_ids (or every page when None) into out_dir, and record what
+        was written in its manifest (controllers/export_manifest.py). With
+        incremental, pages whose rendered inputs match the manifest are skipped
+        (those with an unchanged updated_at without even being read), and files
+        of pages deleted since are removed when exporting every page.
+
+        With shared_css, the CSS of every component type used by the exported
+        pages goes into one stylesheet named by its content hash (cacheable
+        indefinitely), and pages link to it (at css_url + its name) instead of
+        carrying a <style> block. inline_fallback keeps each page's own
+        <style> block as well, for places that strip <link> tags (such as a
+        Drupal body field with a restricted text format).
+
+        minify_css and merge_css apply to every page's CSS and to the shared
+        stylesheet (see PageGenerator.build_page_css).
+
+        is_cancelled() is polled between pages; pages already written are kept.
+        Returns a summary with exported/skipped/failed counts, elapsed time and pages/sec.
+        """
+        os.makedirs(out_dir, exist_ok=True)
+        total = len(page_ids) if page_ids is not None else self.db.count_pages()
+        render_cache_db = self.db.db_path if self.persist_render_cache else None
+
+        stylesheet, stylesheet_report = None, None
+        if shared_css:
+            stylesheet, stylesheet_report = self._write_stylesheet(out_dir, page_ids, minify_css, merge_css)
+        options = {
+            'minify_css': minify_css,
+            'merge_css': merge_css,
+            'stylesheet_href': css_url + stylesheet if stylesheet else None,
+            'inline_css': not stylesheet or inline_fallback,
+        }
+
+        # Always kept up to date, so a later incremental export can rely on it
+        manifest = ExportManifest.load(out_dir)
+        asset_versions = get_page_generator().asset_versions()
+        settings = settings_hash(asset_versions, options)
+        started_at = self.db.now()
+        rendering: Dict[int, Dict[str, Any]] = {}  # page_id -> manifest entry once written
+        seen = set()
+
+        start = time.perf_counter()
+        done = 0
+        skipped = 0
+        failed: List[Tuple[int, str]] = []
+        cancelled = False
+
+        def report():
+            if progress:
+                elapsed = time.perf_counter() - start
+                progress(done, total, done / elapsed if elapsed > 0 else 0.0)
+
+        def skip():
+            nonlocal done, skipped
+            done += 1
+            skipped += 1
+            report()
+
+        def jobs() -> Iterable[Tuple[int, List[Dict[str, Any]], str, Dict[str, Any]]]:
+            for page_id, updated_at in self.db.iter_page_updates(page_ids):
+                seen.add(page_id)
+                entry = manifest.pages.get(page_id)
+                current = (
+                    incremental and entry is not None
+                    and os.path.exists(os.path.join(out_dir, entry['file']))
+                )
+                if current and ExportManifest.unchanged_since(entry, updated_at, settings):
+                    skip()
+                    continue
+                components = self.db.get_page_components(page_id)
+                new_entry = {
+                    'file': export_file_name(page_id),
+                    'hash': page_hash(components, asset_versions, options),
+                    'settings': settings,
+                    'updated_at': updated_at,
+                    'exported_at': started_at,
+                    'stylesheet': stylesheet,
+                }
+                if current and entry['hash'] == new_entry['hash']:
+                    # Touched but not changed: refresh the stamp so next time it's skipped unread
+                    manifest.pages[page_id] = new_entry
+                    skip()
+                    continue
+                rendering[page_id] = new_entry
+                yield page_id, components, out_dir, options
+
+        def completed(page_id, error=None):
+            nonlocal done
+            entry = rendering.pop(page_id)
+            if error is None:
+                manifest.pages[page_id] = entry
+            else:
+                failed.append((page_id, str(error)))
+                # Whatever is on disk now isn't what the old entry describes
+                manifest.pages.pop(page_id, None)
+            done += 1
+
+        if self.workers <= 1:
+            # Small runs: skip the process start-up cost entirely
+            _init_worker(render_cache_db)
+            for job in jobs():
+                if is_cancelled and is_cancelled():
+                    cancelled = True
+                    break
+                try:
+                    _render_page_job(job)
+                except Exception as e:
+                    completed(job[0], e)
+                else:
+                    completed(job[0])
+                report()
+        else:
+            # Keep a bounded number of pages in flight so memory stays flat
+            max_in_flight = self.workers * 4
+            # Forking a process that has other threads running (e.g. when driven
+            # from a Qt worker thread) can deadlock the child; spawn instead.
+            mp_context = None
+            if threading.current_thread() is not threading.main_thread():
+                mp_context = multiprocessing.get_context("spawn")
+            with ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=mp_context,
+                initializer=_init_worker,
+                initargs=(render_cache_db,),
+            ) as pool:
+                pending = {}
+                for job in jobs():
+                    if is_cancelled and is_cancelled():
+                        cancelled = True
+                        break
+                    pending[pool.submit(_render_page_job, job)] = job[0]
+                    if len(pending) >= max_in_flight:
+                        finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+                        for fut in finished:
+                            page_id = pending.pop(fut)
+                            try:
+                                fut.result()
+                            except Exception as e:
+                                completed(page_id, e)
+                            else:
+                                completed(page_id)
+                        report()
+                for fut in list(pending):
+                    page_id = pending.pop(fut)
+                    if cancelled and fut.cancel():
+                        rendering.pop(page_id)
+                        continue
+                    try:
+                        fut.result()
+                    except Exception as e:
+                        completed(page_id, e)
+                    else:
+                        completed(page_id)
+                    report()
+
+        removed = 0
+        if incremental and page_ids is None and not cancelled:
+            for page_id in [page_id for page_id in manifest.pages if page_id not in seen]:
+                path = os.path.join(out_dir, manifest.pages.pop(page_id)['file'])
+                if os.path.exists(path):
+                    os.remove(path)
+                removed += 1
+        if not cancelled:
+            # Shared stylesheets no exported page links to any more
+            linked = {entry.get('stylesheet') for entry in manifest.pages.values()}
+            for name in os.listdir(out_dir):
+                if _is_stylesheet_file(name) and name != stylesheet and name not in linked:
+                    os.remove(os.path.join(out_dir, name))
+        manifest.save(out_dir)
+
+        if self.persist_render_cache:
+            self.db.prune_render_cache(STORE_MAX_BYTES)
+
+        elapsed = time.perf_counter() - start
+        return {
+            'output_dir': out_dir,
+            'exported': done - skipped - len(failed),
+            'skipped': skipped,
+            'removed': removed,
+            'stylesheet': stylesheet,
+            'stylesheet_report': stylesheet_report,
+            'failed': failed,
+            'elapsed': elapsed,
+            'pages_per_sec': done / elapsed if elapsed > 0 else 0.0,
+            'cancelled': cancelled,
+        }
+
+    def _write_stylesheet(self, out_dir, page_ids, minify_css, merge_css) -> Tuple[Optional[str], Dict[str, int]]:
+        """
+        Write the shared stylesheet for page_ids (unless an identical one is
+        already there). Returns its file name, or None if no used component
+        type has CSS, and the CSS size report.
+        """
+        used = self.db.component_types_in_use(page_ids)
+        # Registry order, so the same set of types always gives the same file
+        types = [component.name for component in component_registry.all_types() if component.name in used]
+        css, report = get_page_generator().build_page_css(types, minify=minify_css, merge=merge_css)
+        css = css.strip()
+        if not css:
+            return None, report
+        name = stylesheet_file_name(css)
+        path = os.path.join(out_dir, name)
+        if not os.path.exists(path):
+            tmp_path = f"{path}.tmp"
+            try:
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    f.write(css + "\n")
+                os.replace(tmp_path, path)
+            finally:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+        return name, report
@@ -0,0 +1,98 @@
+"""
+The component types the app knows about. Each type declares its menu title,
+its editor form (as "module:Class", imported on first use so startup doesn't
+pay for every form module), and its Jinja2 template and stylesheet file names.
+
+Adding a component type means adding its template/CSS/form files, one
+register() call at the bottom of this module, and a --hidden-import for the
+form module in the PyInstaller build (.github/workflows/build-exe-file.yml).
+
+Never import PyQt5 here: the CLI and export workers use this module too.
+"""
+import importlib
+import threading
+from typing import Dict, List, Optional
+
+
+class ComponentType:
+    def __init__(self, name: str, title: str, form: str, template: str, css: Optional[str]):
+        self.name = name
+        self.title = title
+        self.form = form          # "package.module:ClassName"
+        self.template = template  # file name under templates/components_html
+        self.css = css            # file name under templates/components_css, or None
+        self._form_class = None
+
+    def form_class(self):
+        """The editor form class, importing its module the first time it's needed."""
+        if self._form_class is None:
+            module_name, _, class_name = self.form.partition(":")
+            with _import_lock:
+                if self._form_class is None:
+                    self._form_class = getattr(importlib.import_module(module_name), class_name)
+        return self._form_class
+
+    def __repr__(self):
+        return f"ComponentType({self.name!r})"
+
+
+_import_lock = threading.Lock()
+# Registration order is menu order
+_registry: Dict[str, ComponentType] = {}
+
+
+def register(
+    name: str,
+    title: str,
+    form: str,
+    template: Optional[str] = None,
+    css: Optional[str] = "",
+) -> ComponentType:
+    """
+    Register a component type. template defaults to "<name>.html" and css to
+    "<name>.css"; pass css=None for a type without a stylesheet.
+    """
+    if name in _registry:
+        raise ValueError(f"Component type already registered: {name}")
+    component = ComponentType(
+        name,
+        title,
+        form,
+        template or f"{name}.html",
+        f"{name}.css" if css == "" else css,
+    )
+    _registry[name] = component
+    return component
+
+
+def get(name: str) -> ComponentType:
+    try:
+        return _registry[name]
+    except KeyError:
+        raise ValueError(f"Unknown component type: {name}") from None
+
+
+def is_registered(name: str) -> bool:
+    return name in _registry
+
+
+def all_types() -> List[ComponentType]:
+    return list(_registry.values())
+
+
+def type_names() -> List[str]:
+    return list(_registry)
+
+
+def title_for(name: str) -> str:
+    component = _registry.get(name)
+    return component.title if component is not None else name
+
+
+# ---------- built-in component types ----------
+
+register('facts_table', 'Facts Table', 'views.components.facts_table_form:FactsTableForm')
+register('header_section', 'Header Section', 'views.components.header_section_form:HeaderSectionForm')
+register('info_section', 'Info Section', 'views.components.info_section_form:InfoSectionForm')
+register('cards_section', 'Cards Section', 'views.components.cards_section_form:CardsSectionForm')
+register('card_grid_4', '4-Card Grid Section', 'views.components.card_grid_4_form:CardGrid4Form')
@@ -0,0 +1,336 @@
+import re
+from typing import List, Dict, Any, Iterable, Tuple, Set
+
+# A parsed stylesheet is a list of statements:
+#   {"kind": "rule",  "selector": str, "decls": [(prop, value), ...]}
+#   {"kind": "block", "prelude": str,  "children": [statements]}   (@media, @supports)
+#   {"kind": "raw",   "text": str}                                  (@font-face, @keyframes, @import...)
+
+_COMMENT_RE = re.compile(r"/\*.*?\*/", re.S)
+_WS_RE = re.compile(r"\s+")
+_COMBINATOR_RE = re.compile(r"\s*([,>+~])\s*")
+_STRING_RE = re.compile(r'"(?:[^"\\]|\\.)*"|\'(?:[^\'\\]|\\.)*\'', re.S)
+_TYPE_RE = re.compile(r"-?[_a-zA-Z][\w-]*")
+_ID_RE = re.compile(r"#(-?[_a-zA-Z][\w-]*)")
+
+# At-rules whose body is a list of normal rules we can merge into
+_NESTED_AT_RULES = ("@media", "@supports")
+
+
+def _collapse(text: str) -> str:
+    return _WS_RE.sub(" ", text).strip()
+
+
+def _outside_strings(text: str, fn) -> str:
+    """fn applied to the parts of text outside quoted strings."""
+    parts, pos = [], 0
+    for match in _STRING_RE.finditer(text):
+        parts.append(fn(text[pos:match.start()]))
+        parts.append(match.group())
+        pos = match.end()
+    parts.append(fn(text[pos:]))
+    return "".join(parts)
+
+
+def _collapse_value(text: str) -> str:
+    """_collapse, leaving quoted strings (content: "a  b") untouched."""
+    return _outside_strings(text, lambda part: _WS_RE.sub(" ", part)).strip()
+
+
+def _normalize_selector(selector: str) -> str:
+    # Quoted attribute values ([title="a > b"]) are part of what's matched
+    selector = _collapse_value(selector)
+    return _outside_strings(selector, lambda part: _COMBINATOR_RE.sub(r"\1", part))
+
+
+def _split_top_level(text: str, sep: str) -> List[str]:
+    """Split on sep, ignoring separators inside quotes or parentheses."""
+    parts, buf, depth, quote = [], [], 0, None
+    for ch in text:
+        if quote:
+            buf.append(ch)
+            if ch == quote:
+                quote = None
+            continue
+        if ch in ("'", '"'):
+            quote = ch
+        elif ch == "(":
+            depth += 1
+        elif ch == ")":
+            depth -= 1
+        elif ch == sep and depth == 0:
+            parts.append("".join(buf))
+            buf = []
+            continue
+        buf.append(ch)
+    parts.append("".join(buf))
+    return parts
+
+
+def _parse_decls(body: str) -> List[Tuple[str, str]]:
+    decls = []
+    for chunk in _split_top_level(body, ";"):
+        if ":" not in chunk:
+            continue
+        prop, value = chunk.split(":", 1)
+        prop, value = prop.strip(), _collapse_value(value)
+        # Custom properties (--name) are case-sensitive
+        if not prop.startswith("--"):
+            prop = prop.lower()
+        if prop and value:
+            decls.append((prop, value))
+    return decls
+
+
+def parse_css(css: str) -> List[Dict[str, Any]]:
+    """Parse a stylesheet into a flat statement list (nested for @media/@supports)."""
+    css = _COMMENT_RE.sub("", css)
+    statements: List[Dict[str, Any]] = []
+    i, n = 0, len(css)
+    while i < n:
+        # Skip whitespace between statements
+        while i < n and css[i].isspace():
+            i += 1
+        if i >= n:
+            break
+
+        # Find the end of the prelude: '{' for blocks, ';' for bodiless at-rules
+        j, quote = i, None
+        while j < n:
+            ch = css[j]
+            if quote:
+                if ch == quote:
+                    quote = None
+            elif ch in ("'", '"'):
+                quote = ch
+            elif ch in "{;":
+                break
+            j += 1
+
+        prelude = css[i:j].strip()
+        if j >= n or css[j] == ";":
+            if prelude:
+                statements.append({"kind": "raw", "text": _collapse(prelude) + ";"})
+            i = j + 1
+            continue
+
+        # Find the matching closing brace
+        depth, k, quote = 1, j + 1, None
+        while k < n and depth:
+            ch = css[k]
+            if quote:
+                if ch == quote:
+                    quote = None
+            elif ch in ("'", '"'):
+                quote = ch
+            elif ch == "{":
+                depth += 1
+            elif ch == "}":
+                depth -= 1
+            k += 1
+        body = css[j + 1:k - 1]
+
+        if prelude.startswith("@"):
+            if prelude.lower().startswith(_NESTED_AT_RULES):
+                statements.append({
+                    "kind": "block",
+                    "prelude": _collapse(prelude),
+                    "children": parse_css(body),
+                })
+            else:
+                statements.append({"kind": "raw", "text": f"{_collapse(prelude)}{{{_collapse(body)}}}"})
+        else:
+            statements.append({
+                "kind": "rule",
+                "selector": _normalize_selector(prelude),
+                "decls": _parse_decls(body),
+            })
+        i = k
+    return statements
+
+
+# ---------- merging ----------
+
+def _subject(complex_selector: str) -> str:
+    """The last compound of a (normalized) complex selector: what it matches elements by."""
+    start, depth, quote = 0, 0, None
+    for i, ch in enumerate(complex_selector):
+        if quote:
+            if ch == quote:
+                quote = None
+        elif ch in ("'", '"'):
+            quote = ch
+        elif ch in "([":
+            depth += 1
+        elif ch in ")]":
+            depth -= 1
+        elif depth == 0 and ch in " >+~":
+            start = i + 1
+    return complex_selector[start:]
+
+
+def _disjoint_compounds(a: str, b: str) -> bool:
+    # An element has one type and at most one id
+    type_a, type_b = _TYPE_RE.match(a), _TYPE_RE.match(b)
+    if type_a and type_b and type_a.group().lower() != type_b.group().lower():
+        return True
+    ids_a, ids_b = set(_ID_RE.findall(a)), set(_ID_RE.findall(b))
+    return bool(ids_a and ids_b and not ids_a & ids_b)
+
+
+def _disjoint(selector: str, other: str) -> bool:
+    """True only if no element can match both selectors (different ids or element types)."""
+    return all(
+        _disjoint_compounds(_subject(a), _subject(b))
+        for a in _split_top_level(selector, ",")
+        for b in _split_top_level(other, ",")
+    )
+
+
+def _statement_props(stmt: Dict[str, Any]) -> List[Tuple[str, Set[str]]]:
+    """(selector, property names) for every rule in a statement."""
+    if stmt["kind"] == "rule":
+        return [(stmt["selector"], {p for p, _ in stmt["decls"]})]
+    if stmt["kind"] == "block":
+        out = []
+        for child in stmt["children"]:
+            out.extend(_statement_props(child))
+        return out
+    # Unknown at-rules: treat as touching nothing (they don't set properties on elements)
+    return []
+
+
+def _may_conflict(selector: str, prop: str, between: List[Tuple[str, Set[str]]]) -> bool:
+    """
+    True if a rule in `between` may set `prop` on an element matched by
+    `selector`. Any rule setting it counts unless the two selectors provably
+    match different elements: distinct classes don't, since one element can
+    carry both (class="a b").
+    """
+    return any(prop in props and not _disjoint(selector, other) for other, props in between)
+
+
+def _is_important(value: str) -> bool:
+    return value.replace(" ", "").lower().endswith("!important")
+
+
+def _merge_decls(decls: List[Tuple[str, str]], later: List[Tuple[str, str]]):
+    """
+    Apply a later rule's declarations to an earlier one with the same selector.
+    Each property's later values (fallbacks like display:-webkit-box;display:flex
+    included) replace all of its earlier ones and go last, where they win.
+    """
+    for prop in dict.fromkeys(p for p, _ in later):
+        values = [v for p, v in later if p == prop]
+        earlier = [v for p, v in decls if p == prop]
+        # An earlier !important beats a later normal declaration
+        if any(map(_is_important, earlier)) and not any(map(_is_important, values)):
+            continue
+        decls[:] = [(p, v) for p, v in decls if p != prop]
+        decls.extend((prop, v) for v in values)
+
+
+def merge_statements(statements: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Merge rules with identical selectors into their first occurrence, and
+    @media/@supports blocks with identical preludes into their last occurrence
+    (media queries usually override the base rules that precede them).
+    A declaration (or block) is only moved when no rule it jumps over could
+    override it or be overridden by it, so the cascade is preserved.
+    """
+    out: List[Any] = []
+    rule_index: Dict[str, int] = {}
+    block_index: Dict[str, int] = {}
+
+    def props_between(idx: int) -> List[Tuple[str, Set[str]]]:
+        return [tp for s in out[idx + 1:] if s is not None for tp in _statement_props(s)]
+
+    for stmt in statements:
+        if stmt["kind"] == "rule":
+            stmt = {"kind": "rule", "selector": stmt["selector"], "decls": list(stmt["decls"])}
+            idx = rule_index.get(stmt["selector"])
+            if idx is not None:
+                between = props_between(idx)
+                kept, moved = [], []
+                for prop, value in stmt["decls"]:
+                    if _may_conflict(stmt["selector"], prop, between):
+                        kept.append((prop, value))
+                    else:
+                        moved.append((prop, value))
+                _merge_decls(out[idx]["decls"], moved)
+                stmt["decls"] = kept
+                if not kept:
+                    continue
+            rule_index[stmt["selector"]] = len(out)
+            out.append(stmt)
+
+        elif stmt["kind"] == "block":
+            stmt = {"kind": "block", "prelude": stmt["prelude"], "children": list(stmt["children"])}
+            idx = block_index.get(stmt["prelude"])
+            if idx is not None:
+                earlier = out[idx]
+                between = props_between(idx)
+                movable = all(
+                    not _may_conflict(selector, prop, between)
+                    for selector, props in _statement_props(earlier)
+                    for prop in props
+                )
+                if movable:
+                    stmt["children"] = earlier["children"] + stmt["children"]
+                    out[idx] = None
+            block_index[stmt["prelude"]] = len(out)
+            out.append(stmt)
+
+        else:
+            out.append(stmt)
+
+    out = [s for s in out if s is not None]
+    for stmt in out:
+        if stmt["kind"] == "block":
+            stmt["children"] = merge_statements(stmt["children"])
+    return [s for s in out if s["kind"] != "rule" or s["decls"]]
+
+
+# ---------- serialization ----------
+
+def serialize_css(statements: List[Dict[str, Any]], minify: bool = False, indent: str = "") -> str:
+    parts = []
+    for stmt in statements:
+        if stmt["kind"] == "rule":
+            if minify:
+                body = ";".join(f"{p}:{v}" for p, v in stmt["decls"])
+                parts.append(f"{stmt['selector']}{{{body}}}")
+            else:
+                selector = _outside_strings(stmt["selector"], lambda part: part.replace(",", ", "))
+                body = "".join(f"{indent}    {p}: {v};\n" for p, v in stmt["decls"])
+                parts.append(f"{indent}{selector} {{\n{body}{indent}}}")
+        elif stmt["kind"] == "block":
+            inner = serialize_css(stmt["children"], minify, indent + "    ")
+            if minify:
+                parts.append(f"{stmt['prelude']}{{{inner}}}")
+            else:
+                parts.append(f"{indent}{stmt['prelude']} {{\n{inner}\n{indent}}}")
+        else:
+            parts.append(f"{indent}{stmt['text']}")
+    return ("" if minify else "\n\n").join(parts)
+
+
+def combine_css(
+    sheets: Iterable[str],
+    minify: bool = False,
+    merge: bool = False,
+) -> str:
+    """
+    Combine already-deduplicated stylesheets into one. Without minify/merge the
+    sheets are joined verbatim; otherwise they're parsed and re-serialized.
+    """
+    sheets = [s.strip() for s in sheets if s and s.strip()]
+    if not (minify or merge):
+        return "\n\n".join(sheets)
+
+    statements: List[Dict[str, Any]] = []
+    for sheet in sheets:
+        statements.extend(parse_css(sheet))
+    if merge:
+        statements = merge_statements(statements)
+    return serialize_css(statements, minify=minify)
@@ -0,0 +1,87 @@
+"""
+The manifest a batch export leaves in its output directory. For every page
+written it records a hash of everything the file was rendered from (component
+types and data in page order, the versions of those types' templates and
+stylesheets, and the render options such as CSS minification or the shared
+stylesheet linked), plus the page's updated_at at the time.
+An incremental export compares against it and only re-renders pages whose
+hash changed (see BatchExporter.export).
+"""
+import json
+import os
+from typing import Any, Dict, List, Optional
+
+from database.db_handler import content_hash
+
+MANIFEST_NAME = "export-manifest.json"
+MANIFEST_VERSION = 1
+
+
+def page_hash(components: List[Dict[str, Any]], asset_versions: Dict[str, str], options: Dict[str, Any]) -> str:
+    """Hash of a page's rendered inputs; asset_versions as PageGenerator.asset_versions()."""
+    return content_hash({
+        "options": options,
+        "components": [
+            [comp['type'], content_hash(comp.get('data') or {}), asset_versions.get(comp['type'])]
+            for comp in components
+        ],
+    })
+
+
+def settings_hash(asset_versions: Dict[str, str], options: Dict[str, Any]) -> str:
+    """Hash of the inputs shared by every page: all templates, stylesheets and options."""
+    return content_hash({"options": options, "assets": asset_versions})
+
+
+class ExportManifest:
+    """
+    pages: page_id -> {'file', 'hash', 'settings', 'updated_at', 'exported_at',
+    'stylesheet'} ('exported_at' is when the run that wrote the entry started,
+    DB clock; 'stylesheet' the shared stylesheet file it links, or None).
+    """
+
+    def __init__(self, pages: Optional[Dict[int, Dict[str, Any]]] = None):
+        self.pages = pages or {}
+
+    @classmethod
+    def load(cls, out_dir: str) -> "ExportManifest":
+        """The manifest in out_dir; empty if there is none or it can't be used."""
+        try:
+            with open(os.path.join(out_dir, MANIFEST_NAME), encoding="utf-8") as f:
+                payload = json.load(f)
+        except (OSError, ValueError):
+            return cls()
+        if not isinstance(payload, dict) or payload.get("version") != MANIFEST_VERSION:
+            return cls()
+        return cls({int(page_id): entry for page_id, entry in payload.get("pages", {}).items()})
+
+    def save(self, out_dir: str):
+        # Via a temporary file: a half-written manifest would be worse than none
+        path = os.path.join(out_dir, MANIFEST_NAME)
+        tmp_path = f"{path}.tmp"
+        payload = {
+            "version": MANIFEST_VERSION,
+            "pages": {str(page_id): self.pages[page_id] for page_id in sorted(self.pages)},
+        }
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(payload, f, indent=1)
+            os.replace(tmp_path, path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    @staticmethod
+    def unchanged_since(entry: Dict[str, Any], updated_at: Optional[str], settings: str) -> bool:
+        """
+        True if the page can be skipped without reading it: same shared inputs
+        and the same updated_at as when exported. The stamp must also be older
+        than that run's start, or an edit in the same millisecond as the one
+        it recorded could have gone unnoticed.
+        """
+        return (
+            updated_at is not None
+            and entry.get("settings") == settings
+            and entry.get("updated_at") == updated_at
+            and updated_at < entry.get("exported_at", "")
+        )
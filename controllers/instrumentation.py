@@ -0,0 +1,358 @@
+"""
+Opt-in timing of the hot paths: every SQL statement (with its row count),
+commit and fetch; template loads, renders and CSS reads in PageGenerator;
+editor form construction, get_data() and set_data(). Timings are aggregated
+into per-operation histograms and kept as a bounded event log that exports
+as JSON or as a Chrome trace (chrome://tracing, https://ui.perfetto.dev).
+
+Off by default. Turn it on with COMPONENTS_GENERATOR_TRACE=1, the Diagnostics
+dialog (Ctrl+Shift+D in the app), `cli --trace trace.json ...`, or enable().
+While disabled each instrumented call site costs one module attribute check;
+database connections are only wrapped while it's enabled.
+
+Only the current process is recorded: bulk export worker processes are not.
+Never import PyQt5 here: the CLI and export workers use this module too.
+"""
+import json
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+# Read by every call site; flip it with enable()/disable()
+enabled = False
+
+# Oldest events are dropped past this; histograms keep counting
+MAX_EVENTS = 200_000
+
+# Longest SQL text kept as an operation name
+_SQL_NAME_LEN = 160
+
+_lock = threading.Lock()
+_origin_ns = time.perf_counter_ns()
+# (category, name, start ns since _origin_ns, duration ns, thread id, args or None)
+_events: "deque" = deque(maxlen=MAX_EVENTS)
+_histograms: Dict[tuple, "Histogram"] = {}
+_thread_names: Dict[int, str] = {}
+_sql_names: Dict[str, str] = {}
+
+
+class Histogram:
+    """Durations of one operation in power-of-two microsecond buckets."""
+
+    __slots__ = ("count", "total_ns", "min_ns", "max_ns", "rows", "buckets")
+
+    def __init__(self):
+        self.count = 0
+        self.total_ns = 0
+        self.min_ns = None
+        self.max_ns = 0
+        self.rows = 0
+        # buckets[i] counts durations below 2**i microseconds (and >= 2**(i-1))
+        self.buckets: List[int] = []
+
+    def add(self, duration_ns: int, rows: Optional[int]):
+        self.count += 1
+        self.total_ns += duration_ns
+        if self.min_ns is None or duration_ns < self.min_ns:
+            self.min_ns = duration_ns
+        if duration_ns > self.max_ns:
+            self.max_ns = duration_ns
+        if rows:
+            self.rows += rows
+        index = (duration_ns // 1000).bit_length()
+        if index >= len(self.buckets):
+            self.buckets.extend([0] * (index + 1 - len(self.buckets)))
+        self.buckets[index] += 1
+
+    def percentile_ms(self, fraction: float) -> float:
+        """Upper bound of the bucket holding that fraction of samples (capped at the max)."""
+        wanted = fraction * self.count
+        seen = 0
+        for index, count in enumerate(self.buckets):
+            seen += count
+            if seen >= wanted and count:
+                return min(2 ** index / 1000, self.max_ns / 1e6)
+        return self.max_ns / 1e6
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "total_ms": self.total_ns / 1e6,
+            "mean_ms": self.total_ns / self.count / 1e6 if self.count else 0.0,
+            "min_ms": (self.min_ns or 0) / 1e6,
+            "p50_ms": self.percentile_ms(0.50),
+            "p95_ms": self.percentile_ms(0.95),
+            "p99_ms": self.percentile_ms(0.99),
+            "max_ms": self.max_ns / 1e6,
+            "rows": self.rows,
+            "buckets_us": {f"<{2 ** i}": n for i, n in enumerate(self.buckets) if n},
+        }
+
+
+# ---------- switching on and off ----------
+
+def enable():
+    global enabled
+    from database import db_handler
+    db_handler.set_connection_wrapper(TracedConnection)
+    enabled = True
+
+
+def disable():
+    global enabled
+    from database import db_handler
+    enabled = False
+    db_handler.set_connection_wrapper(None)
+
+
+def reset():
+    """Forget every recorded event and histogram."""
+    with _lock:
+        _events.clear()
+        _histograms.clear()
+
+
+def enable_from_environment():
+    if os.environ.get("COMPONENTS_GENERATOR_TRACE", "").lower() in ("1", "true", "yes", "on"):
+        enable()
+
+
+# ---------- recording ----------
+
+def record(category: str, name: str, start_ns: int, duration_ns: int, rows: Optional[int] = None, **args):
+    """Record one finished operation; start_ns is a time.perf_counter_ns() value."""
+    thread = threading.current_thread()
+    if rows is not None:
+        args["rows"] = rows
+    with _lock:
+        histogram = _histograms.get((category, name))
+        if histogram is None:
+            histogram = _histograms[(category, name)] = Histogram()
+        histogram.add(duration_ns, rows)
+        _events.append((category, name, start_ns - _origin_ns, duration_ns, thread.ident, args or None))
+        if thread.ident not in _thread_names:
+            _thread_names[thread.ident] = thread.name
+
+
+@contextmanager
+def _span(category, name, args):
+    start = time.perf_counter_ns()
+    try:
+        yield
+    finally:
+        record(category, name, start, time.perf_counter_ns() - start, **args)
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return None
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+def span(category: str, name: str, **args):
+    """
+    Time a block:
+
+        with instrumentation.span("render", ctype):
+            ...
+
+    A shared do-nothing context manager while instrumentation is disabled.
+    """
+    if not enabled:
+        return _NULL_SPAN
+    return _span(category, name, args)
+
+
+def timed_iter(category: str, name: str, iterable: Iterable) -> Iterator:
+    """
+    Yield from iterable, timing only the time spent producing items (not the
+    consumer's work between them); recorded once it's exhausted or closed.
+    """
+    iterator = iter(iterable)
+    first = time.perf_counter_ns()
+    elapsed = 0
+    try:
+        while True:
+            start = time.perf_counter_ns()
+            try:
+                item = next(iterator)
+            except StopIteration:
+                elapsed += time.perf_counter_ns() - start
+                return
+            elapsed += time.perf_counter_ns() - start
+            yield item
+    finally:
+        record(category, name, first, elapsed)
+
+
+def sql_name(sql: str) -> str:
+    """Operation name for an SQL statement: whitespace collapsed, truncated."""
+    name = _sql_names.get(sql)
+    if name is None:
+        name = " ".join(sql.split())
+        if len(name) > _SQL_NAME_LEN:
+            name = name[:_SQL_NAME_LEN - 1] + "…"
+        if len(_sql_names) < 10_000:
+            _sql_names[sql] = name
+    return name
+
+
+# ---------- traced database connections ----------
+
+class TracedCursor:
+    """sqlite3.Cursor wrapper recording each statement and fetch."""
+
+    __slots__ = ("_cursor", "_sql")
+
+    def __init__(self, cursor):
+        self._cursor = cursor
+        self._sql = ""
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+    def _run(self, method, sql, *args):
+        self._sql = sql
+        start = time.perf_counter_ns()
+        try:
+            method(sql, *args)
+        finally:
+            duration = time.perf_counter_ns() - start
+            # rowcount is -1 for SELECTs; their rows are counted on fetch
+            rowcount = self._cursor.rowcount
+            record("db", sql_name(sql), start, duration, rows=rowcount if rowcount >= 0 else None)
+        return self
+
+    def execute(self, sql, parameters=()):
+        return self._run(self._cursor.execute, sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return self._run(self._cursor.executemany, sql, seq_of_parameters)
+
+    def executescript(self, script):
+        return self._run(self._cursor.executescript, script)
+
+    def _fetch(self, method, *args):
+        start = time.perf_counter_ns()
+        rows = method(*args)
+        record("db.fetch", sql_name(self._sql), start, time.perf_counter_ns() - start, rows=len(rows))
+        return rows
+
+    def fetchone(self):
+        start = time.perf_counter_ns()
+        row = self._cursor.fetchone()
+        record("db.fetch", sql_name(self._sql), start, time.perf_counter_ns() - start, rows=int(row is not None))
+        return row
+
+    def fetchmany(self, size=None):
+        return self._fetch(self._cursor.fetchmany, size or self._cursor.arraysize)
+
+    def fetchall(self):
+        return self._fetch(self._cursor.fetchall)
+
+    def __iter__(self):
+        return timed_iter("db.fetch", sql_name(self._sql), self._cursor)
+
+
+class TracedConnection:
+    """sqlite3.Connection wrapper whose cursors (and commits) are recorded."""
+
+    __slots__ = ("_conn",)
+
+    def __init__(self, conn):
+        self._conn = conn
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+    def cursor(self, *args):
+        return TracedCursor(self._conn.cursor(*args))
+
+    def execute(self, sql, parameters=()):
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return self.cursor().executemany(sql, seq_of_parameters)
+
+    def executescript(self, script):
+        return self.cursor().executescript(script)
+
+    def commit(self):
+        with span("db", "COMMIT"):
+            self._conn.commit()
+
+    def rollback(self):
+        with span("db", "ROLLBACK"):
+            self._conn.rollback()
+
+
+# ---------- reporting ----------
+
+def histograms() -> List[Dict[str, Any]]:
+    """One summary per operation, slowest total first."""
+    with _lock:
+        items = [(key, histogram.summary()) for key, histogram in _histograms.items()]
+    items.sort(key=lambda item: item[1]["total_ms"], reverse=True)
+    return [dict(category=category, name=name, **summary) for (category, name), summary in items]
+
+
+def event_count() -> int:
+    return len(_events)
+
+
+def export_json(path: str):
+    """Histograms plus the raw event log."""
+    with _lock:
+        events = list(_events)
+        threads = dict(_thread_names)
+    payload = {
+        "histograms": histograms(),
+        "events": [
+            {
+                "category": category, "name": name,
+                "start_ms": start / 1e6, "duration_ms": duration / 1e6,
+                "thread": threads.get(tid, str(tid)), "args": args or {},
+            }
+            for category, name, start, duration, tid, args in events
+        ],
+        "dropped_events": _dropped_events(len(events)),
+    }
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(payload, f, indent=1)
+
+
+def export_chrome_trace(path: str):
+    """The event log in Chrome's Trace Event format (complete "X" events, µs)."""
+    pid = os.getpid()
+    with _lock:
+        events = list(_events)
+        threads = dict(_thread_names)
+    trace = [
+        {"ph": "M", "name": "thread_name", "pid": pid, "tid": tid, "args": {"name": name}}
+        for tid, name in threads.items()
+    ]
+    trace.extend(
+        {
+            "ph": "X", "cat": category, "name": name, "pid": pid, "tid": tid,
+            "ts": start / 1000, "dur": duration / 1000, "args": args or {},
+        }
+        for category, name, start, duration, tid, args in events
+    )
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"traceEvents": trace, "displayTimeUnit": "ms"}, f)
+
+
+def _dropped_events(kept: int) -> int:
+    with _lock:
+        recorded = sum(histogram.count for histogram in _histograms.values())
+    return max(0, recorded - kept)
@@ -0,0 +1,80 @@
+"""
+Sort keys for a page's components after the editor reorders them.
+
+Given the stored keys of the components in their new order (None for new
+components), keep the keys of the longest run of components that are still
+in increasing order and give every other component a key between its new
+neighbours. Moving or inserting one component therefore writes one row. When
+two neighbours would end up closer than MIN_SORT_KEY_GAP, the whole page is
+renumbered SORT_KEY_GAP apart instead (rare: it takes ~20 inserts at the
+same spot).
+"""
+from bisect import bisect_left
+from typing import List, Optional, Set, Tuple
+
+from database.db_handler import MIN_SORT_KEY_GAP, SORT_KEY_GAP
+
+
+def _longest_increasing(keys: List[Optional[float]]) -> Set[int]:
+    """Indices of a longest strictly increasing subsequence of the non-None keys."""
+    tails: List[float] = []      # smallest tail key of an increasing run of each length
+    tail_index: List[int] = []   # index in keys of that tail
+    previous = [-1] * len(keys)
+    for i, key in enumerate(keys):
+        if key is None:
+            continue
+        length = bisect_left(tails, key)
+        if length == len(tails):
+            tails.append(key)
+            tail_index.append(i)
+        else:
+            tails[length] = key
+            tail_index[length] = i
+        previous[i] = tail_index[length - 1] if length else -1
+
+    kept = set()
+    i = tail_index[-1] if tail_index else -1
+    while i != -1:
+        kept.add(i)
+        i = previous[i]
+    return kept
+
+
+def renumbered(count: int) -> List[float]:
+    return [index * SORT_KEY_GAP for index in range(1, count + 1)]
+
+
+def assign_sort_keys(saved_keys: List[Optional[float]]) -> Tuple[List[float], bool]:
+    """
+    Keys for components listed in their new order. saved_keys holds each
+    one's stored key (None if it isn't stored yet). Returns (keys, renumbered):
+    a component needs writing only if its key differs from its saved one.
+    """
+    kept = _longest_increasing(saved_keys)
+    keys: List[float] = [0.0] * len(saved_keys)
+    i = 0
+    while i < len(saved_keys):
+        if i in kept:
+            keys[i] = saved_keys[i]
+            i += 1
+            continue
+        # A run of components to place between two kept neighbours
+        start = i
+        while i < len(saved_keys) and i not in kept:
+            i += 1
+        low = keys[start - 1] if start > 0 else None
+        high = saved_keys[i] if i < len(saved_keys) else None
+        count = i - start
+        if low is None and high is None:
+            new_keys = renumbered(count)
+        elif low is None:
+            new_keys = [high - SORT_KEY_GAP * (count - j) for j in range(count)]
+        elif high is None:
+            new_keys = [low + SORT_KEY_GAP * (j + 1) for j in range(count)]
+        else:
+            step = (high - low) / (count + 1)
+            if step < MIN_SORT_KEY_GAP:
+                return renumbered(len(saved_keys)), True
+            new_keys = [low + step * (j + 1) for j in range(count)]
+        keys[start:i] = new_keys
+    return keys, False
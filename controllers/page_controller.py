@@ -1,8 +1,9 @@
-from database.db_handler import DBHandler
+from controllers.ordering import assign_sort_keys
+from database.db_handler import DBHandler, content_hash
 
 class PageController:
-    def __init__(self):
-        self.db = DBHandler()
+    def __init__(self, db=None):
+        self.db = db or DBHandler()
 
     def create_page(self, title):
         return self.db.create_page(title)
@@ -12,19 +13,84 @@ class PageController:
 
     def get_page_details(self, page_id):
         return {
-            'page': [p for p in self.db.get_pages() if p['id'] == page_id][0],
+            'page': self.db.get_page(page_id),
             'components': self.db.get_page_components(page_id)
         }
 
     def save_page(self, page_id, title, components):
-        self.db.update_page_title(page_id, title)
-        position = 1
-        for comp in components:
-            if comp['id'] is None:
-                self.db.add_component(page_id, comp['type'], comp['data'], position)
-            else:
-                self.db.update_component(comp['id'], comp['data'], position)
-            position += 1
+        """
+        Persist a page in the given component order, writing only what changed
+        (compared with what is stored now) in a single transaction. A move
+        rewrites only the moved components' sort keys (see controllers/ordering.py).
+        """
+        page = self.db.get_page(page_id)
+        stored = {c['id']: c for c in self.db.get_page_components(page_id)}
+        saved_keys = [
+            stored[comp['id']]['sort_key'] if comp['id'] in stored else None
+            for comp in components
+        ]
+        sort_keys, _ = assign_sort_keys(saved_keys)
+
+        data_updates, key_updates = [], []
+        with self.db.transaction():
+            if page is None or page['title'] != title:
+                self.db.update_page_title(page_id, title)
+            for comp, sort_key, saved_key in zip(components, sort_keys, saved_keys):
+                current = stored.get(comp['id'])
+                if comp['id'] is None or current is None:
+                    self.db.add_component(page_id, comp['type'], comp['data'], sort_key=sort_key)
+                elif content_hash(comp['data']) != content_hash(current['data']):
+                    data_updates.append((comp['id'], comp['data'], sort_key))
+                elif sort_key != saved_key:
+                    key_updates.append((comp['id'], sort_key))
+            if data_updates:
+                self.db.update_components(data_updates)
+            if key_updates:
+                self.db.update_component_sort_keys(key_updates)
+
+    def save_page_changes(self, page_id, title, components, progress=None, check_cancelled=None):
+        """
+        Persist an editor snapshot, writing only what changed since it was last
+        saved. Safe to call from a worker thread (it only touches plain data).
+
+        title: the new title, or None if unchanged
+        components: in page order, [{'id', 'type', 'data', 'saved_hash', 'saved_sort_key'}]
+        progress(done, total, message) and check_cancelled() are optional hooks;
+        check_cancelled may raise to abort, which rolls everything back.
+
+        Returns [{'id', 'hash', 'sort_key'}] for each component, in the same order.
+        """
+        total = len(components)
+        results = []
+        data_updates, key_updates = [], []
+        saved_keys = [comp['saved_sort_key'] if comp['id'] is not None else None for comp in components]
+        sort_keys, _ = assign_sort_keys(saved_keys)
+        with self.db.transaction():
+            if title is not None:
+                self.db.update_page_title(page_id, title)
+
+            for done, (comp, sort_key, saved_key) in enumerate(zip(components, sort_keys, saved_keys), start=1):
+                if check_cancelled:
+                    check_cancelled()
+                data_hash = content_hash(comp['data'])
+                comp_id = comp['id']
+                if comp_id is None:
+                    comp_id = self.db.add_component(page_id, comp['type'], comp['data'], sort_key=sort_key)
+                elif data_hash != comp['saved_hash']:
+                    data_updates.append((comp_id, comp['data'], sort_key))
+                elif sort_key != saved_key:
+                    key_updates.append((comp_id, sort_key))
+                results.append({'id': comp_id, 'hash': data_hash, 'sort_key': sort_key})
+                if progress:
+                    progress(done, total, "Saving components...")
+
+            if check_cancelled:
+                check_cancelled()
+            if data_updates:
+                self.db.update_components(data_updates)
+            if key_updates:
+                self.db.update_component_sort_keys(key_updates)
+        return results
 
     def delete_component(self, component_id):
         self.db.delete_component(component_id)
@@ -1,11 +1,131 @@
-from jinja2 import Environment, FileSystemLoader, TemplateNotFound
+from jinja2 import Environment, FileSystemLoader, FileSystemBytecodeCache, ModuleLoader, TemplateNotFound
+from markupsafe import escape
+import hashlib
+import importlib.util
+import io
+import json
 import os
+import py_compile
 import sys
-from typing import List, Dict, Any
+import threading
+from typing import List, Dict, Any, Callable, Iterable, Iterator, Optional, Tuple
+
+from controllers import component_registry, instrumentation
+from controllers.css_pipeline import combine_css
+from controllers.render_cache import RenderCache, RenderKey
+from database.db_handler import _user_data_dir, content_hash
 
 def _base_path() -> str:
-    # Works from source and when bundled with PyInstaller (onefile/onedir)
-    return getattr(sys, "_MEIPASS", os.path.dirname(os.path.abspath(__file__)))
+    # Works from source (repo root, one level above this package) and when
+    # bundled with PyInstaller (onefile/onedir)
+    source_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    return getattr(sys, "_MEIPASS", source_root)
+
+# Precompiled templates (see compile_templates), next to the sources
+COMPILED_DIR = "components_compiled"
+# In COMPILED_DIR: template name -> SHA-1 of the source each module was compiled from
+COMPILED_SOURCES = "sources.json"
+
+def _file_sha1(path: str) -> str:
+    with open(path, "rb") as f:
+        return hashlib.sha1(f.read()).hexdigest()
+
+def _mtime(path: str) -> Optional[float]:
+    try:
+        return os.stat(path).st_mtime
+    except OSError:
+        return None
+
+def compile_templates(target: Optional[str] = None, log_function=None) -> Dict[str, str]:
+    """
+    Build step: compile every component template into a Python module in
+    target (default templates/components_compiled) for ModuleLoader, and
+    byte-compile those modules for this interpreter as unchecked-hash .pyc
+    files, so loading a template at runtime is a plain import: no Jinja2
+    parsing and no Python compilation. Returns {template name: source SHA-1}.
+    """
+    templates_dir = os.path.join(_base_path(), "templates")
+    html_dir = os.path.join(templates_dir, "components_html")
+    target = target or os.path.join(templates_dir, COMPILED_DIR)
+    os.makedirs(target, exist_ok=True)
+    # Drop modules of templates that no longer exist
+    for name in os.listdir(target):
+        if name.startswith("tmpl_") and name.endswith(".py"):
+            os.remove(os.path.join(target, name))
+
+    env = Environment(loader=FileSystemLoader(html_dir))
+    env.compile_templates(target, zip=None, ignore_errors=False, log_function=log_function)
+    for name in os.listdir(target):
+        if name.endswith(".py"):
+            path = os.path.join(target, name)
+            py_compile.compile(
+                path, cfile=importlib.util.cache_from_source(path), doraise=True,
+                invalidation_mode=py_compile.PycInvalidationMode.UNCHECKED_HASH,
+            )
+
+    sources = {name: _file_sha1(os.path.join(html_dir, name)) for name in env.list_templates()}
+    with open(os.path.join(target, COMPILED_SOURCES), "w", encoding="utf-8") as f:
+        json.dump(sources, f, indent=1, sort_keys=True)
+    return sources
+
+def _compiled_sources(compiled_dir: str) -> Optional[Dict[str, str]]:
+    try:
+        with open(os.path.join(compiled_dir, COMPILED_SOURCES), encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+class _PrecompiledLoader(ModuleLoader):
+    """
+    Templates from the modules written by compile_templates(). A template
+    without a module is parsed from its source instead. So is one whose source
+    no longer matches what was compiled, unless check_sources is off (frozen
+    builds, where both were bundled by the same build). A source edited while
+    the app runs makes its template out of date, and the reload parses it.
+    """
+
+    def __init__(self, compiled_dir: str, html_dir: str, sources: Dict[str, str], check_sources: bool):
+        super().__init__(compiled_dir)
+        self._html_dir = html_dir
+        self._source_loader = FileSystemLoader(html_dir)
+        self._sources = sources
+        self._check_sources = check_sources
+
+    def load(self, environment, name, globals=None):
+        compiled_sha1 = self._sources.get(name)
+        path = os.path.join(self._html_dir, name)
+        mtime = None
+        if compiled_sha1 is not None and self._check_sources:
+            mtime = _mtime(path)
+            if mtime is None or _file_sha1(path) != compiled_sha1:
+                compiled_sha1 = None
+        if compiled_sha1 is None:
+            return self._source_loader.load(environment, name, globals)
+
+        template = super().load(environment, name, globals)
+        # Stands in for the file mtime in render cache keys: the same source
+        # gives the same version wherever (and whenever) it was extracted
+        template.source_version = float(int(compiled_sha1[:13], 16))
+        if self._check_sources:
+            template._uptodate = lambda: _mtime(path) == mtime
+        return template
+
+    def list_templates(self):
+        return self._source_loader.list_templates()
+
+def _bytecode_cache() -> Optional[FileSystemBytecodeCache]:
+    """
+    On-disk cache of compiled template bytecode, so templates parsed in one
+    launch don't need to be parsed again in the next. Jinja2 keys entries by
+    template source checksum, so edited templates are recompiled automatically.
+    """
+    cache_dir = os.path.join(_user_data_dir(), "jinja_cache")
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+    except OSError:
+        # Not fatal: we just lose cross-launch caching
+        return None
+    return FileSystemBytecodeCache(cache_dir)
 
 class PageGenerator:
     def __init__(self):
@@ -19,58 +139,392 @@ class PageGenerator:
                 f"Templates folder not found: {self.html_dir}"
             )
 
-        self.env = Environment(loader=FileSystemLoader(self.html_dir))
+        # Precompiled modules when the build made them (see compile_templates),
+        # else the sources. auto_reload makes the environment's compiled-template
+        # cache check the source mtime, so edited templates are picked up
+        # without a restart.
+        compiled_dir = os.path.join(base, "templates", COMPILED_DIR)
+        sources = _compiled_sources(compiled_dir)
+        frozen = getattr(sys, "frozen", False)
+        if sources is not None:
+            loader = _PrecompiledLoader(compiled_dir, self.html_dir, sources, check_sources=not frozen)
+        else:
+            loader = FileSystemLoader(self.html_dir)
+        self.env = Environment(
+            loader=loader,
+            auto_reload=True,
+            # Only templates parsed from source use it; not worth creating when frozen with modules
+            bytecode_cache=None if sources is not None and frozen else _bytecode_cache(),
+        )
+
+        # ctype -> (mtime, css text); re-read only when the file changes on disk
+        self._css_cache: Dict[str, Tuple[float, str]] = {}
+        self._css_lock = threading.Lock()
+
+        # Rendered component HTML by (type, template mtime, data hash)
+        self.render_cache = RenderCache()
+        # ctype -> (template object, its file's mtime); a reloaded template is a new object
+        self._template_mtimes: Dict[str, Tuple[Any, float]] = {}
+
+    def get_css(self, ctype: str) -> Optional[str]:
+        """Return the stylesheet for a component type, or None if it has none."""
+        css_name = component_registry.get(ctype).css
+        if css_name is None:
+            return None
+        css_path = os.path.join(self.css_dir, css_name)
+        try:
+            mtime = os.stat(css_path).st_mtime
+        except FileNotFoundError:
+            with self._css_lock:
+                self._css_cache.pop(ctype, None)
+            return None
 
-    def generate_page_content(self, components: List[Dict[str, Any]]) -> str:
+        cached = self._css_cache.get(ctype)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+
+        try:
+            with instrumentation.span("css", f"read {css_name}"):
+                with open(css_path, "r", encoding="utf-8") as f:
+                    css = f.read()
+        except Exception as e:
+            raise RuntimeError(f"Failed reading CSS file: {css_path}") from e
+
+        with self._css_lock:
+            self._css_cache[ctype] = (mtime, css)
+        return css
+
+    def asset_versions(self) -> Dict[str, str]:
         """
-        components = [{ 'type': 'facts_table', 'data': {...}}, ...]
-        Returns a single string with HTML followed by a <style> block containing CSS.
+        Per component type, a hash of its template and stylesheet sources: what
+        besides the component data decides its exported HTML. Content rather
+        than mtimes, so a fresh checkout of the same files keeps the same versions.
         """
-        html_parts: List[str] = []
-        css_parts: List[str] = []
+        versions = {}
+        for component in component_registry.all_types():
+            digest = hashlib.sha1()
+            for directory, name in ((self.html_dir, component.template), (self.css_dir, component.css)):
+                digest.update(b"\0")
+                if name is None:
+                    continue
+                try:
+                    with open(os.path.join(directory, name), "rb") as f:
+                        digest.update(f.read())
+                except FileNotFoundError:
+                    pass
+            versions[component.name] = digest.hexdigest()
+        return versions
 
-        for comp in components:
-            ctype = comp.get("type")
-            cdata = comp.get("data", {}) or {}
+    def _get_template(self, ctype: str):
+        template_name = component_registry.get(ctype).template
+        try:
+            with instrumentation.span("template", f"load {template_name}"):
+                return self.env.get_template(template_name)
+        except TemplateNotFound as e:
+            raise FileNotFoundError(
+                f"Template not found for component '{ctype}': "
+                f"{os.path.join(self.html_dir, template_name)}"
+            ) from e
 
-            if not ctype:
-                raise ValueError("Component is missing 'type'.")
+    def _render(self, template, ctype: str, cdata: Dict[str, Any]) -> str:
+        try:
+            with instrumentation.span("render", ctype):
+                return template.render(**cdata)
+        except Exception as e:
+            # Bubble up with context so your UI error dialog is helpful
+            raise RuntimeError(
+                f"Error rendering template '{template.name}' with data keys: {list(cdata.keys())}"
+            ) from e
 
-            # --- Render HTML ---
+    def _template_mtime(self, ctype: str, template) -> float:
+        cached = self._template_mtimes.get(ctype)
+        if cached is not None and cached[0] is template:
+            return cached[1]
+        mtime = getattr(template, "source_version", None)
+        if mtime is None:
             try:
-                template = self.env.get_template(f"{ctype}.html")
-            except TemplateNotFound as e:
-                raise FileNotFoundError(
-                    f"Template not found for component '{ctype}': "
-                    f"{os.path.join(self.html_dir, ctype + '.html')}"
-                ) from e
+                mtime = os.stat(template.filename).st_mtime
+            except (TypeError, OSError):
+                # Not loaded from a file on disk
+                mtime = 0.0
+        self._template_mtimes[ctype] = (template, mtime)
+        return mtime
 
-            try:
-                html_parts.append(template.render(**cdata))
-            except Exception as e:
-                # Bubble up with context so your UI error dialog is helpful
-                raise RuntimeError(
-                    f"Error rendering template '{ctype}.html' with data keys: {list(cdata.keys())}"
-                ) from e
-
-            # --- Append CSS if present ---
-            css_path = os.path.join(self.css_dir, f"{ctype}.css")
-            if os.path.exists(css_path):
-                try:
-                    with open(css_path, "r", encoding="utf-8") as f:
-                        css_parts.append(f.read())
-                except Exception as e:
-                    raise RuntimeError(f"Failed reading CSS file: {css_path}") from e
+    def _cache_key(self, ctype: str, template, cdata: Dict[str, Any]) -> RenderKey:
+        return ctype, self._template_mtime(ctype, template), content_hash(cdata)
+
+    def render_key(self, ctype: str, data: Optional[Dict[str, Any]]) -> RenderKey:
+        """Cache key of a component's render: changes with its data or its template."""
+        return self._cache_key(ctype, self._get_template(ctype), data or {})
+
+    def render_component(self, ctype: str, data: Optional[Dict[str, Any]], store: bool = True) -> str:
+        """
+        Render a single component, reusing the previous result when the same
+        (type, data) was rendered before with the same template. store=False
+        leaves a new render out of the cache (data still being edited).
+        """
+        cdata = data or {}
+        template = self._get_template(ctype)
+        key = self._cache_key(ctype, template, cdata)
+        html = self.render_cache.get(key)
+        if html is None:
+            html = self._render(template, ctype, cdata)
+            if store:
+                self.render_cache.put(key, html)
+        return html
+
+    def build_page_css(
+        self,
+        component_types: Iterable[str],
+        minify: bool = False,
+        merge: bool = False,
+    ) -> Tuple[str, Dict[str, int]]:
+        """
+        Combined stylesheet for the given component types (one entry per component
+        instance). Each type's CSS is emitted once; optionally minified and with
+        duplicate selectors / @media blocks merged across components.
+        Returns (css, report) where report holds byte counts before and after.
+        """
+        sheets: Dict[str, str] = {}
+        original_bytes = 0
+        for ctype in component_types:
+            css = self.get_css(ctype)
             # If CSS file is missing, that’s fine—just skip.
+            if css is None:
+                continue
+            # What the old per-instance concatenation would have cost
+            original_bytes += len(css.strip().encode("utf-8"))
+            sheets.setdefault(ctype, css)
 
-        html_content = "\n\n".join(html_parts).strip()
-        css_content  = "\n\n".join(css_parts).strip()
+        with instrumentation.span("css", "combine", minify=minify, merge=merge):
+            css_content = combine_css(sheets.values(), minify=minify, merge=merge)
+        output_bytes = len(css_content.encode("utf-8"))
+        report = {
+            "component_types": len(sheets),
+            "original_bytes": original_bytes,
+            "output_bytes": output_bytes,
+            "saved_bytes": max(0, original_bytes - output_bytes),
+        }
+        return css_content, report
 
-        final = html_content
-        if css_content:
-            final += f"\n\n<style>\n{css_content}\n</style>\n"
+    def _iter_component_html(self, ctype: str, cdata: Dict[str, Any]) -> Iterator[str]:
+        """
+        Stream one component's HTML: from the render cache when possible, else
+        with Jinja2's template.generate() (and cached once complete).
+        """
+        template = self._get_template(ctype)
+        key = self._cache_key(ctype, template, cdata)
+        html = self.render_cache.get(key)
+        if html is not None:
+            yield html
+            return
+
+        parts: List[str] = []
+        chunks = template.generate(**cdata)
+        if instrumentation.enabled:
+            chunks = instrumentation.timed_iter("render", ctype, chunks)
+        try:
+            for chunk in chunks:
+                parts.append(chunk)
+                yield chunk
+        except Exception as e:
+            # Bubble up with context so your UI error dialog is helpful
+            raise RuntimeError(
+                f"Error rendering template '{template.name}' with data keys: {list(cdata.keys())}"
+            ) from e
+        self.render_cache.put(key, "".join(parts))
+
+    def iter_page_content(
+        self,
+        components: List[Dict[str, Any]],
+        minify_css: bool = False,
+        merge_css: bool = False,
+        report: Optional[Dict[str, int]] = None,
+        stylesheet_href: Optional[str] = None,
+        inline_css: bool = True,
+        progress: Optional[Callable[[int, int], None]] = None,
+    ) -> Iterator[str]:
+        """
+        Stream the page as text chunks, component by component, so it never has
+        to exist in memory as one string. Joined, the chunks are exactly what
+        generate_page_content returns. If given, `report` is filled with the
+        CSS size report before the first chunk is produced.
+
+        stylesheet_href puts a <link> to a shared stylesheet (see
+        BatchExporter's shared_css) before the HTML; inline_css=False then
+        leaves out the page's own <style> block.
+
+        progress(components done, total) is called before each component and
+        once at the end; an exception it raises (e.g. a cancelled task) stops
+        the page there.
+        """
+        for comp in components:
+            if not comp.get("type"):
+                raise ValueError("Component is missing 'type'.")
+
+        # --- CSS: each component type's stylesheet once (small; emitted last) ---
+        if inline_css:
+            css_content, css_report = self.build_page_css(
+                (comp["type"] for comp in components), minify=minify_css, merge=merge_css
+            )
+            css_content = css_content.strip()
+        else:
+            css_content = ""
+            css_report = {"component_types": 0, "original_bytes": 0, "output_bytes": 0, "saved_bytes": 0}
+        if report is not None:
+            report.update(css_report)
+
+        if stylesheet_href is not None:
+            yield f'<link rel="stylesheet" href="{escape(stylesheet_href)}">\n\n'
+
+        def html_chunks():
+            for index, comp in enumerate(components):
+                if progress:
+                    progress(index, len(components))
+                if index:
+                    yield "\n\n"
+                yield from self._iter_component_html(comp["type"], comp.get("data", {}) or {})
+            if progress:
+                progress(len(components), len(components))
+
+        wrote_html = False
+        try:
+            for chunk in _strip_stream(html_chunks()):
+                wrote_html = True
+                yield chunk
+        finally:
+            # One batched write per page when the cache is persisted
+            self.render_cache.flush()
 
-        if not final.strip():
+        if css_content:
+            yield f"\n\n<style>\n{css_content}\n</style>\n"
+        elif not (wrote_html or stylesheet_href):
             raise ValueError("Generated content is empty. Check components and templates.")
 
+    def write_page_content(
+        self,
+        components: List[Dict[str, Any]],
+        out,
+        minify_css: bool = False,
+        merge_css: bool = False,
+        buffer_size: int = 64 * 1024,
+        stylesheet_href: Optional[str] = None,
+        inline_css: bool = True,
+        progress: Optional[Callable[[int, int], None]] = None,
+    ) -> Dict[str, int]:
+        """
+        Stream the page into `out`: a text file object, a binary file object, or
+        a socket (anything with sendall). Small chunks are coalesced up to
+        buffer_size before each write. Returns the CSS size report. progress
+        as in iter_page_content.
+        """
+        if hasattr(out, "sendall"):
+            write = lambda text: out.sendall(text.encode("utf-8"))
+        elif isinstance(out, (io.RawIOBase, io.BufferedIOBase)) or "b" in getattr(out, "mode", ""):
+            write = lambda text: out.write(text.encode("utf-8"))
+        else:
+            write = out.write
+
+        report: Dict[str, int] = {}
+        buffer: List[str] = []
+        buffered = 0
+        for chunk in self.iter_page_content(
+            components, minify_css, merge_css, report=report,
+            stylesheet_href=stylesheet_href, inline_css=inline_css, progress=progress,
+        ):
+            buffer.append(chunk)
+            buffered += len(chunk)
+            if buffered >= buffer_size:
+                write("".join(buffer))
+                buffer, buffered = [], 0
+        if buffer:
+            write("".join(buffer))
+        return report
+
+    def export_page_to_file(
+        self,
+        components: List[Dict[str, Any]],
+        path: str,
+        minify_css: bool = False,
+        merge_css: bool = False,
+        stylesheet_href: Optional[str] = None,
+        inline_css: bool = True,
+        progress: Optional[Callable[[int, int], None]] = None,
+    ) -> Dict[str, int]:
+        """
+        Stream the page to path via a temporary file, so a failed or cancelled
+        render never leaves a truncated export behind. Returns the CSS size
+        report. progress as in iter_page_content.
+        """
+        tmp_path = f"{path}.tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                report = self.write_page_content(
+                    components, f, minify_css, merge_css,
+                    stylesheet_href=stylesheet_href, inline_css=inline_css, progress=progress,
+                )
+            os.replace(tmp_path, path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+        return report
+
+    def generate_page_content_with_report(
+        self,
+        components: List[Dict[str, Any]],
+        minify_css: bool = False,
+        merge_css: bool = False,
+    ) -> Tuple[str, Dict[str, int]]:
+        """Like generate_page_content, but also returns the CSS size report."""
+        report: Dict[str, int] = {}
+        final = "".join(self.iter_page_content(components, minify_css, merge_css, report=report))
+        return final, report
+
+    def generate_page_content(
+        self,
+        components: List[Dict[str, Any]],
+        minify_css: bool = False,
+        merge_css: bool = False,
+    ) -> str:
+        """
+        components = [{ 'type': 'facts_table', 'data': {...}}, ...]
+        Returns a single string with HTML followed by a <style> block containing CSS.
+        """
+        final, _ = self.generate_page_content_with_report(components, minify_css, merge_css)
         return final
+
+def _strip_stream(chunks: Iterable[str]) -> Iterator[str]:
+    """
+    Streaming equivalent of "".join(chunks).strip(): leading whitespace is
+    dropped, and trailing whitespace is held back until more text follows it.
+    """
+    started = False
+    pending = ""
+    for chunk in chunks:
+        if not started:
+            chunk = chunk.lstrip()
+            if not chunk:
+                continue
+            started = True
+        body = chunk.rstrip()
+        if body:
+            yield pending + body
+            pending = chunk[len(body):]
+        else:
+            pending += chunk
+
+
+_shared_generator: Optional[PageGenerator] = None
+_shared_lock = threading.Lock()
+
+def get_page_generator() -> PageGenerator:
+    """
+    Process-wide PageGenerator. Reusing one instance keeps the Jinja2
+    environment (and its compiled templates) and the CSS cache warm across exports.
+    """
+    global _shared_generator
+    if _shared_generator is None:
+        with _shared_lock:
+            if _shared_generator is None:
+                _shared_generator = PageGenerator()
+    return _shared_generator
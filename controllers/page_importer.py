@@ -0,0 +1,297 @@
+"""
+Streaming bulk import of pages from JSON or NDJSON files.
+
+Accepted layouts (all read incrementally, one page at a time):
+
+    [{"title": ..., "components": [...]}, ...]     a JSON array
+    {"title": ...}\\n{"title": ...}\\n                NDJSON / JSON Lines
+    {"title": ..., "components": [...]}             a single page
+
+Each page is {"title": str, "created_at": str (optional), "components":
+[{"type": <registered component type>, "data": {...}}]}. Invalid pages are
+skipped and reported (or abort the import with strict=True).
+
+Pages are inserted chunk_size at a time, each chunk in one transaction with
+executemany (DBHandler.insert_pages). Every chunk also stores a checkpoint
+(byte offset and a hash of the file up to it) in app_meta in the same
+transaction, so an import that fails or is cancelled partway resumes right
+after the last committed page when the same file is imported again.
+"""
+import codecs
+import hashlib
+import json
+import os
+import re
+import time
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from controllers import component_registry
+from database.db_handler import DBHandler
+
+# progress(bytes read, file size, running totals as in the import_file result)
+ProgressCallback = Callable[[int, int, Dict[str, Any]], None]
+
+# Pages per transaction
+DEFAULT_CHUNK_SIZE = 500
+
+# Invalid pages listed in the result (the count is always exact)
+MAX_REPORTED_ERRORS = 1000
+
+_READ_SIZE = 1 << 16
+_WHITESPACE = re.compile(r"[ \t\r\n]*")
+_WHITESPACE_OR_COMMA = re.compile(r"[ \t\r\n,]*")
+_CHECKPOINT_PREFIX = "import_checkpoint:"
+
+# (title, created_at or None, [(component_type, data)])
+PageRow = Tuple[str, Optional[str], List[Tuple[str, Dict[str, Any]]]]
+
+
+class CheckpointMismatch(ValueError):
+    """The file changed since its interrupted import; import it again with restart=True."""
+
+    def __init__(self, message: str, checkpoint: Dict[str, Any]):
+        super().__init__(message)
+        self.checkpoint = checkpoint
+
+
+class JsonValueStream:
+    """
+    Top-level JSON values of a binary file, decoded one at a time: the items
+    of a top-level array, or whitespace-separated values (NDJSON). Tracks the
+    byte offset just past the last value produced and a SHA-1 of every byte
+    up to it, which is what an import checkpoint records.
+    """
+
+    def __init__(self, f, offset: int = 0, in_array: Optional[bool] = None, digest=None):
+        self._f = f
+        self.offset = offset
+        self.in_array = in_array   # None until the first non-space character is seen
+        self.digest = digest or hashlib.sha1()
+        self._text = codecs.getincrementaldecoder("utf-8")()
+        self._buf = ""
+        self._pos = 0
+        self._eof = False
+
+    def _consume(self, end: int):
+        data = self._buf[self._pos:end].encode("utf-8")
+        self.offset += len(data)
+        self.digest.update(data)
+        self._pos = end
+
+    def _fill(self):
+        # Read at least as much as is pending, so a value larger than the
+        # buffer is re-scanned a logarithmic number of times, not once per read
+        pending = len(self._buf) - self._pos
+        raw = self._f.read(max(_READ_SIZE, pending))
+        if raw:
+            text = self._text.decode(raw)
+        else:
+            self._eof = True
+            text = self._text.decode(b"", final=True)
+        self._buf = self._buf[self._pos:] + text
+        self._pos = 0
+
+    def __iter__(self) -> Iterator[Any]:
+        decoder = json.JSONDecoder()
+        while True:
+            separators = _WHITESPACE_OR_COMMA if self.in_array else _WHITESPACE
+            self._consume(separators.match(self._buf, self._pos).end())
+            if self._pos == len(self._buf):
+                if self._eof:
+                    if self.in_array:
+                        raise ValueError("Unexpected end of file: the JSON array is not closed")
+                    return
+                self._fill()
+                continue
+
+            char = self._buf[self._pos]
+            if self.in_array is None:
+                if self.offset == 0 and char == "\ufeff":  # UTF-8 BOM
+                    self._consume(self._pos + 1)
+                    continue
+                self.in_array = char == "["
+                if self.in_array:
+                    self._consume(self._pos + 1)
+                    continue
+            if self.in_array and char == "]":
+                self._consume(self._pos + 1)
+                return
+
+            try:
+                value, end = decoder.raw_decode(self._buf, self._pos)
+            except json.JSONDecodeError as e:
+                if not self._eof:
+                    self._fill()
+                    continue
+                raise ValueError(f"Invalid JSON after byte {self.offset}: {e.msg}") from None
+            self._consume(end)
+            yield value
+
+
+def validate_page(page: Any) -> PageRow:
+    """Check one imported page; raises ValueError describing the first problem."""
+    if not isinstance(page, dict):
+        raise ValueError(f"expected a page object, got {type(page).__name__}")
+    title = page.get("title", "New Page")
+    if not isinstance(title, str):
+        raise ValueError("'title' must be a string")
+    created_at = page.get("created_at")
+    if created_at is not None and not isinstance(created_at, str):
+        raise ValueError("'created_at' must be a string")
+    components = page.get("components", [])
+    if not isinstance(components, list):
+        raise ValueError("'components' must be a list")
+
+    rows = []
+    for position, comp in enumerate(components, start=1):
+        if not isinstance(comp, dict):
+            raise ValueError(f"component {position}: expected an object")
+        component_type = comp.get("type")
+        if not isinstance(component_type, str) or not component_registry.is_registered(component_type):
+            raise ValueError(
+                f"component {position}: unknown type {component_type!r} "
+                f"(expected one of: {', '.join(component_registry.type_names())})"
+            )
+        data = comp.get("data", {})
+        if data is None:
+            data = {}
+        if not isinstance(data, dict):
+            raise ValueError(f"component {position} ({component_type}): 'data' must be an object")
+        rows.append((component_type, data))
+    return title, created_at, rows
+
+
+class PageImporter:
+    def __init__(self, db: Optional[DBHandler] = None, chunk_size: int = DEFAULT_CHUNK_SIZE, strict: bool = False):
+        self.db = db or DBHandler()
+        self.chunk_size = max(1, chunk_size)
+        # Abort on the first invalid page instead of skipping it
+        self.strict = strict
+
+    # ---------- checkpoints ----------
+
+    @staticmethod
+    def _checkpoint_key(path: str) -> str:
+        return _CHECKPOINT_PREFIX + os.path.abspath(path)
+
+    def checkpoint(self, path: str) -> Optional[Dict[str, Any]]:
+        """The saved position of an unfinished import of path, if any."""
+        value = self.db.get_meta(self._checkpoint_key(path))
+        return json.loads(value) if value is not None else None
+
+    def discard_checkpoint(self, path: str):
+        self.db.set_meta(self._checkpoint_key(path), None)
+
+    @staticmethod
+    def _verify_prefix(f, checkpoint) -> "hashlib._Hash":
+        # The bytes already imported must be unchanged for the offset to mean anything
+        digest = hashlib.sha1()
+        remaining = checkpoint["offset"]
+        while remaining:
+            data = f.read(min(remaining, 1 << 20))
+            if not data:
+                break
+            digest.update(data)
+            remaining -= len(data)
+        if remaining or digest.hexdigest() != checkpoint["sha1"]:
+            raise CheckpointMismatch(
+                f"The file changed before byte {checkpoint['offset']} since the interrupted import "
+                f"({checkpoint['pages_read']} pages read); start the import over instead (restart)",
+                checkpoint,
+            )
+        return digest
+
+    # ---------- import ----------
+
+    def import_file(
+        self,
+        path: str,
+        progress: Optional[ProgressCallback] = None,
+        is_cancelled: Optional[Callable[[], bool]] = None,
+        restart: bool = False,
+    ) -> Dict[str, Any]:
+        """
+        Import every page in path, resuming an earlier interrupted import of
+        the same file unless restart is set. is_cancelled() is polled after
+        each committed chunk; a cancelled import can be resumed later.
+        Returns counts (cumulative across resumed runs), this run's speed,
+        and the invalid pages as [(page number in file, error)].
+        """
+        key = self._checkpoint_key(path)
+        size = os.path.getsize(path)
+        checkpoint = None if restart else self.checkpoint(path)
+        totals = {"pages_read": 0, "pages": 0, "components": 0, "skipped": 0}
+        errors: List[Tuple[int, str]] = []
+        run_rows = 0
+        start = time.perf_counter()
+
+        def snapshot(stream):
+            elapsed = time.perf_counter() - start
+            return dict(
+                totals,
+                elapsed=elapsed,
+                rows_per_sec=run_rows / elapsed if elapsed > 0 else 0.0,
+                offset=stream.offset,
+            )
+
+        with open(path, "rb") as f:
+            if checkpoint is not None:
+                digest = self._verify_prefix(f, checkpoint)
+                for name in totals:
+                    totals[name] = checkpoint[name]
+                stream = JsonValueStream(f, checkpoint["offset"], checkpoint["in_array"], digest)
+            else:
+                stream = JsonValueStream(f)
+            resumed_from = totals["pages_read"]
+
+            batch: List[PageRow] = []
+            cancelled = False
+
+            def commit(done: bool):
+                nonlocal run_rows
+                state = dict(totals, offset=stream.offset, in_array=stream.in_array, sha1=stream.digest.hexdigest())
+                with self.db.transaction():
+                    if batch:
+                        self.db.insert_pages(batch)
+                    # Saved with the rows it describes: both commit or neither does
+                    self.db.set_meta(key, None if done else json.dumps(state))
+                run_rows += len(batch) + sum(len(components) for _, _, components in batch)
+                batch.clear()
+
+            for value in stream:
+                totals["pages_read"] += 1
+                try:
+                    page = validate_page(value)
+                except ValueError as e:
+                    if self.strict:
+                        raise ValueError(f"Page {totals['pages_read']}: {e}") from None
+                    totals["skipped"] += 1
+                    if len(errors) < MAX_REPORTED_ERRORS:
+                        errors.append((totals["pages_read"], str(e)))
+                    continue
+                batch.append(page)
+                totals["pages"] += 1
+                totals["components"] += len(page[2])
+
+                if len(batch) >= self.chunk_size:
+                    commit(done=False)
+                    if progress:
+                        progress(stream.offset, size, snapshot(stream))
+                    if is_cancelled and is_cancelled():
+                        cancelled = True
+                        break
+
+            if not cancelled:
+                commit(done=True)
+            if progress:
+                progress(stream.offset, size, snapshot(stream))
+
+        result = snapshot(stream)
+        result.update(
+            file=os.path.abspath(path),
+            resumed_from=resumed_from,
+            pages_per_sec=(totals["pages_read"] - resumed_from) / result["elapsed"] if result["elapsed"] > 0 else 0.0,
+            cancelled=cancelled,
+            errors=errors,
+        )
+        return result
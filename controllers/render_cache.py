@@ -0,0 +1,144 @@
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+# (component type, template mtime, canonical JSON hash of the data); for a
+# precompiled template the "mtime" is a version derived from its source hash
+RenderKey = Tuple[str, float, str]
+
+# Default HTML budget for the database-backed cache (see RenderCache.attach)
+STORE_MAX_BYTES = 64 * 1024 * 1024
+
+
+class RenderCache:
+    """
+    LRU cache of rendered component HTML, bounded by total HTML size.
+
+    Keys include the template's mtime, so an edited template never serves old
+    HTML. Optionally backed by the database's render_cache table (see attach),
+    so entries survive restarts and are shared between export worker processes:
+    a memory miss falls back to the table, and new renders are written to it in
+    batches on flush().
+    """
+
+    def __init__(self, max_bytes: int = 16 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[RenderKey, Tuple[str, int]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.store_hits = 0  # subset of hits served from the database
+        self.evictions = 0
+
+        self._store = None
+        self._store_max_bytes = 0
+        self._pending_writes: List[Tuple[str, float, str, str]] = []
+        self._pending_touches: List[RenderKey] = []
+
+    # ---------- persistence ----------
+
+    def attach(self, db, max_bytes: int = STORE_MAX_BYTES):
+        """Persist entries in db's render_cache table, trimmed to max_bytes of HTML."""
+        if self._store is not None and self._store.db_path == db.db_path:
+            return
+        self.flush()
+        self._store = db
+        self._store_max_bytes = max_bytes
+
+    def detach(self):
+        self.flush()
+        self._store = None
+
+    def flush(self):
+        """Write queued renders (and last-used times) to the attached database."""
+        with self._lock:
+            store = self._store
+            writes, self._pending_writes = self._pending_writes, []
+            touches, self._pending_touches = self._pending_touches, []
+        if store is None or not (writes or touches):
+            return
+        with store.transaction():
+            if writes:
+                store.put_rendered_components(writes)
+            if touches:
+                store.touch_rendered_components(touches)
+
+    def prune(self):
+        """Trim the attached database table to its byte budget."""
+        if self._store is not None:
+            self.flush()
+            self._store.prune_render_cache(self._store_max_bytes)
+
+    # ---------- lookups ----------
+
+    def get(self, key: RenderKey) -> Optional[str]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+            store = self._store
+
+        html = store.get_rendered_component(*key) if store is not None else None
+        with self._lock:
+            if html is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self.store_hits += 1
+            self._pending_touches.append(key)
+            self._insert(key, html)
+        self._maybe_flush()
+        return html
+
+    def put(self, key: RenderKey, html: str):
+        with self._lock:
+            self._insert(key, html)
+            if self._store is not None:
+                self._pending_writes.append((*key, html))
+        self._maybe_flush()
+
+    def _insert(self, key: RenderKey, html: str):
+        # Called with the lock held
+        size = len(html.encode("utf-8"))
+        previous = self._entries.pop(key, None)
+        if previous is not None:
+            self._bytes -= previous[1]
+        if size > self.max_bytes:
+            return
+        self._entries[key] = (html, size)
+        self._bytes += size
+        while self._bytes > self.max_bytes:
+            _, (_, evicted) = self._entries.popitem(last=False)
+            self._bytes -= evicted
+            self.evictions += 1
+
+    def _maybe_flush(self):
+        # Keep the write queue short when renders happen outside a page export
+        if len(self._pending_writes) + len(self._pending_touches) >= 256:
+            self.flush()
+
+    # ---------- housekeeping ----------
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "store_hits": self.store_hits,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "persistent": self._store is not None,
+            }
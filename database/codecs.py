@@ -0,0 +1,142 @@
+"""
+Storage codecs for components.component_data.
+
+Every stored value identifies its own codec, so rows written with different
+codecs can live side by side (e.g. halfway through a re-encode):
+
+    json     '{"heading": "..."}'    TEXT, json.dumps defaults (the original format)
+    compact  '{"heading":"..."}'     TEXT, no whitespace, UTF-8 kept as-is
+    zlib     b'Z' + deflate(compact) BLOB
+    lzma     b'X' + raw LZMA2(compact) BLOB
+    packed   '~' + shape hash + values as compact JSON, TEXT
+
+packed is schema-aware: the key structure ("shape") of a component's data is
+stored once, in the codec_schemas table, and each row only holds its values
+in shape order. Shapes are content-addressed (the hash is derived from the
+shape itself), so a shape never changes meaning once written.
+"""
+import hashlib
+import json
+import lzma
+import threading
+import zlib
+from typing import Any, Callable, Dict, Optional, Tuple
+
+CODECS = ("json", "compact", "zlib", "lzma", "packed")
+DEFAULT_CODEC = "json"
+
+_ZLIB_TAG = b"Z"
+_LZMA_TAG = b"X"
+_PACKED_TAG = "~"
+_SHAPE_HASH_LEN = 12
+# Component data is small: a 64 KiB window compresses as well as the preset's
+# 8 MiB one and makes each compress() call ~14x cheaper (no big allocation).
+_LZMA_FILTERS = [{"id": lzma.FILTER_LZMA2, "preset": 6, "dict_size": 1 << 16}]
+
+# shape hash -> shape, shared by every database (hashes are content-derived)
+_shapes: Dict[str, Any] = {}
+_shapes_lock = threading.Lock()
+
+
+def _compact(data) -> str:
+    return json.dumps(data, separators=(",", ":"), ensure_ascii=False)
+
+
+# ---------- packed: shapes ----------
+# A shape is "j" (any JSON value, stored as-is), ["l", item shape] (a list
+# whose items all share one shape) or ["d", [[key, shape], ...]] (a dict).
+
+def shape_of(value) -> Any:
+    if isinstance(value, dict):
+        return ["d", [[key, shape_of(item)] for key, item in value.items()]]
+    if isinstance(value, list) and value:
+        item_shapes = [shape_of(item) for item in value]
+        if all(shape == item_shapes[0] for shape in item_shapes) and item_shapes[0] != "j":
+            return ["l", item_shapes[0]]
+    return "j"
+
+
+def _pack(value, shape):
+    if shape == "j":
+        return value
+    if shape[0] == "d":
+        return [_pack(value[key], item_shape) for key, item_shape in shape[1]]
+    return [_pack(item, shape[1]) for item in value]
+
+
+def _unpack(values, shape):
+    if shape == "j":
+        return values
+    if shape[0] == "d":
+        return {key: _unpack(item, item_shape) for (key, item_shape), item in zip(shape[1], values)}
+    return [_unpack(item, shape[1]) for item in values]
+
+
+def shape_hash(shape_json: str) -> str:
+    return hashlib.sha1(shape_json.encode("utf-8")).hexdigest()[:_SHAPE_HASH_LEN]
+
+
+def remember_shape(hash_: str, shape_json: str):
+    with _shapes_lock:
+        _shapes[hash_] = json.loads(shape_json)
+
+
+# ---------- encode / decode ----------
+
+def encode(data, codec: str) -> Tuple[Any, Optional[Tuple[str, str]]]:
+    """
+    Encode component data for storage. Returns (value, new_shape) where
+    new_shape is (hash, shape JSON) for packed values; the caller must store
+    it in codec_schemas before (or with) the row.
+    """
+    if codec == "json":
+        return json.dumps(data), None
+    if codec == "compact":
+        return _compact(data), None
+    if codec == "zlib":
+        return _ZLIB_TAG + zlib.compress(_compact(data).encode("utf-8"), 9), None
+    if codec == "lzma":
+        raw = lzma.compress(_compact(data).encode("utf-8"), format=lzma.FORMAT_RAW, filters=_LZMA_FILTERS)
+        return _LZMA_TAG + raw, None
+    if codec == "packed":
+        shape = shape_of(data)
+        shape_json = _compact(shape)
+        hash_ = shape_hash(shape_json)
+        with _shapes_lock:
+            _shapes.setdefault(hash_, shape)
+        return _PACKED_TAG + hash_ + _compact(_pack(data, shape)), (hash_, shape_json)
+    raise ValueError(f"Unknown component data codec: {codec}")
+
+
+def decode(value, load_shape: Optional[Callable[[str], Optional[str]]] = None):
+    """
+    Decode a stored component_data value, whatever codec wrote it.
+    load_shape(hash) -> shape JSON is called for packed shapes not seen yet
+    in this process.
+    """
+    if isinstance(value, (bytes, memoryview)):
+        value = bytes(value)
+        tag, payload = value[:1], value[1:]
+        if tag == _ZLIB_TAG:
+            return json.loads(zlib.decompress(payload))
+        if tag == _LZMA_TAG:
+            return json.loads(lzma.decompress(payload, format=lzma.FORMAT_RAW, filters=_LZMA_FILTERS))
+        raise ValueError(f"Unknown component data encoding tag: {tag!r}")
+    if value.startswith(_PACKED_TAG):
+        hash_ = value[1:1 + _SHAPE_HASH_LEN]
+        shape = _shapes.get(hash_)
+        if shape is None:
+            shape_json = load_shape(hash_) if load_shape is not None else None
+            if shape_json is None:
+                raise ValueError(f"Unknown packed component shape: {hash_}")
+            remember_shape(hash_, shape_json)
+            shape = _shapes[hash_]
+        return _unpack(json.loads(value[1 + _SHAPE_HASH_LEN:]), shape)
+    return json.loads(value)
+
+
+def codec_of(value) -> str:
+    """Which codec wrote a stored value ("json" covers both JSON text codecs)."""
+    if isinstance(value, (bytes, memoryview)):
+        return {_ZLIB_TAG: "zlib", _LZMA_TAG: "lzma"}.get(bytes(value[:1]), "unknown")
+    return "packed" if value.startswith(_PACKED_TAG) else "json"
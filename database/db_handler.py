@@ -1,12 +1,65 @@
 import sqlite3
 import json
+import hashlib
 import os
 import sys
 import shutil
+import threading
+import time
+import weakref
+from contextlib import contextmanager
+from functools import partial
+
+from database import codecs
 
 APP_NAME = "ComponentsCreatorForDrupalPages"
 DB_FILENAME = "database_for_components.db"
 
+# Components are ordered by a sparse REAL sort_key: a move or insert takes a
+# key between its new neighbours, so only that row is written. Keys start
+# SORT_KEY_GAP apart; a page is renumbered once two neighbours get closer
+# than MIN_SORT_KEY_GAP (see controllers/ordering.py).
+SORT_KEY_GAP = 1024.0
+MIN_SORT_KEY_GAP = 1e-3
+
+# Current time with milliseconds, in the same text format as created_at
+# (CURRENT_TIMESTAMP only has whole seconds), so the two compare as text
+SQL_NOW = "strftime('%Y-%m-%d %H:%M:%f', 'now')"
+
+def canonical_json(data) -> str:
+    """Stable JSON text for data (sorted keys, no whitespace), for hashing/comparison."""
+    return json.dumps(data, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+
+def content_hash(data) -> str:
+    """Hash of a component's data; equal data always gives the same hash."""
+    return hashlib.sha1(canonical_json(data).encode("utf-8")).hexdigest()
+
+def component_search_text(component_data, load_shape=None) -> str:
+    """
+    Every text value in a component's data (headings, descriptions, links,
+    image URLs...), one per line, whatever codec stored it. Registered as an
+    SQL function on every connection; the components_fts triggers index its
+    output.
+    """
+    try:
+        data = codecs.decode(component_data, load_shape)
+    except (TypeError, ValueError):
+        return ""
+    parts = []
+
+    def walk(value):
+        if isinstance(value, dict):
+            for item in value.values():
+                walk(item)
+        elif isinstance(value, list):
+            for item in value:
+                walk(item)
+        elif isinstance(value, str) and value.strip():
+            parts.append(value)
+
+    walk(data)
+    return "\n".join(parts)
+
 def _user_data_dir():
     # Cross-platform writable app data dir
     if os.name == "nt":  # Windows
@@ -54,20 +107,415 @@ def _get_db_path() -> str:
     Always use a user-writable location for the runtime database.
     This avoids 'sqlite3.OperationalError: unable to open database file'
     when running under PyInstaller onefile (read-only temp dir).
+    COMPONENTS_GENERATOR_DB overrides the location (scripts, benchmarks).
     """
+    override = os.environ.get("COMPONENTS_GENERATOR_DB")
+    if override:
+        return os.path.abspath(override)
     user_dir = _user_data_dir()
     os.makedirs(user_dir, exist_ok=True)
     return os.path.join(user_dir, DB_FILENAME)
 
+# Pragmas applied to every connection. WAL lets readers and a writer work
+# concurrently; synchronous=NORMAL is durable in WAL mode while avoiding an
+# fsync per commit.
+_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA cache_size=-20000",      # ~20 MB page cache
+    "PRAGMA mmap_size=268435456",    # 256 MB memory-mapped I/O
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA foreign_keys=ON",
+)
+
+# One connection per database file per thread. sqlite3 connections may not be
+# shared across threads, so every DBHandler on the same thread shares the same
+# connection (and the same transaction), and other threads get their own.
+_local = threading.local()
+_init_lock = threading.Lock()
+_initialized_paths = set()
+
+def _thread_state(db_path: str) -> dict:
+    states = getattr(_local, "states", None)
+    if states is None:
+        states = _local.states = {}
+    state = states.get(db_path)
+    # A connection inherited through fork() (e.g. by export worker processes)
+    # must never be used by the child: open a fresh one instead.
+    if state is None or state["pid"] != os.getpid():
+        conn = sqlite3.connect(db_path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        for pragma in _PRAGMAS:
+            conn.execute(pragma)
+        # Used by the components_fts triggers, so every connection needs it
+        search_text = partial(component_search_text, load_shape=partial(_read_shape, db_path))
+        conn.create_function("component_search_text", 1, search_text, deterministic=True)
+        # pending_shapes: codec_schemas rows written but not committed yet (see _encode)
+        # handlers: DBHandlers using this connection, so close() knows when it is the last
+        state = states[db_path] = {
+            "conn": conn, "tx_depth": 0, "pid": os.getpid(), "pending_shapes": set(),
+            "handlers": weakref.WeakSet(),
+        }
+    return state
+
+def _is_cramped(keys) -> bool:
+    """True if sorted keys have a gap below MIN_SORT_KEY_GAP or a missing key."""
+    if any(key is None for key in keys):
+        return True
+    return any(b - a < MIN_SORT_KEY_GAP for a, b in zip(keys, keys[1:]))
+
+def _read_shape(db_path: str, shape_hash: str):
+    """Shape JSON for a packed component from codec_schemas (None if missing)."""
+    # A short-lived connection of its own: this may run inside an SQL function
+    # (the FTS triggers), where the thread's shared connection is mid-statement.
+    conn = sqlite3.connect(db_path, timeout=30)
+    try:
+        row = conn.execute("SELECT shape FROM codec_schemas WHERE hash = ?", (shape_hash,)).fetchone()
+    except sqlite3.OperationalError:
+        return None
+    finally:
+        conn.close()
+    return row[0] if row else None
+
+# Applied to every connection handed out by get_connection while set (the
+# instrumentation layer wraps them to time queries); None means no wrapping.
+_connection_wrapper = None
+
+def set_connection_wrapper(wrapper):
+    global _connection_wrapper
+    _connection_wrapper = wrapper
+
+def get_connection(db_path: str) -> sqlite3.Connection:
+    """Shared connection to db_path for the calling thread."""
+    conn = _thread_state(db_path)["conn"]
+    return conn if _connection_wrapper is None else _connection_wrapper(conn)
+
+def close_connection(db_path: str):
+    """Close the calling thread's shared connection to db_path, if open."""
+    states = getattr(_local, "states", None) or {}
+    state = states.pop(db_path, None)
+    if state:
+        state["conn"].close()
+
+# ---------- schema migrations ----------
+# Each migration upgrades the schema by one version (tracked in PRAGMA
+# user_version) and runs inside its own transaction. Append new ones; never
+# edit a migration that has shipped.
+
+def _migrate_v1(cursor):
+    # Rebuild components with ON DELETE CASCADE (SQLite can't alter a FK in place)
+    cursor.execute('''
+    CREATE TABLE components_new (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        page_id INTEGER,
+        component_type TEXT NOT NULL,
+        component_data TEXT NOT NULL,
+        position INTEGER,
+        FOREIGN KEY(page_id) REFERENCES pages(id) ON DELETE CASCADE
+    )
+    ''')
+    cursor.execute('''
+        INSERT INTO components_new (id, page_id, component_type, component_data, position)
+        SELECT id, page_id, component_type, component_data, position FROM components
+    ''')
+    cursor.execute("DROP TABLE components")
+    cursor.execute("ALTER TABLE components_new RENAME TO components")
+
+    # get_page_components: WHERE page_id = ? ORDER BY position
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_components_page_position ON components(page_id, position)")
+    # get_pages: ORDER BY created_at DESC
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_pages_created_at ON pages(created_at)")
+
+def _migrate_v2(cursor):
+    # Rendered component HTML shared by every page using the same (type, data);
+    # see controllers/render_cache.py. Entries are keyed by template mtime, so
+    # editing a template simply stops matching the old rows.
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS render_cache (
+        component_type TEXT NOT NULL,
+        template_mtime REAL NOT NULL,
+        data_hash TEXT NOT NULL,
+        html TEXT NOT NULL,
+        size INTEGER NOT NULL,
+        last_used REAL NOT NULL,
+        PRIMARY KEY (component_type, template_mtime, data_hash)
+    )
+    ''')
+    # prune_render_cache: drop the least recently used rows first
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_render_cache_last_used ON render_cache(last_used)")
+
+def _fts5_available(cursor) -> bool:
+    # FTS5 is compiled into nearly every SQLite build, but not all of them
+    try:
+        cursor.execute("CREATE VIRTUAL TABLE temp._fts5_probe USING fts5(x)")
+    except sqlite3.OperationalError:
+        return False
+    cursor.execute("DROP TABLE temp._fts5_probe")
+    return True
+
+def _migrate_v3(cursor):
+    # Full-text index over page titles for the page list search box. Without
+    # FTS5, search_pages() falls back to LIKE and this migration is a no-op.
+    if not _fts5_available(cursor):
+        return
+    cursor.execute('''
+        CREATE VIRTUAL TABLE IF NOT EXISTS pages_fts USING fts5(
+            title, content='pages', content_rowid='id', prefix='2 3'
+        )
+    ''')
+    cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS pages_fts_ai AFTER INSERT ON pages BEGIN
+            INSERT INTO pages_fts(rowid, title) VALUES (new.id, new.title);
+        END
+    ''')
+    cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS pages_fts_ad AFTER DELETE ON pages BEGIN
+            INSERT INTO pages_fts(pages_fts, rowid, title) VALUES ('delete', old.id, old.title);
+        END
+    ''')
+    cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS pages_fts_au AFTER UPDATE OF title ON pages BEGIN
+            INSERT INTO pages_fts(pages_fts, rowid, title) VALUES ('delete', old.id, old.title);
+            INSERT INTO pages_fts(rowid, title) VALUES (new.id, new.title);
+        END
+    ''')
+    cursor.execute("INSERT INTO pages_fts(pages_fts) VALUES ('rebuild')")
+
+def _migrate_v4(cursor):
+    # Full-text index over the text inside component_data (rowid = component id).
+    # component_search_text() is a Python function registered on each connection.
+    if not _fts5_available(cursor):
+        return
+    cursor.execute("CREATE VIRTUAL TABLE IF NOT EXISTS components_fts USING fts5(text, prefix='2 3')")
+    cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS components_fts_ai AFTER INSERT ON components BEGIN
+            INSERT INTO components_fts(rowid, text)
+            VALUES (new.id, component_search_text(new.component_data));
+        END
+    ''')
+    cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS components_fts_ad AFTER DELETE ON components BEGIN
+            DELETE FROM components_fts WHERE rowid = old.id;
+        END
+    ''')
+    cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS components_fts_au AFTER UPDATE OF component_data ON components BEGIN
+            UPDATE components_fts SET text = component_search_text(new.component_data)
+            WHERE rowid = new.id;
+        END
+    ''')
+    cursor.execute('''
+        INSERT INTO components_fts(rowid, text)
+        SELECT id, component_search_text(component_data) FROM components
+    ''')
+
+def _migrate_v5(cursor):
+    # Small key/value settings table (e.g. component_codec)
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS app_meta (
+        key TEXT PRIMARY KEY,
+        value TEXT NOT NULL
+    )
+    ''')
+    # Shapes referenced by component_data stored with the "packed" codec
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS codec_schemas (
+        hash TEXT PRIMARY KEY,
+        shape TEXT NOT NULL
+    )
+    ''')
+
+def _migrate_v6(cursor):
+    cursor.execute("ALTER TABLE components ADD COLUMN sort_key REAL")
+    # Existing order (position, then id for ties/NULLs) becomes keys GAP apart
+    rows = cursor.execute(
+        "SELECT id, page_id FROM components ORDER BY page_id, position IS NULL, position, id"
+    ).fetchall()
+    updates, page_id, index = [], None, 0
+    for component_id, component_page in rows:
+        index = index + 1 if component_page == page_id else 1
+        page_id = component_page
+        updates.append((index * SORT_KEY_GAP, component_id))
+    cursor.executemany("UPDATE components SET sort_key = ? WHERE id = ?", updates)
+
+    # get_page_components: WHERE page_id = ? ORDER BY sort_key
+    cursor.execute("DROP INDEX IF EXISTS idx_components_page_position")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_components_page_sort ON components(page_id, sort_key)")
+    # position is no longer maintained; drop it where SQLite can (3.35+)
+    if sqlite3.sqlite_version_info >= (3, 35, 0):
+        cursor.execute("ALTER TABLE components DROP COLUMN position")
+
+def _migrate_v7(cursor):
+    # updated_at on pages and components, kept current by triggers so every
+    # writer (editor, importer, CLI, raw SQL) is covered. A page's updated_at
+    # also moves when any of its components is added, changed or removed;
+    # incremental exports use it to skip pages without loading them.
+    cursor.execute("ALTER TABLE pages ADD COLUMN updated_at TEXT")
+    cursor.execute("ALTER TABLE components ADD COLUMN updated_at TEXT")
+    cursor.execute("UPDATE pages SET updated_at = created_at")
+    cursor.execute(
+        "UPDATE components SET updated_at = (SELECT created_at FROM pages WHERE pages.id = components.page_id)"
+    )
+    cursor.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS pages_updated_ai AFTER INSERT ON pages
+        WHEN new.updated_at IS NULL BEGIN
+            UPDATE pages SET updated_at = {SQL_NOW} WHERE id = new.id;
+        END
+    ''')
+    cursor.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS pages_updated_au AFTER UPDATE OF title ON pages BEGIN
+            UPDATE pages SET updated_at = {SQL_NOW} WHERE id = new.id;
+        END
+    ''')
+    cursor.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS components_updated_ai AFTER INSERT ON components
+        WHEN new.updated_at IS NULL BEGIN
+            UPDATE components SET updated_at = {SQL_NOW} WHERE id = new.id;
+        END
+    ''')
+    cursor.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS components_page_updated_ai AFTER INSERT ON components BEGIN
+            UPDATE pages SET updated_at = {SQL_NOW} WHERE id = new.page_id;
+        END
+    ''')
+    cursor.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS components_updated_au
+        AFTER UPDATE OF component_type, component_data, sort_key, page_id ON components BEGIN
+            UPDATE components SET updated_at = {SQL_NOW} WHERE id = new.id;
+            UPDATE pages SET updated_at = {SQL_NOW} WHERE id IN (old.page_id, new.page_id);
+        END
+    ''')
+    cursor.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS components_updated_ad AFTER DELETE ON components BEGIN
+            UPDATE pages SET updated_at = {SQL_NOW} WHERE id = old.page_id;
+        END
+    ''')
+
+def _migrate_v8(cursor):
+    # The v7 UPDATE triggers fired on any write to the watched columns, so
+    # saving a page without edits still marked it changed. Only bump
+    # updated_at when a value actually differs.
+    cursor.execute("DROP TRIGGER IF EXISTS pages_updated_au")
+    cursor.execute("DROP TRIGGER IF EXISTS components_updated_au")
+    cursor.execute(f'''
+        CREATE TRIGGER pages_updated_au AFTER UPDATE OF title ON pages
+        WHEN old.title IS NOT new.title BEGIN
+            UPDATE pages SET updated_at = {SQL_NOW} WHERE id = new.id;
+        END
+    ''')
+    cursor.execute(f'''
+        CREATE TRIGGER components_updated_au
+        AFTER UPDATE OF component_type, component_data, sort_key, page_id ON components
+        WHEN old.component_type IS NOT new.component_type
+            OR old.component_data IS NOT new.component_data
+            OR old.sort_key IS NOT new.sort_key
+            OR old.page_id IS NOT new.page_id BEGIN
+            UPDATE components SET updated_at = {SQL_NOW} WHERE id = new.id;
+            UPDATE pages SET updated_at = {SQL_NOW} WHERE id IN (old.page_id, new.page_id);
+        END
+    ''')
+
+_MIGRATIONS = [
+    (1, _migrate_v1),
+    (2, _migrate_v2),
+    (3, _migrate_v3),
+    (4, _migrate_v4),
+    (5, _migrate_v5),
+    (6, _migrate_v6),
+    (7, _migrate_v7),
+    (8, _migrate_v8),
+]
+
+# db_path -> codec used for new writes (see DBHandler.codec)
+_component_codecs = {}
+# (db_path, shape hash) pairs known to be committed to codec_schemas
+_stored_shapes = set()
+
+SCHEMA_VERSION = _MIGRATIONS[-1][0]
+
+def _text_snippet(text: str, start: int, width: int = 60) -> str:
+    """About width characters of text's line around start, for search results without FTS5."""
+    line_start = text.rfind("\n", 0, start) + 1
+    line_end = text.find("\n", start)
+    if line_end == -1:
+        line_end = len(text)
+    begin = max(line_start, start - width // 3)
+    end = min(line_end, begin + width)
+    return ("…" if begin > 0 else "") + text[begin:end] + ("…" if end < len(text) else "")
+
+def fts_query(text: str) -> str:
+    """
+    Turn search box text into an FTS5 query: every word must match, as a
+    prefix, so typing "Hom pag" finds "Home page". Quotes keep FTS5 syntax
+    characters in user input from being interpreted.
+    """
+    terms = ['"' + word.replace('"', '""') + '"*' for word in text.split()]
+    return " AND ".join(terms)
+
 class DBHandler:
-    def __init__(self):
-        self.db_path = _get_db_path()
-        _ensure_db_exists(self.db_path)
+    def __init__(self, db_path=None):
+        # db_path lets scripts/CLI point at another database file
+        if db_path is None:
+            self.db_path = _get_db_path()
+            _ensure_db_exists(self.db_path)
+        else:
+            self.db_path = os.path.abspath(db_path)
+            os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+
+        # Schema setup runs once per database file per process
+        with _init_lock:
+            if self.db_path not in _initialized_paths:
+                self.init_db()
+                _initialized_paths.add(self.db_path)
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        _thread_state(self.db_path)["handlers"].add(self)
+        return get_connection(self.db_path)
 
-        # Now open the DB from the writable location
-        self.conn = sqlite3.connect(self.db_path)
-        self.conn.row_factory = sqlite3.Row
-        self.init_db()
+    def _commit(self):
+        # Inside transaction() the outermost block commits once at the end
+        state = _thread_state(self.db_path)
+        if state["tx_depth"] == 0:
+            self.conn.commit()
+            self._shapes_committed(state)
+
+    def _shapes_committed(self, state):
+        # Only now can later writes rely on these codec_schemas rows existing
+        _stored_shapes.update((self.db_path, shape_hash) for shape_hash in state["pending_shapes"])
+        state["pending_shapes"].clear()
+
+    @contextmanager
+    def transaction(self):
+        """
+        Group several writes into one commit (and one fsync):
+
+            with db.transaction():
+                db.update_page_title(...)
+                db.update_component(...)
+
+        Nested blocks join the outer transaction. Rolls back on error.
+        """
+        state = _thread_state(self.db_path)
+        conn = self.conn
+        if state["tx_depth"] == 0 and not conn.in_transaction:
+            # Take the write lock up front instead of failing halfway through
+            conn.execute("BEGIN IMMEDIATE")
+        state["tx_depth"] += 1
+        try:
+            yield self
+        except BaseException:
+            state["tx_depth"] -= 1
+            if state["tx_depth"] == 0:
+                conn.rollback()
+                # Rolled back with the rows using them: insert them again next time
+                state["pending_shapes"].clear()
+            raise
+        else:
+            state["tx_depth"] -= 1
+            if state["tx_depth"] == 0:
+                conn.commit()
+                self._shapes_committed(state)
 
     def init_db(self):
         cursor = self.conn.cursor()
@@ -89,24 +537,174 @@ class DBHandler:
             FOREIGN KEY(page_id) REFERENCES pages(id)
         )
         ''')
-        self.conn.commit()
+        self._commit()
+        self.migrate()
+        # Finish a codec change that was interrupted (see set_codec)
+        if self.get_meta("codec_reencode_after") is not None:
+            self.reencode_components()
+
+    def migrate(self):
+        """Bring the schema up to SCHEMA_VERSION, one migration at a time."""
+        conn = self.conn
+        current = conn.execute("PRAGMA user_version").fetchone()[0]
+        pending = [(v, fn) for v, fn in _MIGRATIONS if v > current]
+        if not pending:
+            return
+
+        # Table rebuilds must not trip FK checks midway; can only toggle outside a transaction
+        conn.execute("PRAGMA foreign_keys=OFF")
+        try:
+            for version, fn in pending:
+                with self.transaction():
+                    fn(conn.cursor())
+                    conn.execute(f"PRAGMA user_version = {version}")
+        finally:
+            conn.execute("PRAGMA foreign_keys=ON")
+
+    # ---------- settings ----------
+
+    def get_meta(self, key, default=None):
+        cursor = self.conn.cursor()
+        cursor.execute("SELECT value FROM app_meta WHERE key = ?", (key,))
+        row = cursor.fetchone()
+        return row['value'] if row is not None else default
+
+    def set_meta(self, key, value):
+        cursor = self.conn.cursor()
+        if value is None:
+            cursor.execute("DELETE FROM app_meta WHERE key = ?", (key,))
+        else:
+            cursor.execute(
+                "INSERT OR REPLACE INTO app_meta (key, value) VALUES (?, ?)", (key, str(value))
+            )
+        self._commit()
+
+    # ---------- component data codec ----------
+
+    @property
+    def codec(self):
+        """Codec used to store component_data on write (see database/codecs.py)."""
+        codec = _component_codecs.get(self.db_path)
+        if codec is None:
+            codec = _component_codecs[self.db_path] = self.get_meta("component_codec", codecs.DEFAULT_CODEC)
+        return codec
+
+    def _encode(self, data):
+        value, new_shape = codecs.encode(data, self.codec)
+        if new_shape is not None and (self.db_path, new_shape[0]) not in _stored_shapes:
+            pending = _thread_state(self.db_path)["pending_shapes"]
+            if new_shape[0] not in pending:
+                # In the same transaction as the row that needs it; cached once committed
+                self.conn.execute("INSERT OR IGNORE INTO codec_schemas (hash, shape) VALUES (?, ?)", new_shape)
+                pending.add(new_shape[0])
+        return value
+
+    def _decode(self, value):
+        return codecs.decode(value, partial(_read_shape, self.db_path))
+
+    def set_codec(self, codec, progress=None):
+        """
+        Store component data with `codec` from now on and re-encode the rows
+        already stored. Re-encoding runs in batches, each its own transaction;
+        if it's interrupted, it resumes the next time the database is opened.
+        """
+        if codec not in codecs.CODECS:
+            raise ValueError(f"Unknown component data codec: {codec} (choose from {', '.join(codecs.CODECS)})")
+        with self.transaction():
+            self.set_meta("component_codec", codec)
+            self.set_meta("codec_reencode_after", 0)
+        _component_codecs[self.db_path] = codec
+        return self.reencode_components(progress)
+
+    def reencode_components(self, progress=None, batch_size=1000):
+        """Re-encode components stored with another codec; returns the number rewritten."""
+        cursor = self.conn.cursor()
+        cursor.execute("SELECT COUNT(*) FROM components")
+        total = cursor.fetchone()[0]
+        last_id = int(self.get_meta("codec_reencode_after", 0))
+        done = rewritten = 0
+        while True:
+            cursor.execute(
+                "SELECT id, component_data FROM components WHERE id > ? ORDER BY id LIMIT ?",
+                (last_id, batch_size)
+            )
+            rows = cursor.fetchall()
+            if not rows:
+                break
+            with self.transaction():
+                updates = []
+                for row in rows:
+                    value = self._encode(self._decode(row['component_data']))
+                    if value != row['component_data']:
+                        updates.append((value, row['id']))
+                cursor.executemany("UPDATE components SET component_data = ? WHERE id = ?", updates)
+                last_id = rows[-1]['id']
+                self.set_meta("codec_reencode_after", last_id)
+            done += len(rows)
+            rewritten += len(updates)
+            if progress:
+                progress(done, total)
+        self.set_meta("codec_reencode_after", None)
+        return rewritten
 
     # Create a new page
     def create_page(self, title):
         cursor = self.conn.cursor()
         cursor.execute("INSERT INTO pages (title) VALUES (?)", (title,))
-        self.conn.commit()
+        self._commit()
         return cursor.lastrowid
 
-    # Add a component to a specific page
-    def add_component(self, page_id, component_type, component_data, position):
+    def insert_pages(self, pages):
+        """
+        Bulk insert for imports: pages is [(title, created_at or None,
+        [(component_type, data), ...])], components in page order. Page ids
+        are assigned up front so both tables go in with one executemany
+        each; run it inside transaction() so nothing else can take those ids.
+        Returns the new page ids.
+        """
+        cursor = self.conn.cursor()
+        # Never reuse the id of a deleted page (pages is AUTOINCREMENT)
+        cursor.execute('''
+            SELECT MAX(COALESCE((SELECT MAX(id) FROM pages), 0),
+                       COALESCE((SELECT seq FROM sqlite_sequence WHERE name = 'pages'), 0))
+        ''')
+        first_id = cursor.fetchone()[0] + 1
+        page_ids = list(range(first_id, first_id + len(pages)))
+        cursor.executemany(
+            "INSERT INTO pages (id, title, created_at) VALUES (?, ?, COALESCE(?, CURRENT_TIMESTAMP))",
+            ((page_id, title, created_at) for page_id, (title, created_at, _) in zip(page_ids, pages)),
+        )
+        # Encode first: packed shapes are written to codec_schemas as a side effect
+        rows = [
+            (page_id, component_type, self._encode(data), position * SORT_KEY_GAP)
+            for page_id, (_, _, components) in zip(page_ids, pages)
+            for position, (component_type, data) in enumerate(components, start=1)
+        ]
+        cursor.executemany(
+            "INSERT INTO components (page_id, component_type, component_data, sort_key) VALUES (?, ?, ?, ?)",
+            rows,
+        )
+        self._commit()
+        return page_ids
+
+    # Add a component to a specific page. Without a sort_key it goes after the
+    # page's last component; position (1-based) maps to position * SORT_KEY_GAP.
+    def add_component(self, page_id, component_type, component_data, position=None, sort_key=None):
         cursor = self.conn.cursor()
-        component_json = json.dumps(component_data)
+        component_json = self._encode(component_data)
+        if sort_key is None and position is not None:
+            sort_key = position * SORT_KEY_GAP
+        if sort_key is None:
+            cursor.execute(
+                "SELECT COALESCE(MAX(sort_key), 0) + ? FROM components WHERE page_id = ?",
+                (SORT_KEY_GAP, page_id)
+            )
+            sort_key = cursor.fetchone()[0]
         cursor.execute('''
-            INSERT INTO components (page_id, component_type, component_data, position)
+            INSERT INTO components (page_id, component_type, component_data, sort_key)
             VALUES (?, ?, ?, ?)
-        ''', (page_id, component_type, component_json, position))
-        self.conn.commit()
+        ''', (page_id, component_type, component_json, sort_key))
+        self._commit()
         return cursor.lastrowid
 
     # Get all pages
@@ -115,45 +713,288 @@ class DBHandler:
         cursor.execute("SELECT * FROM pages ORDER BY created_at DESC")
         return cursor.fetchall()
 
-    # Get all components for a given page
+    # One batch of the page list (newest first), continuing after the last row
+    # of the previous batch: after = (created_at, id) of that row. Keyset paging
+    # stays as fast on the last batch as on the first, unlike OFFSET.
+    def get_pages_batch(self, limit, after=None):
+        cursor = self.conn.cursor()
+        if after is None:
+            cursor.execute(
+                "SELECT id, title, created_at FROM pages ORDER BY created_at DESC, id DESC LIMIT ?",
+                (limit,)
+            )
+        else:
+            cursor.execute('''
+                SELECT id, title, created_at FROM pages
+                WHERE (created_at, id) < (?, ?)
+                ORDER BY created_at DESC, id DESC
+                LIMIT ?
+            ''', (after[0], after[1], limit))
+        return cursor.fetchall()
+
+    def has_table(self, name):
+        cursor = self.conn.cursor()
+        cursor.execute("SELECT 1 FROM sqlite_master WHERE name = ?", (name,))
+        return cursor.fetchone() is not None
+
+    # Pages whose title matches the search text (every word, as a prefix)
+    def search_pages(self, text, limit=200, offset=0):
+        query = fts_query(text)
+        if not query:
+            return []
+        cursor = self.conn.cursor()
+        if self.has_table("pages_fts"):
+            # Newest first, in the same order as the page list (get_pages_batch)
+            cursor.execute('''
+                SELECT p.id, p.title, p.created_at
+                FROM pages_fts f JOIN pages p ON p.id = f.rowid
+                WHERE pages_fts MATCH ?
+                ORDER BY p.created_at DESC, p.id DESC
+                LIMIT ? OFFSET ?
+            ''', (query, limit, offset))
+        else:
+            # No FTS5 in this SQLite build: substring match on every word
+            words = text.split()
+            where = " AND ".join("title LIKE ? ESCAPE '\\'" for _ in words)
+            params = ["%" + w.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%" for w in words]
+            cursor.execute(
+                f"SELECT id, title, created_at FROM pages WHERE {where} "
+                "ORDER BY created_at DESC, id DESC LIMIT ? OFFSET ?",
+                (*params, limit, offset)
+            )
+        return cursor.fetchall()
+
+    # Components whose text matches: yields (component_id, page_id, type, snippet),
+    # pages newest first (page list order), components in page order
+    def _search_components(self, text):
+        query = fts_query(text)
+        if not query:
+            return
+        cursor = self.conn.cursor()
+        if self.has_table("components_fts"):
+            cursor.execute('''
+                SELECT c.id, c.page_id, c.component_type,
+                       snippet(components_fts, 0, '', '', '…', 12) AS snippet
+                FROM components_fts f
+                JOIN components c ON c.id = f.rowid
+                JOIN pages p ON p.id = c.page_id
+                WHERE components_fts MATCH ?
+                ORDER BY p.created_at DESC, p.id DESC, c.sort_key, c.id
+            ''', (query,))
+            while True:
+                rows = cursor.fetchmany(200)
+                if not rows:
+                    return
+                for row in rows:
+                    yield row['id'], row['page_id'], row['component_type'], row['snippet']
+
+        # No FTS5 in this SQLite build: component_data may be compressed or
+        # packed, so decode every row and match substrings of its text here
+        words = [word.casefold() for word in text.split()]
+        load_shape = partial(_read_shape, self.db_path)
+        cursor.execute('''
+            SELECT c.id, c.page_id, c.component_type, c.component_data
+            FROM components c JOIN pages p ON p.id = c.page_id
+            ORDER BY p.created_at DESC, p.id DESC, c.sort_key, c.id
+        ''')
+        while True:
+            rows = cursor.fetchmany(200)
+            if not rows:
+                return
+            for row in rows:
+                search_text = component_search_text(row['component_data'], load_shape)
+                folded = search_text.casefold()
+                if all(word in folded for word in words):
+                    snippet = _text_snippet(search_text, folded.find(words[0]))
+                    yield row['id'], row['page_id'], row['component_type'], snippet
+
+    # Search page titles and component content
+    def search(self, text, limit=200):
+        """
+        Pages whose title or any component matches text (every word, as a
+        prefix), at most `limit` pages, newest first as in the page list:
+
+            [{'id', 'title', 'created_at', 'title_match': bool,
+              'components': [{'id', 'type', 'snippet'}]}]
+
+        Component matches are read in that order too and stop as soon as
+        `limit` pages have been found.
+        """
+        results = {}
+        for row in self.search_pages(text, limit):
+            results[row['id']] = {
+                'id': row['id'], 'title': row['title'], 'created_at': row['created_at'],
+                'title_match': True, 'components': [],
+            }
+
+        component_pages = set()
+        for comp_id, page_id, ctype, snippet in self._search_components(text):
+            if page_id not in component_pages:
+                if len(component_pages) >= limit:
+                    break
+                component_pages.add(page_id)
+            page = results.get(page_id)
+            if page is None:
+                page = results[page_id] = {'id': page_id, 'title_match': False, 'components': []}
+            page['components'].append({'id': comp_id, 'type': ctype, 'snippet': snippet})
+
+        missing = [page_id for page_id, page in results.items() if 'title' not in page]
+        if missing:
+            cursor = self.conn.cursor()
+            placeholders = ",".join("?" for _ in missing)
+            cursor.execute(f"SELECT id, title, created_at FROM pages WHERE id IN ({placeholders})", missing)
+            for row in cursor.fetchall():
+                results[row['id']].update(title=row['title'], created_at=row['created_at'])
+
+        pages = [page for page in results.values() if 'title' in page]
+        # Both lists are the newest `limit` of their kind, so these are the newest overall
+        pages.sort(key=lambda page: (page['created_at'] or "", page['id']), reverse=True)
+        return pages[:limit]
+
+    # Get a single page by id (None if it doesn't exist)
+    def get_page(self, page_id):
+        cursor = self.conn.cursor()
+        cursor.execute("SELECT * FROM pages WHERE id = ?", (page_id,))
+        return cursor.fetchone()
+
+    # Page row plus its component count, without loading component data
+    def get_page_summary(self, page_id):
+        cursor = self.conn.cursor()
+        cursor.execute('''
+            SELECT p.id, p.title, p.created_at,
+                   (SELECT COUNT(*) FROM components c WHERE c.page_id = p.id) AS component_count
+            FROM pages p
+            WHERE p.id = ?
+        ''', (page_id,))
+        row = cursor.fetchone()
+        if row is None:
+            return None
+        return {
+            'id': row['id'],
+            'title': row['title'],
+            'created_at': row['created_at'],
+            'component_count': row['component_count']
+        }
+
+    # Get all components for a given page, in order. 'position' is the
+    # 1-based place in the page; 'sort_key' is what's stored.
     def get_page_components(self, page_id):
         cursor = self.conn.cursor()
         cursor.execute('''
-            SELECT * FROM components
+            SELECT id, component_type, component_data, sort_key FROM components
             WHERE page_id = ?
-            ORDER BY position ASC
+            ORDER BY sort_key ASC, id ASC
         ''', (page_id,))
         rows = cursor.fetchall()
         components = []
-        for row in rows:
+        for position, row in enumerate(rows, start=1):
             component = {
                 'id': row['id'],
                 'type': row['component_type'],
-                'data': json.loads(row['component_data']),
-                'position': row['position']
+                'data': self._decode(row['component_data']),
+                'position': position,
+                'sort_key': row['sort_key']
             }
             components.append(component)
         return components
 
+    # Count pages (used for progress reporting on bulk operations)
+    def count_pages(self):
+        cursor = self.conn.cursor()
+        cursor.execute("SELECT COUNT(*) FROM pages")
+        return cursor.fetchone()[0]
+
+    # Distinct component types on the given pages (or on any page)
+    def component_types_in_use(self, page_ids=None):
+        cursor = self.conn.cursor()
+        if page_ids is None:
+            cursor.execute("SELECT DISTINCT component_type FROM components")
+            return {row[0] for row in cursor.fetchall()}
+        types = set()
+        page_ids = list(page_ids)
+        # Stay well below SQLite's bound-parameter limit
+        for i in range(0, len(page_ids), 500):
+            chunk = page_ids[i:i + 500]
+            cursor.execute(
+                f"SELECT DISTINCT component_type FROM components WHERE page_id IN ({','.join('?' * len(chunk))})",
+                chunk
+            )
+            types.update(row[0] for row in cursor.fetchall())
+        return types
+
+    # Current time as the triggers write updated_at (see SQL_NOW)
+    def now(self):
+        cursor = self.conn.cursor()
+        cursor.execute(f"SELECT {SQL_NOW}")
+        return cursor.fetchone()[0]
+
+    # (page_id, updated_at) per page, without loading any components
+    def iter_page_updates(self, page_ids=None):
+        cursor = self.conn.cursor()
+        if page_ids is None:
+            cursor.execute("SELECT id, updated_at FROM pages ORDER BY id ASC")
+            while True:
+                rows = cursor.fetchmany(500)
+                if not rows:
+                    break
+                for row in rows:
+                    yield row['id'], row['updated_at']
+        else:
+            for page_id in page_ids:
+                cursor.execute("SELECT id, updated_at FROM pages WHERE id = ?", (page_id,))
+                row = cursor.fetchone()
+                if row is not None:
+                    yield row['id'], row['updated_at']
+
+    # Stream pages with their components, one page at a time
+    def iter_pages(self, page_ids=None):
+        """
+        Yields {'id', 'title', 'components'} per page without loading the whole
+        table into memory. page_ids restricts (and orders) the pages returned.
+        """
+        if page_ids is None:
+            cursor = self.conn.cursor()
+            cursor.execute("SELECT id, title FROM pages ORDER BY id ASC")
+            while True:
+                rows = cursor.fetchmany(200)
+                if not rows:
+                    break
+                for row in rows:
+                    yield {
+                        'id': row['id'],
+                        'title': row['title'],
+                        'components': self.get_page_components(row['id'])
+                    }
+        else:
+            for page_id in page_ids:
+                row = self.get_page(page_id)
+                if row is None:
+                    continue
+                yield {
+                    'id': row['id'],
+                    'title': row['title'],
+                    'components': self.get_page_components(row['id'])
+                }
+
     # Update a page's title
     def update_page_title(self, page_id, new_title):
         cursor = self.conn.cursor()
         cursor.execute(
             "UPDATE pages SET title = ? WHERE id = ?", (new_title, page_id)
         )
-        self.conn.commit()
+        self._commit()
 
     # Update a component within a page
-    def update_component(self, component_id, component_data, position=None):
+    def update_component(self, component_id, component_data, sort_key=None):
         cursor = self.conn.cursor()
-        component_json = json.dumps(component_data)
+        component_json = self._encode(component_data)
 
-        if position is not None:
+        if sort_key is not None:
             cursor.execute('''
                 UPDATE components
-                SET component_data = ?, position = ?
+                SET component_data = ?, sort_key = ?
                 WHERE id = ?
-            ''', (component_json, position, component_id))
+            ''', (component_json, sort_key, component_id))
         else:
             cursor.execute('''
                 UPDATE components
@@ -161,21 +1002,142 @@ class DBHandler:
                 WHERE id = ?
             ''', (component_json, component_id))
 
-        self.conn.commit()
+        self._commit()
+
+    # Batch-update data and order: rows of (component_id, component_data, sort_key)
+    def update_components(self, rows):
+        # Encode first: packed shapes are written to codec_schemas as a side effect
+        params = [(self._encode(data), sort_key, component_id) for component_id, data, sort_key in rows]
+        cursor = self.conn.cursor()
+        cursor.executemany('''
+            UPDATE components
+            SET component_data = ?, sort_key = ?
+            WHERE id = ?
+        ''', params)
+        self._commit()
+
+    # Batch-update order only: rows of (component_id, sort_key)
+    def update_component_sort_keys(self, rows):
+        cursor = self.conn.cursor()
+        cursor.executemany(
+            "UPDATE components SET sort_key = ? WHERE id = ?",
+            ((sort_key, component_id) for component_id, sort_key in rows)
+        )
+        self._commit()
+
+    def rebalance_sort_keys(self, page_ids=None, only_cramped=True):
+        """
+        Renumber component sort keys to SORT_KEY_GAP apart, keeping the order.
+        With only_cramped, just pages where two neighbours are closer than
+        MIN_SORT_KEY_GAP (or a key is missing). Returns (pages, rows) rewritten.
+        """
+        cursor = self.conn.cursor()
+        if page_ids is None:
+            cursor.execute("SELECT id, page_id, sort_key FROM components ORDER BY page_id, sort_key, id")
+        else:
+            cursor.execute(
+                f"SELECT id, page_id, sort_key FROM components WHERE page_id IN ({','.join('?' * len(page_ids))}) "
+                "ORDER BY page_id, sort_key, id",
+                list(page_ids)
+            )
+
+        pages = rows = 0
+
+        def renumber(page):
+            nonlocal pages, rows
+            if only_cramped and not _is_cramped([key for _, key in page]):
+                return
+            updates = [
+                (index * SORT_KEY_GAP, component_id)
+                for index, (component_id, key) in enumerate(page, start=1)
+                if key != index * SORT_KEY_GAP
+            ]
+            if updates:
+                self.conn.executemany("UPDATE components SET sort_key = ? WHERE id = ?", updates)
+                pages += 1
+                rows += len(updates)
+
+        with self.transaction():
+            page, current = [], None
+            for row in cursor.fetchall():
+                if row['page_id'] != current and page:
+                    renumber(page)
+                    page = []
+                current = row['page_id']
+                page.append((row['id'], row['sort_key']))
+            if page:
+                renumber(page)
+        return pages, rows
 
     # Delete a single component from a page
     def delete_component(self, component_id):
         cursor = self.conn.cursor()
         cursor.execute("DELETE FROM components WHERE id = ?", (component_id,))
-        self.conn.commit()
+        self._commit()
 
-    # Delete an entire page and all associated components
+    # Delete an entire page (components go with it via ON DELETE CASCADE)
     def delete_page(self, page_id):
         cursor = self.conn.cursor()
-        cursor.execute("DELETE FROM components WHERE page_id = ?", (page_id,))
         cursor.execute("DELETE FROM pages WHERE id = ?", (page_id,))
-        self.conn.commit()
+        self._commit()
+
+    # Look up one rendered component (None on a miss)
+    def get_rendered_component(self, component_type, template_mtime, data_hash):
+        cursor = self.conn.cursor()
+        cursor.execute('''
+            SELECT html FROM render_cache
+            WHERE component_type = ? AND template_mtime = ? AND data_hash = ?
+        ''', (component_type, template_mtime, data_hash))
+        row = cursor.fetchone()
+        return row['html'] if row is not None else None
+
+    # Store rendered components: rows of (component_type, template_mtime, data_hash, html)
+    def put_rendered_components(self, rows):
+        now = time.time()
+        cursor = self.conn.cursor()
+        cursor.executemany('''
+            INSERT OR REPLACE INTO render_cache
+                (component_type, template_mtime, data_hash, html, size, last_used)
+            VALUES (?, ?, ?, ?, ?, ?)
+        ''', ((ctype, mtime, data_hash, html, len(html.encode("utf-8")), now)
+              for ctype, mtime, data_hash, html in rows))
+        self._commit()
+
+    # Mark cache entries as used: rows of (component_type, template_mtime, data_hash)
+    def touch_rendered_components(self, rows):
+        now = time.time()
+        cursor = self.conn.cursor()
+        cursor.executemany('''
+            UPDATE render_cache SET last_used = ?
+            WHERE component_type = ? AND template_mtime = ? AND data_hash = ?
+        ''', ((now, ctype, mtime, data_hash) for ctype, mtime, data_hash in rows))
+        self._commit()
+
+    # Trim the render cache to max_bytes of HTML, least recently used first
+    def prune_render_cache(self, max_bytes):
+        cursor = self.conn.cursor()
+        cursor.execute('''
+            DELETE FROM render_cache WHERE rowid IN (
+                SELECT rowid FROM (
+                    SELECT rowid, SUM(size) OVER (ORDER BY last_used DESC, rowid DESC) AS running
+                    FROM render_cache
+                ) WHERE running > ?
+            )
+        ''', (max_bytes,))
+        self._commit()
+        return cursor.rowcount
+
+    def clear_render_cache(self):
+        cursor = self.conn.cursor()
+        cursor.execute("DELETE FROM render_cache")
+        self._commit()
 
     def close(self):
-        if hasattr(self, "conn") and self.conn:
-            self.conn.close()
+        # The connection is shared by every DBHandler on this thread: only
+        # close it once none of the others are still using it
+        state = getattr(_local, "states", {}).get(self.db_path)
+        if state is None:
+            return
+        state["handlers"].discard(self)
+        if not state["handlers"]:
+            close_connection(self.db_path)
@@ -1,27 +1,163 @@
+import time
+_STARTED = time.perf_counter()
+
+import os
 import sys
-from PyQt5.QtWidgets import QApplication, QWidget, QHBoxLayout
+from PyQt5.QtWidgets import QApplication, QWidget, QHBoxLayout, QShortcut
+from PyQt5.QtCore import QEvent, QObject, QTimer
+from PyQt5.QtGui import QKeySequence
+from controllers import instrumentation
+from database.db_handler import DBHandler, _user_data_dir
 from views.left_panel import LeftPanel
 from views.right_panel import RightPanel
+from views.preview_panel import PreviewPanel
+_IMPORTED = time.perf_counter()
+
+
+class StartupProfile:
+    """
+    Per-phase startup timings, printed once the page list has loaded:
+
+        python main.py --profile-startup
+        python main.py --profile-startup --quit-after-startup   (scripted runs)
+
+    Written to stderr, or to startup_profile.txt in the user data folder when
+    there is no console (the --noconsole Windows build).
+    """
+
+    def __init__(self, enabled: bool, quit_after: bool = False):
+        self.enabled = enabled
+        self.quit_after = quit_after
+        # (phase, started, ended) as perf_counter() values
+        self.phases = [("imports", _STARTED, _IMPORTED)]
+        self._last = _IMPORTED
+
+    def mark(self, phase: str) -> float:
+        """End a sequential phase that started where the previous one ended."""
+        now = time.perf_counter()
+        self.phases.append((phase, self._last, now))
+        self._last = now
+        return now
+
+    def record(self, phase: str, started: float):
+        """End a phase that overlaps others (e.g. the background page list load)."""
+        self.phases.append((phase, started, time.perf_counter()))
+
+    def report(self) -> str:
+        lines = [f"Startup profile (ms):  {'phase':<26} {'took':>8} {'done at':>8}"]
+        for phase, started, ended in self.phases:
+            lines.append(
+                f"                       {phase:<26} {(ended - started) * 1000:>8.1f} "
+                f"{(ended - _STARTED) * 1000:>8.1f}"
+            )
+        return "\n".join(lines)
+
+    def finish(self):
+        if not self.enabled:
+            return
+        text = self.report()
+        if sys.stderr is not None:
+            print(text, file=sys.stderr)
+        else:
+            with open(os.path.join(_user_data_dir(), "startup_profile.txt"), "w", encoding="utf-8") as f:
+                f.write(text + "\n")
+        if self.quit_after:
+            QApplication.instance().quit()
+
+
+class _FirstPaint(QObject):
+    """Calls callback once, right after the watched widget has painted for the first time."""
+
+    def __init__(self, widget, callback):
+        super().__init__(widget)
+        self._widget = widget
+        self._callback = callback
+        widget.installEventFilter(self)
+
+    def eventFilter(self, obj, event):
+        if event.type() == QEvent.Paint:
+            self._widget.removeEventFilter(self)
+            # Runs after the paint event itself has been handled
+            QTimer.singleShot(0, self._callback)
+        return False
+
 
 class MainWindow(QWidget):
     def __init__(self):
         super().__init__()
         self.setWindowTitle('Components Generator')
-        self.setGeometry(100, 100, 1100, 700)
+        self.setGeometry(100, 100, 1500, 700)
 
         main_layout = QHBoxLayout()
 
         # Initialize panels clearly
         self.left_panel = LeftPanel(self)
         self.right_panel = RightPanel(self)
+        self.preview_panel = PreviewPanel(self.right_panel, self)
+        self.right_panel.saving_changed.connect(
+            lambda saving: self.left_panel.set_page_switching_enabled(not saving)
+        )
 
         main_layout.addWidget(self.left_panel, 1)
         main_layout.addWidget(self.right_panel, 3)
+        main_layout.addWidget(self.preview_panel, 2)
 
         self.setLayout(main_layout)
 
-if __name__ == "__main__":
-    app = QApplication(sys.argv)
+        # Timing histograms for slow saves/exports (see controllers/instrumentation.py)
+        self._diagnostics = None
+        QShortcut(QKeySequence("Ctrl+Shift+D"), self, activated=self.show_diagnostics)
+
+        # Don't hold up the first paint on the page list query
+        self.left_panel.load_pages_async()
+
+    def show_diagnostics(self):
+        if self._diagnostics is None:
+            from views.diagnostics_dialog import DiagnosticsDialog
+            self._diagnostics = DiagnosticsDialog(self)
+        self._diagnostics.show()
+        self._diagnostics.raise_()
+        self._diagnostics.activateWindow()
+
+
+def main(argv) -> int:
+    profile = StartupProfile("--profile-startup" in argv, "--quit-after-startup" in argv)
+    argv = [arg for arg in argv if arg not in ("--profile-startup", "--quit-after-startup")]
+
+    instrumentation.enable_from_environment()
+    app = QApplication(argv)
+    profile.mark("QApplication")
+
+    # Open (and if needed create/migrate) the database before any panel asks for it
+    DBHandler()
+    profile.mark("database open/init")
+
     window = MainWindow()
+    built = profile.mark("widget build")
+
+    # The page list loads in the background while the window paints
+    pending = {"painted", "pages"}
+
+    def phase_done(name, phase):
+        if name not in pending:
+            return
+        profile.record(phase, built)
+        pending.discard(name)
+        if not pending:
+            profile.finish()
+
+    window.left_panel.pages_loaded.connect(
+        lambda count: phase_done("pages", f"page list ({count} rows)")
+    )
+    if profile.enabled:
+        _FirstPaint(window, lambda: phase_done("painted", "show + first paint"))
     window.show()
-    sys.exit(app.exec_())
+    return app.exec_()
+
+
+if __name__ == "__main__":
+    # Bulk export uses a process pool; required for the frozen (PyInstaller) build.
+    # Imported here rather than at the top: nothing else needs it before an export.
+    import multiprocessing
+    multiprocessing.freeze_support()
+    sys.exit(main(sys.argv))
@@ -0,0 +1,23 @@
+import os
+import sys
+
+import pytest
+
+# The app runs from the repository root (python main.py / python cli.py)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database.db_handler import DBHandler, close_connection
+
+
+@pytest.fixture(autouse=True)
+def _home(tmp_path, monkeypatch):
+    # Keep the app data dir (default database, Jinja2 bytecode cache) out of the real home
+    monkeypatch.setenv("HOME", str(tmp_path / "home"))
+    monkeypatch.setenv("APPDATA", str(tmp_path / "home"))
+
+
+@pytest.fixture
+def db(tmp_path):
+    handler = DBHandler(str(tmp_path / "app_data.db"))
+    yield handler
+    close_connection(handler.db_path)
@@ -0,0 +1,76 @@
+import pytest
+
+from database import codecs
+
+DATA = {
+    "heading": "Café – 東京",
+    "count": 3,
+    "ratio": 0.5,
+    "bordered": True,
+    "note": None,
+    "tags": [],
+    "cards": [
+        {"title": "One", "image_src": "https://cdn.example.com/1.jpg", "bordered": False},
+        {"title": "Two", "image_src": "https://cdn.example.com/2.jpg", "bordered": True},
+    ],
+    "mixed": [1, "two", {"three": 3}],
+}
+
+
+@pytest.mark.parametrize("codec", codecs.CODECS)
+def test_round_trip(codec, monkeypatch):
+    value, new_shape = codecs.encode(DATA, codec)
+    shapes = dict([new_shape]) if new_shape else {}
+    # Packed values must decode from the stored shape alone
+    monkeypatch.setattr(codecs, "_shapes", {})
+    assert codecs.decode(value, shapes.get) == DATA
+
+
+@pytest.mark.parametrize("codec", codecs.CODECS)
+def test_empty_data(codec):
+    value, new_shape = codecs.encode({}, codec)
+    assert codecs.decode(value, dict([new_shape] if new_shape else []).get) == {}
+
+
+@pytest.mark.parametrize("codec, expected", [
+    ("json", "json"), ("compact", "json"), ("zlib", "zlib"), ("lzma", "lzma"), ("packed", "packed"),
+])
+def test_codec_of(codec, expected):
+    assert codecs.codec_of(codecs.encode(DATA, codec)[0]) == expected
+
+
+def test_json_is_the_original_format():
+    assert codecs.encode({"a": [1, 2]}, "json")[0] == '{"a": [1, 2]}'
+    assert codecs.encode({"a": "é"}, "compact")[0] == '{"a":"é"}'
+
+
+def test_packed_shape_is_shared_by_same_structure():
+    first = codecs.encode({"title": "A", "items": [{"x": 1}]}, "packed")[1]
+    second = codecs.encode({"title": "B", "items": [{"x": 2}, {"x": 3}]}, "packed")[1]
+    other = codecs.encode({"items": [{"x": 1}], "title": "A"}, "packed")[1]
+    assert first == second
+    assert first[0] != other[0]
+
+
+def test_packed_unknown_shape(monkeypatch):
+    value, _ = codecs.encode({"a": 1}, "packed")
+    monkeypatch.setattr(codecs, "_shapes", {})
+    with pytest.raises(ValueError, match="Unknown packed component shape"):
+        codecs.decode(value, lambda hash_: None)
+
+
+def test_unknown_codec():
+    with pytest.raises(ValueError):
+        codecs.encode({}, "bson")
+    with pytest.raises(ValueError):
+        codecs.decode(b"?payload")
+
+
+@pytest.mark.parametrize("codec", codecs.CODECS)
+def test_set_codec_reencodes_stored_rows(db, codec):
+    page_id = db.create_page("Home")
+    db.add_component(page_id, "cards_section", DATA)
+    db.set_codec(codec)
+    stored = db.conn.execute("SELECT component_data FROM components").fetchone()[0]
+    assert codecs.codec_of(stored) == ("json" if codec == "compact" else codec)
+    assert db.get_page_components(page_id)[0]['data'] == DATA
@@ -0,0 +1,101 @@
+from controllers.css_pipeline import combine_css
+
+
+def test_plain_join_keeps_sheets_verbatim():
+    assert combine_css(["  .a { color: red; }  ", "", ".b{}"]) == ".a { color: red; }\n\n.b{}"
+
+
+def test_minify():
+    css = """
+        /* heading */
+        .a  >  .b , .c {
+            COLOR : red ;
+            margin:  0   auto;
+        }
+        @media (max-width: 600px) { .a { color: blue } }
+        @import url("x.css");
+    """
+    assert combine_css([css], minify=True) == (
+        '.a>.b,.c{color:red;margin:0 auto}@media (max-width: 600px){.a{color:blue}}@import url("x.css");'
+    )
+
+
+def test_minify_keeps_custom_property_case():
+    assert combine_css([".a{--Main:red;color:var(--Main)}"], minify=True) == ".a{--Main:red;color:var(--Main)}"
+
+
+def test_minify_keeps_quoted_strings():
+    css = '.a:after { content: "a;  {b}  "; font-family: "Open  Sans",  serif }'
+    assert combine_css([css], minify=True) == '.a:after{content:"a;  {b}  ";font-family:"Open  Sans", serif}'
+
+
+def test_merge_dedupes_identical_rules():
+    sheets = [".a{color:red}", ".b{margin:0}", ".a{color:red}"]
+    assert combine_css(sheets, minify=True, merge=True) == ".a{color:red}.b{margin:0}"
+
+
+def test_merge_does_not_jump_over_other_class_setting_the_property():
+    # An element with class="a b" must stay green
+    sheets = [".a{color:red}", ".b{color:blue}", ".a{color:green}"]
+    assert combine_css(sheets, minify=True, merge=True) == ".a{color:red}.b{color:blue}.a{color:green}"
+
+
+def test_merge_jumps_over_provably_disjoint_selectors():
+    sheets = ["#a{color:red}", "#b{color:blue}", "#a{color:green}"]
+    assert combine_css(sheets, minify=True, merge=True) == "#a{color:green}#b{color:blue}"
+    sheets = [".x h1{color:red}", ".x p,li.y{color:blue}", ".x h1{color:green}"]
+    assert combine_css(sheets, minify=True, merge=True) == ".x h1{color:green}.x p,li.y{color:blue}"
+    sheets = ["h1{color:red}", ".x p,.y{color:blue}", "h1{color:green}"]
+    assert combine_css(sheets, minify=True, merge=True) == "h1{color:red}.x p,.y{color:blue}h1{color:green}"
+
+
+def test_merge_later_value_wins():
+    sheets = [".a{color:red;margin:0}", ".a{color:blue}"]
+    assert combine_css(sheets, minify=True, merge=True) == ".a{margin:0;color:blue}"
+
+
+def test_merge_replaces_fallback_duplicates():
+    sheets = [".a{display:-webkit-box;display:flex}", ".a{display:grid}"]
+    assert combine_css(sheets, minify=True, merge=True) == ".a{display:grid}"
+
+
+def test_merge_keeps_later_fallback_duplicates():
+    sheets = [".a{display:grid;color:red}", ".a{display:-webkit-box;display:flex}"]
+    assert combine_css(sheets, minify=True, merge=True) == ".a{color:red;display:-webkit-box;display:flex}"
+
+
+def test_merge_keeps_earlier_important():
+    sheets = [".a{color:red !important}", ".a{color:blue}"]
+    assert combine_css(sheets, minify=True, merge=True) == ".a{color:red !important}"
+
+
+def test_merge_custom_properties_are_case_sensitive():
+    sheets = [".a{--main:red;--Main:blue}", ".a{--Main:green}"]
+    assert combine_css(sheets, minify=True, merge=True) == ".a{--main:red;--Main:green}"
+
+
+def test_merge_does_not_jump_over_conflicting_rule():
+    sheets = [".a{color:red}", ".a.b{color:blue}", ".a{color:green}"]
+    assert combine_css(sheets, minify=True, merge=True) == ".a{color:red}.a.b{color:blue}.a{color:green}"
+
+
+def test_merge_media_blocks():
+    sheets = ["@media print{.a{color:red}}", ".b{margin:0}", "@media print{.c{color:blue}}"]
+    assert combine_css(sheets, minify=True, merge=True) == ".b{margin:0}@media print{.a{color:red}.c{color:blue}}"
+
+
+def test_merge_with_quoted_strings():
+    sheets = ['.a:after{content:"x;y"}', '.a:after{content:"}  {"}']
+    assert combine_css(sheets, minify=True, merge=True) == '.a:after{content:"}  {"}'
+
+
+def test_merge_without_minify_pretty_prints():
+    assert combine_css([".a,.b{color:red}", ".a,.b{margin:0}"], merge=True) == (
+        ".a, .b {\n    color: red;\n    margin: 0;\n}"
+    )
+
+
+def test_minify_keeps_quoted_attribute_selectors():
+    css = '.a [title="a  >  b"] ,  a[href$=\'.pdf\'] ~ .b { color: red }'
+    assert combine_css([css], minify=True) == '.a [title="a  >  b"],a[href$=\'.pdf\']~.b{color:red}'
+    assert combine_css(['[title="x,y"],.b{color:red}'], merge=True) == '[title="x,y"], .b {\n    color: red;\n}'
@@ -0,0 +1,81 @@
+import pytest
+
+from database import codecs
+from database.db_handler import DBHandler
+
+
+def _shape_rows(db):
+    return {row[0] for row in db.conn.execute("SELECT hash FROM codec_schemas")}
+
+
+def test_packed_shape_rewritten_after_rollback(db, monkeypatch):
+    db.set_codec("packed")
+    page_id = db.create_page("Home")
+    data = {"heading": "Welcome", "text": "Hello"}
+
+    with pytest.raises(RuntimeError):
+        with db.transaction():
+            db.add_component(page_id, "hero", data)
+            raise RuntimeError("abort")
+    assert _shape_rows(db) == set()
+
+    db.add_component(page_id, "hero", data)
+    assert len(_shape_rows(db)) == 1
+    # As a fresh process would: the shape can only come from codec_schemas
+    monkeypatch.setattr(codecs, "_shapes", {})
+    assert [comp['data'] for comp in db.get_page_components(page_id)] == [data]
+
+
+def test_packed_shape_written_once_per_database(db):
+    db.set_codec("packed")
+    page_id = db.create_page("Home")
+    with db.transaction():
+        db.add_component(page_id, "hero", {"heading": "A"})
+        db.add_component(page_id, "hero", {"heading": "B"})
+    db.add_component(page_id, "hero", {"heading": "C"})
+    assert len(_shape_rows(db)) == 1
+    assert [comp['data']['heading'] for comp in db.get_page_components(page_id)] == ["A", "B", "C"]
+
+
+def _stamp(db, table, row_id):
+    return db.conn.execute(f"SELECT updated_at FROM {table} WHERE id = ?", (row_id,)).fetchone()[0]
+
+
+def test_updated_at_only_moves_on_real_changes(db):
+    page_id = db.create_page("Home")
+    component_id = db.add_component(page_id, "hero", {"heading": "A"})
+    component = db.get_page_components(page_id)[0]
+    old = "2000-01-01 00:00:00.000"
+    db.conn.execute("UPDATE pages SET updated_at = ?", (old,))
+    db.conn.execute("UPDATE components SET updated_at = ?", (old,))
+    db.conn.commit()
+
+    db.update_page_title(page_id, "Home")
+    db.update_component(component_id, {"heading": "A"}, component['sort_key'])
+    assert _stamp(db, "pages", page_id) == old
+    assert _stamp(db, "components", component_id) == old
+
+    db.update_component(component_id, {"heading": "B"})
+    assert _stamp(db, "components", component_id) > old
+    assert _stamp(db, "pages", page_id) > old
+
+    db.conn.execute("UPDATE pages SET updated_at = ?", (old,))
+    db.conn.commit()
+    db.update_page_title(page_id, "Start")
+    assert _stamp(db, "pages", page_id) > old
+
+
+def test_close_keeps_connection_for_other_handlers(db):
+    other = DBHandler(db.db_path)
+    page_id = other.create_page("Home")
+
+    with db.transaction():
+        db.create_page("About")
+        other.close()
+        db.create_page("Contact")
+    assert db.get_page(page_id)["title"] == "Home"
+    assert db.conn.execute("SELECT COUNT(*) FROM pages").fetchone()[0] == 3
+
+    db.close()
+    # A closed handler reopens the connection on next use
+    assert other.get_page(page_id)["title"] == "Home"
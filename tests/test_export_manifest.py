@@ -0,0 +1,95 @@
+import json
+import os
+
+import pytest
+
+from controllers.batch_exporter import BatchExporter
+from controllers.export_manifest import MANIFEST_NAME, ExportManifest, page_hash, settings_hash
+
+COMPONENTS = [
+    {'type': 'info_section', 'data': {'heading': 'A'}},
+    {'type': 'facts_table', 'data': {'rows': [1, 2]}},
+]
+VERSIONS = {'info_section': 'v1', 'facts_table': 'v1'}
+OPTIONS = {'minify_css': False}
+
+
+def test_page_hash_tracks_rendered_inputs():
+    base = page_hash(COMPONENTS, VERSIONS, OPTIONS)
+    # Ids and sort keys don't affect the output
+    with_ids = [dict(comp, id=n, sort_key=n * 1024.0) for n, comp in enumerate(COMPONENTS)]
+    assert page_hash(with_ids, VERSIONS, OPTIONS) == base
+
+    changed_data = [COMPONENTS[0], {'type': 'facts_table', 'data': {'rows': [1, 3]}}]
+    assert page_hash(changed_data, VERSIONS, OPTIONS) != base
+    assert page_hash(COMPONENTS[::-1], VERSIONS, OPTIONS) != base
+    assert page_hash(COMPONENTS, dict(VERSIONS, facts_table='v2'), OPTIONS) != base
+    assert page_hash(COMPONENTS, dict(VERSIONS, cards_section='v2'), OPTIONS) == base
+    assert page_hash(COMPONENTS, VERSIONS, {'minify_css': True}) != base
+
+
+def test_settings_hash_tracks_every_asset():
+    base = settings_hash(VERSIONS, OPTIONS)
+    assert settings_hash(dict(VERSIONS), dict(OPTIONS)) == base
+    assert settings_hash(dict(VERSIONS, cards_section='v2'), OPTIONS) != base
+    assert settings_hash(VERSIONS, {'minify_css': True}) != base
+
+
+def test_save_and_load(tmp_path):
+    entry = {'file': 'page_1.txt', 'hash': 'h', 'settings': 's', 'updated_at': 't', 'exported_at': 'u'}
+    ExportManifest({1: entry}).save(str(tmp_path))
+    assert ExportManifest.load(str(tmp_path)).pages == {1: entry}
+    assert os.listdir(tmp_path) == [MANIFEST_NAME]
+
+
+@pytest.mark.parametrize("content", [None, "{not json", json.dumps({"version": 999, "pages": {"1": {}}}), "[]"])
+def test_unusable_manifest_loads_empty(tmp_path, content):
+    if content is not None:
+        (tmp_path / MANIFEST_NAME).write_text(content)
+    assert ExportManifest.load(str(tmp_path)).pages == {}
+
+
+def test_unchanged_since():
+    entry = {'settings': 's', 'updated_at': '2026-01-01 10:00:00.000', 'exported_at': '2026-01-01 10:00:05.000'}
+    unchanged = ExportManifest.unchanged_since
+    assert unchanged(entry, '2026-01-01 10:00:00.000', 's')
+    assert not unchanged(entry, '2026-01-01 10:00:01.000', 's')
+    assert not unchanged(entry, '2026-01-01 10:00:00.000', 'other settings')
+    assert not unchanged(entry, None, 's')
+    # Stamped in the same millisecond the export started: can't tell
+    assert not unchanged(dict(entry, exported_at=entry['updated_at']), entry['updated_at'], 's')
+
+
+def _export(db, out_dir, **options):
+    return BatchExporter(db, workers=1, persist_render_cache=False).export(str(out_dir), incremental=True, **options)
+
+
+def test_incremental_export(db, tmp_path):
+    out_dir = tmp_path / "out"
+    pages = [db.create_page(f"Page {n}") for n in range(3)]
+    components = [db.add_component(page_id, 'info_section', {'heading': str(page_id)}) for page_id in pages]
+
+    assert _export(db, out_dir)['exported'] == 3
+    result = _export(db, out_dir)
+    assert (result['exported'], result['skipped']) == (0, 3)
+
+    # Edited: re-rendered. Saved with the same data: skipped on its hash
+    db.update_component(components[0], {'heading': 'edited'})
+    db.update_component(components[1], {'heading': str(pages[1])})
+    result = _export(db, out_dir)
+    assert (result['exported'], result['skipped']) == (1, 2)
+    with open(out_dir / f"page_{pages[0]}.txt", encoding="utf-8") as f:
+        assert 'edited' in f.read()
+
+    # A missing output file is written again
+    os.remove(out_dir / f"page_{pages[2]}.txt")
+    assert _export(db, out_dir)['exported'] == 1
+
+    # Other render options: every page
+    assert _export(db, out_dir, minify_css=True)['exported'] == 3
+
+    db.delete_page(pages[1])
+    result = _export(db, out_dir, minify_css=True)
+    assert (result['exported'], result['removed']) == (0, 1)
+    assert not (out_dir / f"page_{pages[1]}.txt").exists()
+    assert sorted(ExportManifest.load(str(out_dir)).pages) == [pages[0], pages[2]]
@@ -0,0 +1,83 @@
+from controllers.ordering import assign_sort_keys, renumbered
+from database.db_handler import MIN_SORT_KEY_GAP, SORT_KEY_GAP
+
+
+def _changed(saved, keys):
+    return [i for i, (old, new) in enumerate(zip(saved, keys)) if old != new]
+
+
+def test_unchanged_order_keeps_every_key():
+    saved = renumbered(4)
+    assert assign_sort_keys(saved) == (saved, False)
+
+
+def test_new_page_is_numbered_gap_apart():
+    assert assign_sort_keys([None, None, None]) == ([SORT_KEY_GAP, 2 * SORT_KEY_GAP, 3 * SORT_KEY_GAP], False)
+
+
+def test_insert_between_takes_the_midpoint():
+    keys, rebalanced = assign_sort_keys([1024.0, None, 2048.0])
+    assert keys == [1024.0, 1536.0, 2048.0]
+    assert not rebalanced
+
+
+def test_run_of_inserts_is_spread_evenly():
+    keys, _ = assign_sort_keys([1000.0, None, None, None, 2000.0])
+    assert keys == [1000.0, 1250.0, 1500.0, 1750.0, 2000.0]
+
+
+def test_insert_at_either_end():
+    assert assign_sort_keys([None, 1024.0])[0] == [0.0, 1024.0]
+    assert assign_sort_keys([1024.0, None])[0] == [1024.0, 2048.0]
+
+
+def test_moving_one_component_rewrites_one_key():
+    a, b, c, d = saved = renumbered(4)
+    for order in ([d, a, b, c], [b, c, d, a], [a, c, b, d], [a, d, b, c]):
+        keys, rebalanced = assign_sort_keys(order)
+        assert not rebalanced
+        assert len(_changed(order, keys)) == 1
+        assert keys == sorted(keys) and len(set(keys)) == len(keys)
+    assert saved == renumbered(4)
+
+
+def test_reversed_order_stays_increasing():
+    order = list(reversed(renumbered(5)))
+    keys, _ = assign_sort_keys(order)
+    assert keys == sorted(keys) and len(set(keys)) == len(keys)
+    assert len(_changed(order, keys)) == 4
+
+
+def test_cramped_neighbours_renumber_the_page():
+    low = 1024.0
+    keys, rebalanced = assign_sort_keys([low, None, low + MIN_SORT_KEY_GAP])
+    assert rebalanced
+    assert keys == renumbered(3)
+
+
+def test_repeated_inserts_at_one_spot_eventually_rebalance():
+    keys = renumbered(2)
+    for inserts in range(1, 100):
+        keys, rebalanced = assign_sort_keys([keys[0], None] + keys[1:])
+        if rebalanced:
+            break
+    assert rebalanced
+    assert inserts > 15
+    assert keys == renumbered(inserts + 2)
+
+
+def test_rebalance_sort_keys_only_touches_cramped_pages(db):
+    roomy = db.create_page("Roomy")
+    cramped = db.create_page("Cramped")
+    for sort_key in (1024.0, 2048.0):
+        db.add_component(roomy, "info_section", {}, sort_key=sort_key)
+    for sort_key in (1024.0, 1024.0005, 1024.0007):
+        db.add_component(cramped, "info_section", {}, sort_key=sort_key)
+    ids = [comp['id'] for comp in db.get_page_components(cramped)]
+
+    assert db.rebalance_sort_keys() == (1, 2)
+    assert [comp['sort_key'] for comp in db.get_page_components(roomy)] == [1024.0, 2048.0]
+    components = db.get_page_components(cramped)
+    assert [comp['id'] for comp in components] == ids
+    assert [comp['sort_key'] for comp in components] == renumbered(3)
+    assert db.rebalance_sort_keys() == (0, 0)
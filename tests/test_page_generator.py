@@ -0,0 +1,38 @@
+import os
+
+import pytest
+
+from controllers.page_generator import get_page_generator
+
+COMPONENTS = [
+    {'type': 'info_section', 'data': {'heading': 'One'}},
+    {'type': 'info_section', 'data': {'heading': 'Two'}},
+    {'type': 'facts_table', 'data': {}},
+]
+
+
+def test_streamed_page_matches_generated_page():
+    generator = get_page_generator()
+    assert "".join(generator.iter_page_content(COMPONENTS)) == generator.generate_page_content(COMPONENTS)
+
+
+def test_export_reports_progress_per_component(tmp_path):
+    calls = []
+    path = str(tmp_path / "page.txt")
+    get_page_generator().export_page_to_file(COMPONENTS, path, progress=lambda done, total: calls.append((done, total)))
+    assert calls == [(0, 3), (1, 3), (2, 3), (3, 3)]
+    with open(path, encoding="utf-8") as f:
+        assert "Two" in f.read()
+
+
+def test_export_stopped_by_progress_leaves_no_file(tmp_path):
+    class Stop(Exception):
+        pass
+
+    def progress(done, total):
+        if done == 2:
+            raise Stop()
+
+    with pytest.raises(Stop):
+        get_page_generator().export_page_to_file(COMPONENTS, str(tmp_path / "page.txt"), progress=progress)
+    assert os.listdir(tmp_path) == []
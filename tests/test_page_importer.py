@@ -0,0 +1,128 @@
+import io
+import json
+
+import pytest
+
+from controllers import page_importer
+from controllers.page_importer import CheckpointMismatch, JsonValueStream, PageImporter
+
+
+def _page(number, **extra):
+    return dict({
+        "title": f"Page {number} – é",
+        "components": [{"type": "info_section", "data": {"heading": f"Heading {number}"}}],
+    }, **extra)
+
+
+def _write(path, text):
+    path.write_text(text, encoding="utf-8")
+    return str(path)
+
+
+def _titles(db):
+    return [row['title'] for row in db.conn.execute("SELECT title FROM pages ORDER BY id")]
+
+
+@pytest.fixture
+def small_reads(monkeypatch):
+    # Values span several reads, multi-byte characters included
+    monkeypatch.setattr(page_importer, "_READ_SIZE", 7)
+
+
+@pytest.mark.parametrize("text", [
+    '[{"a": 1}, {"b": "é"} ,\n {"c": [1, 2]}]',
+    '{"a": 1}\n{"b": "é"}\n\n{"c": [1, 2]}\n',
+    '﻿{"a": 1} {"b": "é"}{"c": [1, 2]}',
+])
+def test_stream_values(text, small_reads):
+    stream = JsonValueStream(io.BytesIO(text.encode("utf-8")))
+    assert list(stream) == [{"a": 1}, {"b": "é"}, {"c": [1, 2]}]
+    assert stream.offset == len(text.encode("utf-8"))
+
+
+def test_stream_offset_resumes_after_a_value(small_reads):
+    raw = '[{"a": 1}, {"b": "é"}, {"c": 3}]'.encode("utf-8")
+    stream = JsonValueStream(io.BytesIO(raw))
+    values = iter(stream)
+    next(values)
+    assert next(values) == {"b": "é"}
+    rest = JsonValueStream(io.BytesIO(raw[stream.offset:]), stream.offset, stream.in_array)
+    assert list(rest) == [{"c": 3}]
+
+
+@pytest.mark.parametrize("text, error", [
+    ('[{"a": 1}, {"b": 2}', "not closed"),
+    ('{"a": 1}\n{"b": }\n', "Invalid JSON after byte 9"),
+])
+def test_stream_errors(text, error):
+    with pytest.raises(ValueError, match=error):
+        list(JsonValueStream(io.BytesIO(text.encode("utf-8"))))
+
+
+def test_import_json_array(db, tmp_path, small_reads):
+    path = _write(tmp_path / "pages.json", json.dumps([_page(n) for n in range(1, 4)], indent=2))
+    result = PageImporter(db, chunk_size=2).import_file(path)
+    assert (result['pages'], result['components'], result['skipped']) == (3, 3, 0)
+    assert _titles(db) == [f"Page {n} – é" for n in range(1, 4)]
+    page_id = db.conn.execute("SELECT MIN(id) FROM pages").fetchone()[0]
+    assert db.get_page_components(page_id)[0]['data'] == {"heading": "Heading 1"}
+
+
+def test_import_ndjson_skips_invalid_pages(db, tmp_path):
+    lines = [_page(1), {"title": 5}, _page(3, components=[{"type": "nope"}]), _page(4)]
+    path = _write(tmp_path / "pages.ndjson", "".join(json.dumps(page) + "\n" for page in lines))
+    result = PageImporter(db).import_file(path)
+    assert (result['pages_read'], result['pages'], result['skipped']) == (4, 2, 2)
+    assert [number for number, _ in result['errors']] == [2, 3]
+    assert _titles(db) == ["Page 1 – é", "Page 4 – é"]
+
+
+def test_strict_import_stops_at_invalid_page(db, tmp_path):
+    path = _write(tmp_path / "pages.ndjson", json.dumps(_page(1)) + "\n" + json.dumps({"components": 1}))
+    with pytest.raises(ValueError, match="Page 2"):
+        PageImporter(db, strict=True).import_file(path)
+
+
+def _cancel_after_first_chunk(db, path):
+    importer = PageImporter(db, chunk_size=2)
+    result = importer.import_file(path, is_cancelled=lambda: True)
+    assert result['cancelled'] and result['pages'] == 2
+    assert importer.checkpoint(path)['pages_read'] == 2
+    return importer
+
+
+def test_resume_from_checkpoint(db, tmp_path, small_reads):
+    path = _write(tmp_path / "pages.json", json.dumps([_page(n) for n in range(1, 6)]))
+    importer = _cancel_after_first_chunk(db, path)
+
+    result = importer.import_file(path)
+    assert result['resumed_from'] == 2
+    assert (result['pages'], result['cancelled']) == (5, False)
+    assert _titles(db) == [f"Page {n} – é" for n in range(1, 6)]
+    assert importer.checkpoint(path) is None
+
+
+def test_resume_picks_up_appended_pages(db, tmp_path):
+    path = tmp_path / "pages.ndjson"
+    _write(path, "".join(json.dumps(_page(n)) + "\n" for n in range(1, 4)))
+    importer = _cancel_after_first_chunk(db, str(path))
+    with open(path, "a", encoding="utf-8") as f:
+        f.write(json.dumps(_page(4)) + "\n")
+    assert importer.import_file(str(path))['pages'] == 4
+    assert _titles(db) == [f"Page {n} – é" for n in range(1, 5)]
+
+
+def test_changed_file_needs_restart(db, tmp_path):
+    path = tmp_path / "pages.ndjson"
+    _write(path, "".join(json.dumps(_page(n)) + "\n" for n in range(1, 4)))
+    importer = _cancel_after_first_chunk(db, str(path))
+    _write(path, "".join(json.dumps(_page(n * 10)) + "\n" for n in range(1, 4)))
+
+    with pytest.raises(CheckpointMismatch) as e:
+        importer.import_file(str(path))
+    assert e.value.checkpoint['pages_read'] == 2
+
+    result = importer.import_file(str(path), restart=True)
+    assert (result['resumed_from'], result['pages']) == (0, 3)
+    assert importer.checkpoint(str(path)) is None
+    assert _titles(db)[2:] == ["Page 10 – é", "Page 20 – é", "Page 30 – é"]
@@ -0,0 +1,125 @@
+import os
+import shutil
+
+import pytest
+
+from controllers import page_generator
+from controllers.render_cache import RenderCache
+
+
+def _key(name):
+    return "info_section", 1.0, name
+
+
+def test_hit_and_miss():
+    cache = RenderCache()
+    assert cache.get(_key("a")) is None
+    cache.put(_key("a"), "<p>a</p>")
+    assert cache.get(_key("a")) == "<p>a</p>"
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["entries"]) == (1, 1, 1)
+
+
+def test_evicts_least_recently_used_by_bytes():
+    cache = RenderCache(max_bytes=10)
+    cache.put(_key("a"), "aaaa")
+    cache.put(_key("b"), "bbbb")
+    cache.get(_key("a"))
+    cache.put(_key("c"), "cccc")
+    assert cache.get(_key("b")) is None
+    assert cache.get(_key("a")) == "aaaa"
+    assert cache.get(_key("c")) == "cccc"
+    stats = cache.stats()
+    assert (stats["bytes"], stats["evictions"]) == (8, 1)
+
+
+def test_sizes_are_utf8_bytes():
+    cache = RenderCache(max_bytes=6)
+    cache.put(_key("a"), "ééé")
+    cache.put(_key("b"), "b")
+    assert cache.get(_key("a")) is None
+    assert cache.stats()["bytes"] == 1
+
+
+def test_replacing_an_entry_updates_its_size():
+    cache = RenderCache(max_bytes=10)
+    cache.put(_key("a"), "aaaaaaaa")
+    cache.put(_key("a"), "aa")
+    cache.put(_key("b"), "bbbbbbbb")
+    assert cache.get(_key("a")) == "aa"
+    assert cache.stats()["evictions"] == 0
+
+
+def test_entry_larger_than_budget_is_not_kept():
+    cache = RenderCache(max_bytes=4)
+    cache.put(_key("a"), "aaa")
+    cache.put(_key("big"), "x" * 5)
+    assert cache.get(_key("big")) is None
+    assert cache.get(_key("a")) == "aaa"
+
+
+def test_clear():
+    cache = RenderCache()
+    cache.put(_key("a"), "a")
+    cache.clear()
+    assert cache.get(_key("a")) is None
+    assert cache.stats()["bytes"] == 0
+
+
+def test_persisted_entries_survive_a_new_cache(db):
+    cache = RenderCache()
+    cache.attach(db)
+    cache.put(_key("a"), "<p>a</p>")
+    cache.flush()
+
+    fresh = RenderCache()
+    fresh.attach(db)
+    assert fresh.get(_key("a")) == "<p>a</p>"
+    assert fresh.stats()["store_hits"] == 1
+    # Now in memory as well
+    assert fresh.get(_key("a")) == "<p>a</p>"
+    assert fresh.stats()["store_hits"] == 1
+
+
+def test_detached_cache_does_not_persist(db):
+    cache = RenderCache()
+    cache.attach(db)
+    cache.detach()
+    cache.put(_key("a"), "a")
+    cache.flush()
+    fresh = RenderCache()
+    fresh.attach(db)
+    assert fresh.get(_key("a")) is None
+
+
+@pytest.fixture
+def generator(tmp_path, monkeypatch):
+    # A generator over a private copy of the templates, so they can be edited
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    for name in ("components_html", "components_css"):
+        shutil.copytree(os.path.join(root, "templates", name), tmp_path / "templates" / name)
+    monkeypatch.setattr(page_generator, "_base_path", lambda: str(tmp_path))
+    return page_generator.PageGenerator()
+
+
+def test_edited_template_invalidates_renders(generator):
+    data = {"heading": "Hello", "text": "World"}
+    first = generator.render_component("info_section", data)
+    key = generator.render_key("info_section", data)
+    assert generator.render_component("info_section", data) == first
+    assert generator.render_cache.stats()["hits"] == 1
+
+    path = os.path.join(generator.html_dir, "info_section.html")
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("<h2>{{ heading }} (edited)</h2>")
+    mtime = os.stat(path).st_mtime + 10
+    os.utime(path, (mtime, mtime))
+    assert generator.render_key("info_section", data) != key
+    assert generator.render_component("info_section", data) == "<h2>Hello (edited)</h2>"
+
+
+def test_render_without_store(generator):
+    html = generator.render_component("info_section", {"heading": "Draft"}, store=False)
+    assert generator.render_cache.stats()["entries"] == 0
+    assert generator.render_component("info_section", {"heading": "Draft"}) == html
+    assert generator.render_cache.stats()["entries"] == 1
@@ -0,0 +1,115 @@
+import pytest
+
+
+def _hits(db, text):
+    return {page['id']: page for page in db.search(text)}
+
+
+def test_title_hit(db):
+    home = db.create_page("Home page")
+    db.create_page("About us")
+    hits = _hits(db, "hom pag")
+    assert list(hits) == [home]
+    assert hits[home]['title'] == "Home page"
+    assert hits[home]['title_match'] and hits[home]['components'] == []
+
+
+@pytest.mark.parametrize("codec", ["json", "zlib", "packed"])
+def test_component_hit_with_snippet(db, codec):
+    db.set_codec(codec)
+    page_id = db.create_page("Admissions")
+    db.add_component(page_id, "info_section", {"heading": "Visit", "text": "Campus tours every Friday"})
+    comp_id = db.add_component(page_id, "cards_section", {"cards": [{"title": "Scholarships available"}]})
+
+    hits = _hits(db, "scholar")
+    assert list(hits) == [page_id]
+    page = hits[page_id]
+    assert page['title'] == "Admissions" and not page['title_match']
+    [component] = page['components']
+    assert (component['id'], component['type']) == (comp_id, "cards_section")
+    assert "Scholarships available" in component['snippet']
+
+
+def test_index_follows_updates_and_deletes(db):
+    page_id = db.create_page("Events")
+    comp_id = db.add_component(page_id, "info_section", {"heading": "Spring concert"})
+    assert list(_hits(db, "concert")) == [page_id]
+
+    db.update_component(comp_id, {"heading": "Autumn lecture"})
+    assert _hits(db, "concert") == {}
+    assert list(_hits(db, "lecture")) == [page_id]
+
+    db.delete_component(comp_id)
+    assert _hits(db, "lecture") == {}
+
+
+def test_index_follows_reencoding(db):
+    page_id = db.create_page("Research")
+    db.add_component(page_id, "info_section", {"heading": "Marine biology"})
+    db.set_codec("packed")
+    assert list(_hits(db, "marine")) == [page_id]
+
+
+def test_every_word_must_match(db):
+    page_id = db.create_page("Alumni")
+    db.add_component(page_id, "info_section", {"heading": "Reunion weekend"})
+    assert list(_hits(db, "alumni reunion")) == []
+    assert list(_hits(db, "reunion week")) == [page_id]
+
+
+@pytest.mark.parametrize("text", ['"', '""', "'", "*", "(", "NEAR(", "-", "OR", "AND NOT", "%", "_", "\\", "   "])
+def test_special_characters(db, text):
+    page_id = db.create_page("Home")
+    db.add_component(page_id, "info_section", {"heading": 'Say "hello" to AT&T'})
+    assert db.search(text) == []
+
+
+@pytest.mark.parametrize("text", ['"hello"', "AT&T", "hello\"", "at&t"])
+def test_quotes_and_punctuation_in_terms(db, text):
+    page_id = db.create_page("Home")
+    db.add_component(page_id, "info_section", {"heading": 'Say "hello" to AT&T'})
+    assert list(_hits(db, text)) == [page_id]
+
+
+@pytest.fixture
+def no_fts(db, monkeypatch):
+    # As on an SQLite build without FTS5
+    has_table = db.has_table
+    monkeypatch.setattr(db, "has_table", lambda name: not name.endswith("_fts") and has_table(name))
+    return db
+
+
+@pytest.mark.parametrize("codec", ["json", "zlib", "lzma", "packed"])
+def test_fallback_searches_decoded_content(no_fts, codec):
+    db = no_fts
+    db.set_codec(codec)
+    page_id = db.create_page("Research")
+    comp_id = db.add_component(page_id, "info_section", {"heading": "Marine Biology", "text": "Coral reefs"})
+    db.add_component(page_id, "info_section", {"heading": "Astronomy"})
+
+    hits = _hits(db, "marine bio")
+    assert list(hits) == [page_id]
+    [component] = hits[page_id]['components']
+    assert component['id'] == comp_id
+    assert "Marine Biology" in component['snippet']
+    assert _hits(db, "marine astronomy") == {}
+    assert list(_hits(db, "resea")) == [page_id]
+
+
+@pytest.mark.parametrize("fts", [True, False])
+def test_results_in_page_list_order(db, request, fts):
+    if not fts:
+        request.getfixturevalue("no_fts")
+    component = [("info_section", {"heading": "Open day"})]
+    # Ids don't follow created_at, as after importing older pages
+    with db.transaction():
+        db.insert_pages([
+            ("Open day 2024", "2024-05-01 10:00:00", []),
+            ("Spring", "2026-03-01 10:00:00", component),
+            ("Open day 2025", "2025-05-01 10:00:00", []),
+            ("Winter", "2023-12-01 10:00:00", component),
+        ])
+    listed = [row['title'] for row in db.get_pages_batch(10)]
+    assert [page['title'] for page in db.search("open day")] == listed
+    assert [page['title'] for page in db.search("open day", limit=2)] == listed[:2]
+    assert [row['title'] for row in db.search_pages("open day")] == ["Open day 2025", "Open day 2024"]
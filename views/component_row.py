@@ -0,0 +1,202 @@
+from PyQt5.QtWidgets import (
+    QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QToolButton, QFrame, QSizePolicy,
+    QApplication
+)
+from PyQt5.QtCore import Qt, QMimeData, QPoint, pyqtSignal
+from PyQt5.QtGui import QDrag
+from controllers import instrumentation
+
+# Drag payload of a component row; the drop target finds the row via QDropEvent.source()
+ROW_MIME_TYPE = "application/x-components-generator-row"
+
+
+def _summarize(data, limit=80) -> str:
+    """First non-empty text value in the component data, for the collapsed row."""
+    stack = [data]
+    while stack:
+        value = stack.pop(0)
+        if isinstance(value, dict):
+            stack[0:0] = list(value.values())
+        elif isinstance(value, list):
+            stack[0:0] = value
+        elif isinstance(value, str) and value.strip():
+            text = " ".join(value.split())
+            return text if len(text) <= limit else text[:limit - 1] + "…"
+    return "(empty)"
+
+
+class _DragHandle(QLabel):
+    """Grip at the start of a row's header; dragging it starts a row drag."""
+
+    def __init__(self, on_drag, parent=None):
+        super().__init__("⠿", parent)
+        self._on_drag = on_drag
+        self._press_pos = None
+        self.setCursor(Qt.OpenHandCursor)
+        self.setToolTip("Drag to reorder")
+        self.setStyleSheet("color: #888; font-size: 16px; padding: 0 4px;")
+
+    def mousePressEvent(self, event):
+        if event.button() == Qt.LeftButton:
+            self._press_pos = event.pos()
+        super().mousePressEvent(event)
+
+    def mouseMoveEvent(self, event):
+        if (
+            self._press_pos is not None
+            and event.buttons() & Qt.LeftButton
+            and (event.pos() - self._press_pos).manhattanLength() >= QApplication.startDragDistance()
+        ):
+            self._press_pos = None
+            self._on_drag()
+            return
+        super().mouseMoveEvent(event)
+
+    def mouseReleaseEvent(self, event):
+        self._press_pos = None
+        super().mouseReleaseEvent(event)
+
+
+class ComponentRow(QWidget):
+    """
+    One component in the page editor. Collapsed, it's a lightweight header
+    (title + summary) holding the component data; the full form is only built
+    when the row is expanded and is handed back (to form_releaser, or destroyed)
+    when it's collapsed.
+    """
+    delete_requested = pyqtSignal()
+    changed = pyqtSignal()  # a field in the (expanded) form was edited
+
+    def __init__(self, component_type, title, data, form_factory, form_releaser=None, parent=None):
+        super().__init__(parent)
+        self.component_type = component_type
+        self._data = data or {}
+        self._form_factory = form_factory    # (component_type, data) -> form widget
+        self._form_releaser = form_releaser  # (form) -> None; default destroys it
+        self.form = None
+        # Bumped on every edit; lets the preview skip rows that didn't change
+        self.revision = 0
+
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(8, 8, 8, 8)
+        layout.setSpacing(8)
+
+        # Header with drag handle + expand toggle + title + summary + delete
+        header = QWidget()
+        header_layout = QHBoxLayout(header)
+        header_layout.setContentsMargins(0, 0, 0, 0)
+        self.header = header
+
+        header_layout.addWidget(_DragHandle(self.start_drag))
+
+        self.toggle_btn = QToolButton()
+        self.toggle_btn.setArrowType(Qt.RightArrow)
+        self.toggle_btn.setAutoRaise(True)
+        self.toggle_btn.setToolTip("Show / hide the component editor")
+        self.toggle_btn.clicked.connect(self.toggle)
+        header_layout.addWidget(self.toggle_btn)
+
+        title_label = QLabel(title)
+        title_label.setStyleSheet("font-weight: 600;")
+        header_layout.addWidget(title_label)
+
+        self.summary_label = QLabel()
+        self.summary_label.setStyleSheet("color: #666;")
+        self.summary_label.setSizePolicy(QSizePolicy.Ignored, QSizePolicy.Preferred)
+        header_layout.addWidget(self.summary_label, 1)
+
+        del_btn = QPushButton("🗑️ Delete Component")
+        del_btn.setToolTip("Remove this component from the page")
+        del_btn.setStyleSheet("QPushButton{padding:4px 8px;} QPushButton:hover{opacity:0.95;}")
+        del_btn.clicked.connect(self.delete_requested.emit)
+        header_layout.addWidget(del_btn)
+
+        layout.addWidget(header)
+
+        self.form_container = QVBoxLayout()
+        self.form_container.setContentsMargins(0, 0, 0, 0)
+        layout.addLayout(self.form_container)
+
+        sep = QFrame()
+        sep.setFrameShape(QFrame.HLine)
+        sep.setFrameShadow(QFrame.Sunken)
+        layout.addWidget(sep)
+
+        self._refresh_summary()
+
+    # ---------- state ----------
+
+    def is_expanded(self) -> bool:
+        return self.form is not None
+
+    def get_data(self):
+        """Current data: from the live form when expanded, else the held copy."""
+        if self.form is not None:
+            with instrumentation.span("form", f"get_data {self.component_type}"):
+                return self.form.get_data()
+        return self._data
+
+    def _refresh_summary(self):
+        self.summary_label.setText(_summarize(self._data))
+        self.summary_label.setVisible(self.form is None)
+
+    # ---------- expand / collapse ----------
+
+    def expand(self):
+        if self.form is not None:
+            return
+        self.form = self._form_factory(self.component_type, self._data)
+        if self.form is None:
+            return
+        self.form_container.addWidget(self.form)
+        self.form.changed.connect(self._on_form_changed)
+        self.form.show()
+        self.toggle_btn.setArrowType(Qt.DownArrow)
+        self._refresh_summary()
+
+    def _on_form_changed(self):
+        self.revision += 1
+        self.changed.emit()
+
+    def _drop_form(self):
+        # Pooled forms are reused by other rows: stop listening first
+        self.form.changed.disconnect(self._on_form_changed)
+        self.form_container.removeWidget(self.form)
+        if self._form_releaser is not None:
+            self._form_releaser(self.form)
+        else:
+            self.form.setParent(None)
+            self.form.deleteLater()
+        self.form = None
+
+    def collapse(self):
+        if self.form is None:
+            return
+        # Keep the edits, drop the widgets
+        self._data = self.get_data()
+        self._drop_form()
+        self.toggle_btn.setArrowType(Qt.RightArrow)
+        self._refresh_summary()
+
+    def release(self):
+        """Give the form back without reading it; used when the row is being discarded."""
+        if self.form is not None:
+            self._drop_form()
+
+    def toggle(self):
+        if self.form is None:
+            self.expand()
+        else:
+            self.collapse()
+
+    # ---------- drag and drop ----------
+
+    def start_drag(self):
+        """Drag this row; the components list it's dropped on does the move."""
+        drag = QDrag(self)
+        mime = QMimeData()
+        mime.setData(ROW_MIME_TYPE, b"")
+        drag.setMimeData(mime)
+        drag.setPixmap(self.header.grab())
+        drag.setHotSpot(QPoint(8, self.header.height() // 2))
+        drag.exec_(Qt.MoveAction)
@@ -2,9 +2,11 @@ from PyQt5.QtWidgets import (
     QWidget, QVBoxLayout, QLineEdit, QLabel, QTextEdit, QGroupBox, QFormLayout
 )
 from PyQt5.QtGui import QFont
+from PyQt5.QtCore import pyqtSignal
 
 class CardGrid4Form(QWidget):
     component_type = 'card_grid_4'
+    changed = pyqtSignal()
 
     def __init__(self, data=None):
         super().__init__()
@@ -48,16 +50,23 @@ class CardGrid4Form(QWidget):
 
         self.setLayout(layout)
 
-        if data:
-            cards_data = data.get("cards", [])
-            for i in range(min(4, len(cards_data))):
-                card = cards_data[i]
-                self.cards[i]["image_src"].setText(card.get("image_src", ""))
-                self.cards[i]["image_alt"].setText(card.get("image_alt", ""))
-                self.cards[i]["title"].setText(card.get("title", ""))
-                self.cards[i]["description"].setText(card.get("description", ""))
-                self.cards[i]["button_text"].setText(card.get("button_text", ""))
-                self.cards[i]["button_link"].setText(card.get("button_link", ""))
+        # Notify listeners (e.g. the live preview) whenever any field is edited
+        for field in self.findChildren((QLineEdit, QTextEdit)):
+            field.textChanged.connect(self.changed)
+
+        self.set_data(data)
+
+    def set_data(self, data=None):
+        """Reset every field, then populate from data (lets the form be reused)."""
+        cards_data = data.get("cards", []) if data else []
+        for i in range(4):
+            card = cards_data[i] if i < len(cards_data) else {}
+            self.cards[i]["image_src"].setText(card.get("image_src", ""))
+            self.cards[i]["image_alt"].setText(card.get("image_alt", ""))
+            self.cards[i]["title"].setText(card.get("title", ""))
+            self.cards[i]["description"].setText(card.get("description", ""))
+            self.cards[i]["button_text"].setText(card.get("button_text", ""))
+            self.cards[i]["button_link"].setText(card.get("button_link", ""))
 
     def get_data(self):
         cards_output = []
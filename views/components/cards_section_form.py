@@ -2,9 +2,11 @@ from PyQt5.QtWidgets import (
     QWidget, QVBoxLayout, QLabel, QLineEdit, QCheckBox, QGroupBox, QFormLayout
 )
 from PyQt5.QtGui import QFont
+from PyQt5.QtCore import pyqtSignal
 
 class CardsSectionForm(QWidget):
     component_type = 'cards_section'
+    changed = pyqtSignal()
 
     def __init__(self, data=None):
         super().__init__()
@@ -49,17 +51,26 @@ class CardsSectionForm(QWidget):
 
         self.setLayout(layout)
 
+        # Notify listeners (e.g. the live preview) whenever any field is edited
+        for field in self.findChildren(QLineEdit):
+            field.textChanged.connect(self.changed)
+        for field in self.findChildren(QCheckBox):
+            field.toggled.connect(self.changed)
+
         # Load existing data if available
-        if data:
-            cards_data = data.get("cards", [])
-            for i in range(min(3, len(cards_data))):
-                card = cards_data[i]
-                self.cards[i]['image_src'].setText(card.get("image_src", ""))
-                self.cards[i]['image_alt'].setText(card.get("image_alt", ""))
-                self.cards[i]['title'].setText(card.get("title", ""))
-                self.cards[i]['button_text'].setText(card.get("button_text", ""))
-                self.cards[i]['button_link'].setText(card.get("button_link", ""))
-                self.cards[i]['bordered'].setChecked(card.get("bordered", False))
+        self.set_data(data)
+
+    def set_data(self, data=None):
+        """Reset every field, then populate from data (lets the form be reused)."""
+        cards_data = data.get("cards", []) if data else []
+        for i in range(3):
+            card = cards_data[i] if i < len(cards_data) else {}
+            self.cards[i]['image_src'].setText(card.get("image_src", ""))
+            self.cards[i]['image_alt'].setText(card.get("image_alt", ""))
+            self.cards[i]['title'].setText(card.get("title", ""))
+            self.cards[i]['button_text'].setText(card.get("button_text", ""))
+            self.cards[i]['button_link'].setText(card.get("button_link", ""))
+            self.cards[i]['bordered'].setChecked(card.get("bordered", False))
 
     def get_data(self):
         result = []
@@ -1,8 +1,10 @@
 from PyQt5.QtWidgets import QWidget, QVBoxLayout, QLabel, QLineEdit, QTextEdit
 from PyQt5.QtGui import QFont
+from PyQt5.QtCore import pyqtSignal
 
 class FactsTableForm(QWidget):
     component_type = 'facts_table'
+    changed = pyqtSignal()
 
     def __init__(self, data=None):
         super().__init__()
@@ -29,14 +31,22 @@ class FactsTableForm(QWidget):
             self.fact_descriptions.append(description)
 
         # If editing existing data, populate fields
-        if data:
-            facts = data.get('facts', [])
-            for i in range(min(3, len(facts))):
-                self.fact_numbers[i].setText(facts[i]['number'])
-                self.fact_descriptions[i].setText(facts[i]['description'])
+        self.set_data(data)
 
         self.setLayout(layout)
 
+        # Notify listeners (e.g. the live preview) whenever any field is edited
+        for field in self.findChildren((QLineEdit, QTextEdit)):
+            field.textChanged.connect(self.changed)
+
+    def set_data(self, data=None):
+        """Reset every field, then populate from data (lets the form be reused)."""
+        facts = data.get('facts', []) if data else []
+        for i in range(3):
+            fact = facts[i] if i < len(facts) else {}
+            self.fact_numbers[i].setText(fact.get('number', ''))
+            self.fact_descriptions[i].setText(fact.get('description', ''))
+
     def get_data(self):
         facts = []
         for i in range(3):
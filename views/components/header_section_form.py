@@ -1,8 +1,10 @@
 from PyQt5.QtWidgets import QWidget, QVBoxLayout, QLabel, QLineEdit, QTextEdit
 from PyQt5.QtGui import QFont
+from PyQt5.QtCore import pyqtSignal
 
 class HeaderSectionForm(QWidget):
     component_type = 'header_section'
+    changed = pyqtSignal()
 
     def __init__(self, data=None):
         super().__init__()
@@ -40,20 +42,28 @@ class HeaderSectionForm(QWidget):
         layout.addWidget(QLabel("Button Link:"))
         layout.addWidget(self.button_link)
 
-        if data:
-            self.heading.setText(data.get('heading', ''))
-            self.paragraphs.setText('\n'.join(data.get('paragraphs', [])))
-            self.image_src.setText(data.get('image_src', ''))
-            self.image_alt.setText(data.get('image_alt', ''))
-            self.image_caption.setText(data.get('image_caption', ''))
-
-            buttons = data.get('buttons', [])
-            if buttons:
-                self.button_text.setText(buttons[0]['text'])
-                self.button_link.setText(buttons[0]['link'])
+        self.set_data(data)
 
         self.setLayout(layout)
 
+        # Notify listeners (e.g. the live preview) whenever any field is edited
+        for field in self.findChildren((QLineEdit, QTextEdit)):
+            field.textChanged.connect(self.changed)
+
+    def set_data(self, data=None):
+        """Reset every field, then populate from data (lets the form be reused)."""
+        data = data or {}
+        self.heading.setText(data.get('heading', ''))
+        self.paragraphs.setText('\n'.join(data.get('paragraphs', [])))
+        self.image_src.setText(data.get('image_src', ''))
+        self.image_alt.setText(data.get('image_alt', ''))
+        self.image_caption.setText(data.get('image_caption', ''))
+
+        buttons = data.get('buttons', [])
+        button = buttons[0] if buttons else {}
+        self.button_text.setText(button.get('text', ''))
+        self.button_link.setText(button.get('link', ''))
+
     def get_data(self):
         return {
             "heading": self.heading.text(),
@@ -1,8 +1,10 @@
 from PyQt5.QtWidgets import QWidget, QVBoxLayout, QLabel, QLineEdit, QTextEdit
 from PyQt5.QtGui import QFont
+from PyQt5.QtCore import pyqtSignal
 
 class InfoSectionForm(QWidget):
     component_type = 'info_section'
+    changed = pyqtSignal()
 
     def __init__(self, data=None):
         super().__init__()
@@ -36,16 +38,24 @@ class InfoSectionForm(QWidget):
         layout.addWidget(QLabel("Image Alt Text:"))
         layout.addWidget(self.image_alt)
 
-        if data:
-            self.heading.setText(data.get('heading', ''))
-            self.paragraphs.setText('\n'.join(data.get('paragraphs', [])))
-            self.button_text.setText(data.get('button_text', ''))
-            self.button_link.setText(data.get('button_link', ''))
-            self.image_src.setText(data.get('image_src', ''))
-            self.image_alt.setText(data.get('image_alt', ''))
+        self.set_data(data)
 
         self.setLayout(layout)
 
+        # Notify listeners (e.g. the live preview) whenever any field is edited
+        for field in self.findChildren((QLineEdit, QTextEdit)):
+            field.textChanged.connect(self.changed)
+
+    def set_data(self, data=None):
+        """Reset every field, then populate from data (lets the form be reused)."""
+        data = data or {}
+        self.heading.setText(data.get('heading', ''))
+        self.paragraphs.setText('\n'.join(data.get('paragraphs', [])))
+        self.button_text.setText(data.get('button_text', ''))
+        self.button_link.setText(data.get('button_link', ''))
+        self.image_src.setText(data.get('image_src', ''))
+        self.image_alt.setText(data.get('image_alt', ''))
+
     def get_data(self):
         return {
             "heading": self.heading.text(),
@@ -0,0 +1,213 @@
+import sys
+
+from PyQt5.QtWidgets import (
+    QDialog, QVBoxLayout, QHBoxLayout, QCheckBox, QLabel, QPushButton, QTableWidget,
+    QTableWidgetItem, QPlainTextEdit, QFileDialog, QMessageBox, QAbstractItemView, QHeaderView
+)
+from PyQt5.QtCore import Qt, QTimer
+from PyQt5.QtGui import QFont
+
+from controllers import instrumentation
+
+# (header, summary key, decimals or None for integers)
+_COLUMNS = [
+    ("Category", "category", None),
+    ("Operation", "name", None),
+    ("Count", "count", 0),
+    ("Total ms", "total_ms", 1),
+    ("Mean ms", "mean_ms", 3),
+    ("p50 ms", "p50_ms", 3),
+    ("p95 ms", "p95_ms", 3),
+    ("p99 ms", "p99_ms", 3),
+    ("Max ms", "max_ms", 3),
+    ("Rows", "rows", 0),
+]
+
+REFRESH_MS = 1000
+
+
+class _NumberItem(QTableWidgetItem):
+    """Sorts by value rather than by its text."""
+
+    def __init__(self, value, decimals):
+        super().__init__(f"{value:,.{decimals}f}")
+        self.value = value
+        self.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
+
+    def __lt__(self, other):
+        if isinstance(other, _NumberItem):
+            return self.value < other.value
+        return super().__lt__(other)
+
+
+class DiagnosticsDialog(QDialog):
+    """
+    Timing histograms from controllers/instrumentation.py: per-operation
+    counts and latency percentiles for queries, renders and form work, with
+    the bucket distribution of the selected operation, and JSON / Chrome trace
+    export. Non-modal, so it can stay open while reproducing a slow save.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Diagnostics")
+        self.resize(1000, 600)
+        self._summaries = []
+
+        layout = QVBoxLayout(self)
+
+        top = QHBoxLayout()
+        self.enabled_check = QCheckBox("Record timings")
+        self.enabled_check.setChecked(instrumentation.enabled)
+        self.enabled_check.toggled.connect(self.set_recording)
+        top.addWidget(self.enabled_check)
+        self.status_label = QLabel()
+        self.status_label.setStyleSheet("color: #666;")
+        top.addWidget(self.status_label, 1)
+        layout.addLayout(top)
+
+        self.table = QTableWidget(0, len(_COLUMNS))
+        self.table.setHorizontalHeaderLabels([header for header, _, _ in _COLUMNS])
+        self.table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.table.setSelectionMode(QAbstractItemView.SingleSelection)
+        self.table.verticalHeader().setVisible(False)
+        self.table.horizontalHeader().setSectionResizeMode(1, QHeaderView.Stretch)
+        self.table.itemSelectionChanged.connect(self._show_distribution)
+        layout.addWidget(self.table, 3)
+
+        self.distribution = QPlainTextEdit()
+        self.distribution.setReadOnly(True)
+        self.distribution.setFont(QFont("Monospace"))
+        self.distribution.setPlaceholderText("Select an operation to see its latency distribution")
+        layout.addWidget(self.distribution, 1)
+
+        buttons = QHBoxLayout()
+        refresh_btn = QPushButton("Refresh")
+        refresh_btn.clicked.connect(self.refresh)
+        reset_btn = QPushButton("Reset")
+        reset_btn.clicked.connect(self.reset)
+        json_btn = QPushButton("Export JSON…")
+        json_btn.clicked.connect(self.export_json)
+        trace_btn = QPushButton("Export Chrome Trace…")
+        trace_btn.clicked.connect(self.export_trace)
+        close_btn = QPushButton("Close")
+        close_btn.clicked.connect(self.close)
+        for btn in (refresh_btn, reset_btn, json_btn, trace_btn):
+            buttons.addWidget(btn)
+        buttons.addStretch(1)
+        buttons.addWidget(close_btn)
+        layout.addLayout(buttons)
+
+        # Live while visible and recording
+        self._timer = QTimer(self)
+        self._timer.setInterval(REFRESH_MS)
+        self._timer.timeout.connect(self.refresh)
+
+        self.refresh()
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.refresh()
+        self._timer.start()
+
+    def hideEvent(self, event):
+        self._timer.stop()
+        super().hideEvent(event)
+
+    # ---------- actions ----------
+
+    def set_recording(self, on):
+        if on:
+            instrumentation.enable()
+        else:
+            instrumentation.disable()
+        self.refresh()
+
+    def reset(self):
+        instrumentation.reset()
+        self.refresh()
+
+    def refresh(self):
+        selected = self._selected_key()
+        self._summaries = instrumentation.histograms()
+
+        self.table.setSortingEnabled(False)
+        self.table.setRowCount(len(self._summaries))
+        for row, summary in enumerate(self._summaries):
+            for column, (_, key, decimals) in enumerate(_COLUMNS):
+                value = summary[key]
+                item = QTableWidgetItem(value) if decimals is None else _NumberItem(value, decimals)
+                # Which summary this row shows, whatever the sort order
+                item.setData(Qt.UserRole, (summary["category"], summary["name"]))
+                self.table.setItem(row, column, item)
+        self.table.setSortingEnabled(True)
+        self._select_key(selected)
+
+        state = "recording" if instrumentation.enabled else "off"
+        self.status_label.setText(
+            f"{state} · {len(self._summaries)} operations · "
+            f"{instrumentation.event_count():,} events in the trace buffer"
+            f"{self._render_cache_text()}"
+        )
+        self._show_distribution()
+
+    def _render_cache_text(self):
+        # Only report on a generator something else already created
+        page_generator = sys.modules.get("controllers.page_generator")
+        generator = page_generator._shared_generator if page_generator is not None else None
+        if generator is None:
+            return ""
+        stats = generator.render_cache.stats()
+        return (
+            f" · render cache {stats['hit_rate']:.0%} hits "
+            f"({stats['entries']} entries, {stats['bytes'] / 1024:.0f} KB)"
+        )
+
+    def export_json(self):
+        path, _ = QFileDialog.getSaveFileName(self, "Export timings", "timings.json", "JSON (*.json)")
+        if path:
+            self._export(instrumentation.export_json, path)
+
+    def export_trace(self):
+        path, _ = QFileDialog.getSaveFileName(
+            self, "Export Chrome trace", "trace.json", "Chrome trace (*.json)"
+        )
+        if path:
+            self._export(instrumentation.export_chrome_trace, path)
+
+    def _export(self, exporter, path):
+        try:
+            exporter(path)
+        except OSError as e:
+            QMessageBox.critical(self, "Export Failed", f"Could not write {path}:\n{e}")
+
+    # ---------- selection ----------
+
+    def _selected_key(self):
+        items = self.table.selectedItems()
+        return items[0].data(Qt.UserRole) if items else None
+
+    def _select_key(self, key):
+        if key is None:
+            return
+        for row in range(self.table.rowCount()):
+            if self.table.item(row, 0).data(Qt.UserRole) == key:
+                self.table.selectRow(row)
+                return
+
+    def _show_distribution(self):
+        key = self._selected_key()
+        summary = next(
+            (s for s in self._summaries if (s["category"], s["name"]) == key), None
+        )
+        if summary is None:
+            self.distribution.clear()
+            return
+        buckets = summary["buckets_us"]
+        peak = max(buckets.values(), default=0)
+        lines = [f"{summary['category']}: {summary['name']}"]
+        for bound, count in buckets.items():
+            bar = "█" * max(1, round(40 * count / peak)) if peak else ""
+            lines.append(f"{bound + ' µs':>14} {count:>8,}  {bar}")
+        self.distribution.setPlainText("\n".join(lines))
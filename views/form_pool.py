@@ -0,0 +1,56 @@
+from collections import defaultdict
+
+from controllers import instrumentation
+
+
+class FormPool:
+    """
+    Per-component-type pool of idle form widgets. Switching pages releases the
+    old forms here and acquires them again (repopulated via set_data) instead of
+    building new widget trees; forms beyond the per-type cap are destroyed with
+    deleteLater so memory stays flat over a long session.
+    """
+
+    def __init__(self, factory, max_idle_per_type=12):
+        self._factory = factory  # (component_type, data) -> new form widget or None
+        self.max_idle_per_type = max_idle_per_type
+        self._idle = defaultdict(list)
+        self.created = 0
+        self.reused = 0
+        self.destroyed = 0
+
+    def acquire(self, component_type, data=None):
+        idle = self._idle.get(component_type)
+        if idle:
+            form = idle.pop()
+            with instrumentation.span("form", f"set_data {component_type}"):
+                form.set_data(data)
+            self.reused += 1
+            return form
+
+        form = self._factory(component_type, data)
+        if form is not None:
+            self.created += 1
+        return form
+
+    def release(self, form):
+        """Detach a form from its row and park it for reuse (or destroy it)."""
+        form.hide()
+        form.setParent(None)
+        idle = self._idle[form.component_type]
+        if len(idle) < self.max_idle_per_type:
+            idle.append(form)
+        else:
+            form.deleteLater()
+            self.destroyed += 1
+
+    def idle_count(self) -> int:
+        return sum(len(forms) for forms in self._idle.values())
+
+    def clear(self):
+        """Destroy every idle form."""
+        for forms in self._idle.values():
+            for form in forms:
+                form.deleteLater()
+                self.destroyed += 1
+        self._idle.clear()
@@ -1,66 +1,299 @@
-from PyQt5.QtWidgets import QWidget, QVBoxLayout, QListWidget, QPushButton, QLabel, QScrollArea, QMessageBox
-from PyQt5.QtCore import Qt
+import os
+
+from PyQt5.QtWidgets import (
+    QWidget, QVBoxLayout, QHBoxLayout, QListView, QLineEdit, QPushButton, QLabel, QMessageBox,
+    QAbstractItemView, QFileDialog, QProgressDialog, QComboBox, QCheckBox
+)
+from PyQt5.QtCore import Qt, QTimer, pyqtSignal
 from database.db_handler import DBHandler
+from views.page_list_model import PageListModel, PAGE_ID_ROLE
+from views.workers import Task, start_task
+
+# Wait this long after the last keystroke before searching
+SEARCH_DEBOUNCE_MS = 200
+
+# Bulk export stylesheet modes: (label, shared_css, inline_fallback)
+_CSS_MODES = [
+    ("Inline <style> per page", False, False),
+    ("Shared stylesheet", True, False),
+    ("Shared stylesheet + inline fallback", True, True),
+]
 
 class LeftPanel(QWidget):
+    pages_loaded = pyqtSignal(int)  # number of rows in the first batch
+
     def __init__(self, parent=None):
         super().__init__(parent)
 
         self.db = DBHandler()
         self.selected_page_id = None  # track current selection
+        # Bumped on every reload, so a slow background load can't overwrite a newer list
+        self._pages_generation = 0
 
         layout = QVBoxLayout()
 
         label = QLabel("Pages")
         layout.addWidget(label)
 
-        self.scroll_area = QScrollArea()
-        self.scroll_area.setWidgetResizable(True)
+        self.search_box = QLineEdit()
+        self.search_box.setPlaceholderText("Search titles and content…")
+        self.search_box.setToolTip("Finds pages by title or by any text in their components (facts, links, image URLs…)")
+        self.search_box.setClearButtonEnabled(True)
+        self.search_box.textChanged.connect(lambda _: self._search_timer.start())
+        layout.addWidget(self.search_box)
 
-        self.page_list_widget = QListWidget()
-        self.load_pages_from_db()
+        self._search_timer = QTimer(self)
+        self._search_timer.setSingleShot(True)
+        self._search_timer.setInterval(SEARCH_DEBOUNCE_MS)
+        self._search_timer.timeout.connect(self.load_pages_async)
 
-        self.page_list_widget.itemClicked.connect(self.page_selected)
+        # Rows are fetched from the DB in batches as the list scrolls
+        self.page_model = PageListModel(self.db, self)
+        self.page_list_view = QListView()
+        self.page_list_view.setModel(self.page_model)
+        self.page_list_view.setUniformItemSizes(True)
+        # Ctrl/Shift-click selects several pages for bulk export
+        self.page_list_view.setSelectionMode(QAbstractItemView.ExtendedSelection)
+        self.page_list_view.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        # The list is filled by load_pages_async() once the window is up
 
-        self.scroll_area.setWidget(self.page_list_widget)
-        layout.addWidget(self.scroll_area)
+        self.page_list_view.clicked.connect(self.page_selected)
+        layout.addWidget(self.page_list_view)
 
         # Create / Delete buttons (delete is hidden until a page is selected)
-        new_page_btn = QPushButton("➕ New Page")
-        new_page_btn.clicked.connect(self.create_new_page)
-        layout.addWidget(new_page_btn)
+        self.new_page_btn = QPushButton("➕ New Page")
+        self.new_page_btn.clicked.connect(self.create_new_page)
+        layout.addWidget(self.new_page_btn)
 
         self.delete_page_btn = QPushButton("🗑️ Delete Page")
         self.delete_page_btn.setVisible(False)  # only show when a page is selected
         self.delete_page_btn.clicked.connect(self.delete_selected_page)
         layout.addWidget(self.delete_page_btn)
 
+        bulk_export_btn = QPushButton("📦 Export All / Selected")
+        bulk_export_btn.setToolTip("Export the selected pages (or every page if none is selected) into a folder")
+        bulk_export_btn.clicked.connect(self.export_pages_bulk)
+        layout.addWidget(bulk_export_btn)
+
+        css_row = QHBoxLayout()
+        css_row.addWidget(QLabel("CSS:"))
+        self.export_css_mode = QComboBox()
+        for label, _, _ in _CSS_MODES:
+            self.export_css_mode.addItem(label)
+        self.export_css_mode.setToolTip(
+            "Shared: one cacheable site.<hash>.css with the CSS of every component used, linked from each page.\n"
+            "Inline fallback also keeps each page's own <style> block, for Drupal body fields that strip <link>."
+        )
+        css_row.addWidget(self.export_css_mode, 1)
+        layout.addLayout(css_row)
+
+        self.export_changed_only = QCheckBox("Only changed pages")
+        self.export_changed_only.setChecked(True)
+        self.export_changed_only.setToolTip(
+            "Skip pages unchanged since the last export into the folder (per its export manifest).\n"
+            "Untick to re-export every page, e.g. after editing or deleting exported files by hand."
+        )
+        layout.addWidget(self.export_changed_only)
+
+        import_btn = QPushButton("📥 Import Pages…")
+        import_btn.setToolTip("Add pages from a JSON or NDJSON file (an interrupted import resumes where it stopped)")
+        import_btn.clicked.connect(self.import_pages)
+        layout.addWidget(import_btn)
+
         self.setLayout(layout)
 
     def load_pages_from_db(self):
-        self.page_list_widget.clear()
-        pages = self.db.get_pages()
-        for page in pages:
-            self.page_list_widget.addItem(f"{page['id']}: {page['title']}")
+        """Reload the list from the first batch (normally not needed: see page_* methods)."""
+        self._pages_generation += 1
+        self.page_model.reset(self.search_box.text().strip())
+        self.pages_loaded.emit(self.page_model.rowCount())
+
+    def load_pages_async(self):
+        """Query the first batch on a worker thread and show it when it arrives."""
+        self._pages_generation += 1
+        generation = self._pages_generation
+        search = self.search_box.text().strip()
+        task = Task(_load_pages_job, self.db, search)
+
+        def on_finished(rows):
+            if generation == self._pages_generation:
+                self.page_model.set_rows(rows, search)
+                self.pages_loaded.emit(len(rows))
+
+        def on_failed(message):
+            QMessageBox.critical(self, "Load Failed", f"Could not load pages:\n{message}")
+
+        task.signals.finished.connect(on_finished)
+        task.signals.failed.connect(on_failed)
+        start_task(task)
 
-    def page_selected(self, item):
-        page_id = int(item.text().split(":")[0])
+    # ---------- incremental list updates ----------
+
+    def set_page_switching_enabled(self, enabled):
+        """Off while the right panel saves: selecting, creating or deleting pages waits for it."""
+        self.page_list_view.setEnabled(enabled)
+        self.new_page_btn.setEnabled(enabled)
+        self.delete_page_btn.setEnabled(enabled)
+
+    def page_renamed(self, page_id, title):
+        self.page_model.update_page(page_id, title)
+
+    def page_selected(self, index):
+        page_id = index.data(PAGE_ID_ROLE)
         self.selected_page_id = page_id
         self.delete_page_btn.setVisible(True)  # show delete now that we have a selection
         # Load details into the right panel editor
-        self.parent().right_panel.load_page_details(page_id)
+        right_panel = self.parent().right_panel
+        right_panel.load_page_details(page_id)
+        # Open the components that matched the search
+        matches = self.page_model.matching_components(page_id)
+        if matches:
+            right_panel.reveal_components(matches)
 
     def create_new_page(self):
         page_id = self.db.create_page("New Page")
-        self.load_pages_from_db()
+        page = self.db.get_page(page_id)
+        if self.page_model.search_text():
+            # The new page wouldn't match the search; show the full list again
+            self.search_box.blockSignals(True)
+            self.search_box.clear()
+            self.search_box.blockSignals(False)
+            self.load_pages_from_db()
+        else:
+            self.page_model.insert_page(page['id'], page['title'], page['created_at'])
+
+        # Select the newly created page
+        row = self.page_model.row_of(page_id)
+        if row != -1:
+            index = self.page_model.index(row)
+            self.page_list_view.setCurrentIndex(index)
+            self.page_list_view.scrollTo(index)
+            self.page_selected(index)
+
+    def _selected_page_ids(self):
+        return [index.data(PAGE_ID_ROLE) for index in self.page_list_view.selectionModel().selectedRows()]
+
+    def export_pages_bulk(self):
+        page_ids = self._selected_page_ids() or None
+        out_dir = QFileDialog.getExistingDirectory(self, "Export pages to folder")
+        if not out_dir:
+            return
+
+        total = len(page_ids) if page_ids is not None else self.db.count_pages()
+        progress_dialog = QProgressDialog("Exporting pages...", "Cancel", 0, max(total, 1), self)
+        progress_dialog.setWindowTitle("Bulk Export")
+        progress_dialog.setWindowModality(Qt.WindowModal)
+        progress_dialog.setMinimumDuration(0)
+
+        _, shared_css, inline_fallback = _CSS_MODES[self.export_css_mode.currentIndex()]
+        # Rendering runs in worker processes, driven from a pool thread
+        task = Task(
+            _bulk_export_job, self.db, out_dir, page_ids, shared_css, inline_fallback,
+            self.export_changed_only.isChecked(),
+        )
+        progress_dialog.canceled.connect(task.cancel)
+
+        def on_progress(done, total, message):
+            progress_dialog.setMaximum(max(total, 1))
+            progress_dialog.setValue(done)
+            progress_dialog.setLabelText(message)
+
+        def on_finished(result):
+            progress_dialog.close()
+            message = (
+                f"Exported {result['exported']} page(s) to:\n{result['output_dir']}\n\n"
+                f"Skipped {result['skipped']} unchanged page(s)"
+                + (f", removed {result['removed']} deleted page(s)" if result['removed'] else "")
+                + f"\n{result['elapsed']:.2f}s ({result['pages_per_sec']:.1f} pages/sec)"
+            )
+            if result['stylesheet']:
+                message += f"\n\nShared stylesheet: {result['stylesheet']}"
+            if result['cancelled']:
+                message += "\n\nExport was cancelled."
+            if result['failed']:
+                failures = "\n".join(f"Page {pid}: {err}" for pid, err in result['failed'][:10])
+                QMessageBox.warning(self, "Exported with errors", f"{message}\n\nFailed:\n{failures}")
+            else:
+                QMessageBox.information(self, "Exported", message)
+
+        def on_failed(message):
+            progress_dialog.close()
+            QMessageBox.critical(self, "Export Failed", f"Could not export pages:\n{message}")
 
-        # Safely select newly created page
-        for index in range(self.page_list_widget.count()):
-            item = self.page_list_widget.item(index)
-            if item.text().startswith(f"{page_id}:"):
-                self.page_list_widget.setCurrentItem(item)
-                self.page_selected(item)
-                break
+        task.signals.progress.connect(on_progress)
+        task.signals.finished.connect(on_finished)
+        task.signals.failed.connect(on_failed)
+        start_task(task)
+
+    def import_pages(self):
+        file_path, _ = QFileDialog.getOpenFileName(
+            self, "Import pages", "", "Pages (*.json *.ndjson *.jsonl);;All files (*)"
+        )
+        if not file_path:
+            return
+        self._start_import(file_path)
+
+    def _start_import(self, file_path, restart=False):
+        progress_dialog = QProgressDialog("Importing pages...", "Cancel", 0, 1000, self)
+        progress_dialog.setWindowTitle("Import Pages")
+        progress_dialog.setWindowModality(Qt.WindowModal)
+        progress_dialog.setMinimumDuration(0)
+
+        task = Task(_import_pages_job, self.db, file_path, restart)
+        progress_dialog.canceled.connect(task.cancel)
+
+        def on_progress(done, total, message):
+            progress_dialog.setValue(done)
+            progress_dialog.setLabelText(message)
+
+        def on_finished(result):
+            progress_dialog.close()
+            if 'checkpoint_mismatch' in result:
+                self._confirm_import_restart(file_path, result['checkpoint_mismatch'])
+                return
+            self.load_pages_async()
+            message = (
+                f"Imported {result['pages']} page(s) and {result['components']} component(s)\n\n"
+                f"{result['elapsed']:.2f}s ({result['rows_per_sec']:.0f} rows/sec)"
+            )
+            if result['resumed_from']:
+                message += f"\n\nResumed an earlier import after page {result['resumed_from']}."
+            if result['cancelled']:
+                message += "\n\nImport was cancelled; import the same file again to continue."
+            if result['errors']:
+                skipped = "\n".join(f"Page {number}: {error}" for number, error in result['errors'][:10])
+                QMessageBox.warning(
+                    self, "Imported with errors", f"{message}\n\n{result['skipped']} page(s) skipped:\n{skipped}"
+                )
+            else:
+                QMessageBox.information(self, "Imported", message)
+
+        def on_failed(message):
+            progress_dialog.close()
+            # Chunks committed before the failure stay; importing again resumes after them
+            self.load_pages_async()
+            QMessageBox.critical(self, "Import Failed", f"Could not import pages:\n{message}")
+
+        task.signals.progress.connect(on_progress)
+        task.signals.finished.connect(on_finished)
+        task.signals.failed.connect(on_failed)
+        start_task(task)
+
+    def _confirm_import_restart(self, file_path, checkpoint):
+        from controllers.page_importer import PageImporter
+
+        confirm = QMessageBox.question(
+            self,
+            "Import Changed",
+            f"{os.path.basename(file_path)} changed since an earlier import of it was interrupted "
+            f"after {checkpoint['pages_read']} page(s), so it can't resume.\n\n"
+            "Import it again from the beginning? Pages the earlier import added are kept.",
+            QMessageBox.Yes | QMessageBox.No
+        )
+        if confirm != QMessageBox.Yes:
+            return
+        PageImporter(self.db).discard_checkpoint(file_path)
+        self._start_import(file_path, restart=True)
 
     def delete_selected_page(self):
         if self.selected_page_id is None:
@@ -85,19 +318,46 @@ class LeftPanel(QWidget):
             return
 
         # Reset selection & UI
+        self.page_model.remove_page(self.selected_page_id)
         self.selected_page_id = None
         self.delete_page_btn.setVisible(False)
-        self.load_pages_from_db()
-        self.page_list_widget.clearSelection()
+        self.page_list_view.clearSelection()
 
         # Clear the right panel editor contents
-        rp = self.parent().right_panel  # RightPanel instance
-        rp.current_page_id = None
-        rp.page_title.clear()
-        # remove any component widgets
-        for i in reversed(range(rp.components_layout.count())):
-            w = rp.components_layout.itemAt(i).widget()
-            if w:
-                w.setParent(None)
+        self.parent().right_panel.clear_page()
 
         QMessageBox.information(self, "Deleted", "Page deleted successfully.")
+
+
+def _load_pages_job(task, db, search):
+    return PageListModel.query_first_batch(db, search)
+
+
+def _import_pages_job(task, db, file_path, restart):
+    from controllers.page_importer import CheckpointMismatch, PageImporter
+
+    def on_progress(bytes_read, size, totals):
+        task.report(
+            bytes_read * 1000 // max(size, 1), 1000,
+            f"Imported {totals['pages']} pages ({totals['rows_per_sec']:.0f} rows/sec)"
+        )
+    try:
+        return PageImporter(db).import_file(
+            file_path, progress=on_progress, is_cancelled=task.is_cancelled, restart=restart
+        )
+    except CheckpointMismatch as e:
+        # Whether to start over is asked on the GUI thread
+        return {'checkpoint_mismatch': e.checkpoint}
+
+
+def _bulk_export_job(task, db, out_dir, page_ids, shared_css, inline_fallback, incremental):
+    # Pulls in Jinja2 and the process pool machinery; only needed when exporting
+    from controllers.batch_exporter import BatchExporter
+
+    def on_progress(done, total, pages_per_sec):
+        task.report(done, total, f"Exported {done}/{total} pages ({pages_per_sec:.1f} pages/sec)")
+    # With incremental, pages unchanged since the last export into out_dir are left as they are
+    return BatchExporter(db).export(
+        out_dir, page_ids, progress=on_progress, is_cancelled=task.is_cancelled, incremental=incremental,
+        shared_css=shared_css, inline_fallback=inline_fallback,
+    )
@@ -0,0 +1,143 @@
+from PyQt5.QtCore import Qt, QAbstractListModel, QModelIndex
+from controllers import component_registry
+
+# Item data role holding the page id
+PAGE_ID_ROLE = Qt.UserRole
+
+# Rows fetched per batch as the list is scrolled
+BATCH_SIZE = 200
+
+# Search results are capped at this many pages (see DBHandler.search)
+SEARCH_LIMIT = 500
+
+
+class PageListModel(QAbstractListModel):
+    """
+    The page list, newest first. The full list is fetched in batches of
+    keyset queries as the view scrolls (Qt calls canFetchMore/fetchMore);
+    search results (title or component content matches) come in one capped
+    batch. Creates, renames and deletes patch the loaded rows in place
+    instead of reloading the list.
+    """
+
+    def __init__(self, db, parent=None):
+        super().__init__(parent)
+        self.db = db
+        # [(id, title, created_at, matching components)]; the last is only
+        # filled for search results: [{'id', 'type', 'snippet'}]
+        self._rows = []
+        self._search = ""         # current search text; "" lists every page
+        self._exhausted = True    # nothing loaded until reset()/set_rows()
+
+    # ---------- Qt model API ----------
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        page_id, title, _, matches = self._rows[index.row()]
+        if role == Qt.DisplayRole:
+            return f"{page_id}: {title}"
+        if role == Qt.ToolTipRole:
+            lines = [title]
+            for comp in matches:
+                snippet = " · ".join(comp['snippet'].split("\n"))
+                lines.append(f"{component_registry.title_for(comp['type'])}: {snippet}")
+            return "\n".join(lines)
+        if role == PAGE_ID_ROLE:
+            return page_id
+        return None
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and not self._exhausted
+
+    def fetchMore(self, parent=QModelIndex()):
+        if parent.isValid() or self._exhausted:
+            return
+        rows = self._query_batch()
+        self._exhausted = len(rows) < BATCH_SIZE
+        if rows:
+            first = len(self._rows)
+            self.beginInsertRows(QModelIndex(), first, first + len(rows) - 1)
+            self._rows.extend(rows)
+            self.endInsertRows()
+
+    # ---------- loading ----------
+
+    def _query_batch(self):
+        after = (self._rows[-1][2], self._rows[-1][0]) if self._rows else None
+        rows = self.db.get_pages_batch(BATCH_SIZE, after)
+        return [(row['id'], row['title'], row['created_at'], ()) for row in rows]
+
+    @staticmethod
+    def query_first_batch(db, search=""):
+        """The first batch of rows for set_rows(); safe to call from a worker thread."""
+        if search:
+            return [
+                (page['id'], page['title'], page['created_at'], page['components'])
+                for page in db.search(search, SEARCH_LIMIT)
+            ]
+        rows = db.get_pages_batch(BATCH_SIZE)
+        return [(row['id'], row['title'], row['created_at'], ()) for row in rows]
+
+    def set_rows(self, rows, search=None):
+        """Replace the list with a first batch (see query_first_batch)."""
+        self.beginResetModel()
+        if search is not None:
+            self._search = search
+        self._rows = list(rows)
+        # Search results arrive complete; the full list pages on scroll
+        self._exhausted = bool(self._search) or len(self._rows) < BATCH_SIZE
+        self.endResetModel()
+
+    def reset(self, search=None):
+        """Reload from the first batch, optionally switching to another search."""
+        if search is not None:
+            self._search = search
+        self.set_rows(self.query_first_batch(self.db, self._search))
+
+    def search_text(self):
+        return self._search
+
+    # ---------- incremental updates ----------
+
+    def row_of(self, page_id):
+        for row, page in enumerate(self._rows):
+            if page[0] == page_id:
+                return row
+        return -1
+
+    def page_id_at(self, row):
+        return self._rows[row][0]
+
+    def matching_components(self, page_id):
+        """Ids of the components that matched the current search on this page."""
+        row = self.row_of(page_id)
+        return [comp['id'] for comp in self._rows[row][3]] if row != -1 else []
+
+    def insert_page(self, page_id, title, created_at):
+        """A new page goes on top (newest first); skipped while a search is active."""
+        if self._search or self.row_of(page_id) != -1:
+            return
+        self.beginInsertRows(QModelIndex(), 0, 0)
+        self._rows.insert(0, (page_id, title, created_at, ()))
+        self.endInsertRows()
+
+    def update_page(self, page_id, title):
+        row = self.row_of(page_id)
+        if row == -1:
+            return
+        _, _, created_at, matches = self._rows[row]
+        self._rows[row] = (page_id, title, created_at, matches)
+        index = self.index(row)
+        self.dataChanged.emit(index, index, [Qt.DisplayRole, Qt.ToolTipRole])
+
+    def remove_page(self, page_id):
+        row = self.row_of(page_id)
+        if row == -1:
+            return
+        self.beginRemoveRows(QModelIndex(), row, row)
+        del self._rows[row]
+        self.endRemoveRows()
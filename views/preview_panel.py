@@ -0,0 +1,112 @@
+from PyQt5.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QLabel, QTextBrowser, QPlainTextEdit, QTabWidget
+from PyQt5.QtCore import QTimer
+import time
+
+from controllers.render_cache import RenderCache
+
+# Wait this long after the last edit before re-rendering
+DEBOUNCE_MS = 250
+# HTML of component renders the preview keeps across page switches
+PREVIEW_CACHE_BYTES = 4 * 1024 * 1024
+
+
+class PreviewPanel(QWidget):
+    """
+    Live preview of the page being edited in the RightPanel. Edits are
+    debounced; on refresh only rows whose form changed since the last render
+    are re-read. Their HTML is looked up in the preview's own render cache,
+    which outlives page switches, then in the shared one. Renders of data
+    being typed only go into the preview's cache, never the shared cache
+    (nor, once it is attached, the database).
+    """
+
+    def __init__(self, right_panel, parent=None):
+        super().__init__(parent)
+        self.right_panel = right_panel
+        # row -> (revision, html) as of the last refresh
+        self._rendered = {}
+        # Renders for rows of any page, keyed like the shared render cache
+        self._render_cache = RenderCache(PREVIEW_CACHE_BYTES)
+
+        layout = QVBoxLayout(self)
+        header = QHBoxLayout()
+        header.addWidget(QLabel("Preview"))
+        header.addStretch(1)
+        self.status_label = QLabel()
+        self.status_label.setStyleSheet("color: #666; font-size: 11px;")
+        header.addWidget(self.status_label)
+        layout.addLayout(header)
+
+        # Qt's rich text engine supports a subset of CSS; the Source tab shows
+        # exactly what an export would write.
+        self.tabs = QTabWidget()
+        self.browser = QTextBrowser()
+        self.browser.setOpenExternalLinks(False)
+        self.source = QPlainTextEdit()
+        self.source.setReadOnly(True)
+        self.tabs.addTab(self.browser, "Rendered")
+        self.tabs.addTab(self.source, "Source")
+        layout.addWidget(self.tabs)
+
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(DEBOUNCE_MS)
+        self._timer.timeout.connect(self.refresh)
+
+        right_panel.components_changed.connect(self.schedule_refresh)
+
+    def schedule_refresh(self):
+        # Restarting the timer coalesces a burst of keystrokes into one render
+        self._timer.start()
+
+    def _component_html(self, generator, ctype, data):
+        """(html, whether it had to be rendered now) for a component of any page."""
+        key = generator.render_key(ctype, data)
+        html = self._render_cache.get(key)
+        if html is not None:
+            return html, False
+        # The shared cache is read, but drafts stay out of it
+        html = generator.render_component(ctype, data, store=False)
+        self._render_cache.put(key, html)
+        return html, True
+
+    def refresh(self):
+        # Imported on first refresh so Jinja2 stays off the startup path
+        from controllers.page_generator import get_page_generator
+
+        start = time.perf_counter()
+        generator = get_page_generator()
+        records = self.right_panel.component_records
+
+        html_parts, rendered, re_rendered = [], {}, 0
+        try:
+            for rec in records:
+                row = rec["row"]
+                previous = self._rendered.get(row)
+                if previous is not None and previous[0] == row.revision:
+                    rendered[row] = previous
+                else:
+                    html, was_rendered = self._component_html(generator, rec["type"], row.get_data())
+                    re_rendered += was_rendered
+                    rendered[row] = (row.revision, html)
+                html_parts.append(rendered[row][1])
+
+            css, _ = generator.build_page_css(rec["type"] for rec in records)
+        except Exception as e:
+            self.status_label.setText(f"Preview error: {e}")
+            return
+
+        # Forget rows that are gone (deleted or page switched)
+        self._rendered = rendered
+
+        html = "\n\n".join(html_parts).strip()
+        if css:
+            html += f"\n\n<style>\n{css}\n</style>\n"
+
+        scroll = self.browser.verticalScrollBar().value()
+        self.browser.setHtml(html)
+        self.browser.verticalScrollBar().setValue(scroll)
+        self.source.setPlainText(html)
+        self.status_label.setText(
+            f"{re_rendered}/{len(records)} re-rendered in {(time.perf_counter() - start) * 1000:.1f} ms"
+        )
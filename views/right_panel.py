@@ -1,28 +1,187 @@
 from PyQt5.QtWidgets import (
     QWidget, QVBoxLayout, QPushButton, QLineEdit, QLabel, QScrollArea,
-    QMenu, QMessageBox, QFileDialog, QHBoxLayout, QFrame
+    QMenu, QMessageBox, QFileDialog, QHBoxLayout, QCheckBox, QProgressBar, QFrame
 )
-from PyQt5.QtCore import Qt
-from database.db_handler import DBHandler
-from views.components.facts_table_form import FactsTableForm
-from views.components.header_section_form import HeaderSectionForm
-from views.components.info_section_form import InfoSectionForm
-from controllers.page_generator import PageGenerator
-from views.components.cards_section_form import CardsSectionForm
-from views.components.card_grid_4_form import CardGrid4Form
+from PyQt5.QtCore import Qt, QTimer, pyqtSignal
+from PyQt5.QtGui import QCursor
+import os
+import sys
+import time
+from database.db_handler import DBHandler, content_hash
+from controllers import component_registry, instrumentation
+from controllers.page_controller import PageController
+from views.component_row import ComponentRow, ROW_MIME_TYPE
+from views.form_pool import FormPool
+from views.workers import Task, start_task
+
+# Pages with at most this many components open fully expanded; larger pages
+# open as collapsed summary rows and only build a form when one is expanded.
+AUTO_EXPAND_LIMIT = 5
+
+
+def _current_rss_bytes():
+    """Resident memory of this process, or None if it can't be determined."""
+    try:
+        if sys.platform.startswith("linux"):
+            with open("/proc/self/statm") as f:
+                return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+        if os.name == "nt":
+            import ctypes
+            from ctypes import wintypes
+
+            class _Counters(ctypes.Structure):
+                _fields_ = [
+                    ("cb", wintypes.DWORD), ("PageFaultCount", wintypes.DWORD),
+                    ("PeakWorkingSetSize", ctypes.c_size_t), ("WorkingSetSize", ctypes.c_size_t),
+                    ("QuotaPeakPagedPoolUsage", ctypes.c_size_t), ("QuotaPagedPoolUsage", ctypes.c_size_t),
+                    ("QuotaPeakNonPagedPoolUsage", ctypes.c_size_t), ("QuotaNonPagedPoolUsage", ctypes.c_size_t),
+                    ("PagefileUsage", ctypes.c_size_t), ("PeakPagefileUsage", ctypes.c_size_t),
+                ]
+
+            counters = _Counters()
+            counters.cb = ctypes.sizeof(counters)
+            handle = ctypes.windll.kernel32.GetCurrentProcess()
+            if ctypes.windll.psapi.GetProcessMemoryInfo(handle, ctypes.byref(counters), counters.cb):
+                return counters.WorkingSetSize
+    except Exception:
+        pass
+    return None
+
+
+class _ComponentList(QWidget):
+    """
+    Container of the component rows that accepts dropped rows: marks the
+    insertion point with a line while dragging, and scrolls the surrounding
+    area while the drag is held near its top or bottom edge.
+    """
+    SCROLL_MARGIN = 32  # px from the viewport edge where auto-scroll starts
+    SCROLL_STEP = 20    # px per tick
+    SCROLL_INTERVAL_MS = 30
+
+    def __init__(self, scroll_area, rows, on_drop):
+        super().__init__()
+        self._scroll_area = scroll_area
+        self._rows = rows        # () -> the rows, in page order
+        self._on_drop = on_drop  # (row, insertion index) -> None
+        self.setAcceptDrops(True)
+
+        self._indicator = QFrame(self)
+        self._indicator.setStyleSheet("background: #2a7ae2;")
+        self._indicator.hide()
+
+        self._scroll_step = 0
+        self._scroll_timer = QTimer(self)
+        self._scroll_timer.setInterval(self.SCROLL_INTERVAL_MS)
+        self._scroll_timer.timeout.connect(self._auto_scroll)
+
+    def _dragged_row(self, event):
+        # Only rows of this list: not text, and not rows from another window
+        source = event.source()
+        if event.mimeData().hasFormat(ROW_MIME_TYPE) and any(row is source for row in self._rows()):
+            return source
+        return None
+
+    def drop_index(self, y):
+        """Insertion index for a drop at y: before the first row whose middle is below it."""
+        rows = self._rows()
+        for index, row in enumerate(rows):
+            if y < row.y() + row.height() // 2:
+                return index
+        return len(rows)
+
+    def dragEnterEvent(self, event):
+        if self._dragged_row(event) is None:
+            event.ignore()
+            return
+        event.acceptProposedAction()
+
+    def dragMoveEvent(self, event):
+        if self._dragged_row(event) is None:
+            event.ignore()
+            return
+        event.acceptProposedAction()
+        self._show_indicator(event.pos().y())
+        self._update_auto_scroll(event.pos().y())
+
+    def dragLeaveEvent(self, event):
+        self._end_drag()
+
+    def dropEvent(self, event):
+        row = self._dragged_row(event)
+        self._end_drag()
+        if row is None:
+            event.ignore()
+            return
+        event.acceptProposedAction()
+        self._on_drop(row, self.drop_index(event.pos().y()))
+
+    def _show_indicator(self, y):
+        rows = self._rows()
+        index = self.drop_index(y)
+        if index < len(rows):
+            line_y = rows[index].y()
+        else:
+            line_y = rows[-1].geometry().bottom() + 1 if rows else 0
+        self._indicator.setGeometry(0, max(0, line_y - 1), self.width(), 3)
+        self._indicator.raise_()
+        self._indicator.show()
+
+    def _update_auto_scroll(self, y):
+        viewport = self._scroll_area.viewport()
+        viewport_y = self.mapTo(viewport, self.rect().topLeft()).y() + y
+        if viewport_y < self.SCROLL_MARGIN:
+            self._scroll_step = -self.SCROLL_STEP
+        elif viewport_y > viewport.height() - self.SCROLL_MARGIN:
+            self._scroll_step = self.SCROLL_STEP
+        else:
+            self._scroll_step = 0
+        if self._scroll_step and not self._scroll_timer.isActive():
+            self._scroll_timer.start()
+        elif not self._scroll_step:
+            self._scroll_timer.stop()
+
+    def _auto_scroll(self):
+        bar = self._scroll_area.verticalScrollBar()
+        before = bar.value()
+        bar.setValue(before + self._scroll_step)
+        if bar.value() == before:
+            self._scroll_timer.stop()
+            return
+        # No drag move arrives while the cursor stands still: follow the content
+        self._show_indicator(self.mapFromGlobal(QCursor.pos()).y())
+
+    def _end_drag(self):
+        self._scroll_timer.stop()
+        self._indicator.hide()
 
 
 class RightPanel(QWidget):
+    # Page content changed (edit, add, delete, reload); drives the live preview
+    components_changed = pyqtSignal()
+    # True while a save runs: the page's rows and the page selection must stay put
+    saving_changed = pyqtSignal(bool)
+
     def __init__(self, parent=None):
         super().__init__(parent)
 
         self.db = DBHandler()
+        self.controller = PageController(self.db)
         self.current_page_id = None
+        self._active_task = None  # save/export running on the thread pool
+        self._saving = False  # the active task is a save
+        self._saved_title = None  # title as last loaded/saved, to skip no-op updates
 
         # We keep a synchronized list of component "records":
-        # each item: {"id": comp_id or None, "type": str, "form": QWidget, "container": QWidget}
+        # each item: {"id": comp_id or None, "type": str, "row": ComponentRow,
+        #             "saved_hash": content hash of the persisted data (None if unsaved),
+        #             "saved_sort_key": persisted sort key (None if unsaved)}
+        # Its order is the page order; rows are reordered by dragging their handle
         self.component_records = []
 
+        # Idle forms are kept per type and repopulated when switching pages
+        self.form_pool = FormPool(self.get_component_form)
+        self.page_switches = 0
+
         layout = QVBoxLayout()
 
         layout.addWidget(QLabel("Page Title:"))
@@ -32,157 +191,238 @@ class RightPanel(QWidget):
         self.components_area = QScrollArea()
         self.components_area.setWidgetResizable(True)
 
-        self.components_container = QWidget()
+        self.components_container = _ComponentList(
+            self.components_area,
+            lambda: [rec["row"] for rec in self.component_records],
+            self.move_component,
+        )
         self.components_layout = QVBoxLayout()
         self.components_layout.setContentsMargins(0, 0, 0, 0)
         self.components_container.setLayout(self.components_layout)
         self.components_area.setWidget(self.components_container)
 
-        layout.addWidget(QLabel("Components in this Page:"))
+        components_header = QHBoxLayout()
+        components_header.addWidget(QLabel("Components in this Page:"))
+        components_header.addStretch(1)
+        expand_all_btn = QPushButton("Expand All")
+        expand_all_btn.clicked.connect(self.expand_all_components)
+        components_header.addWidget(expand_all_btn)
+        collapse_all_btn = QPushButton("Collapse All")
+        collapse_all_btn.clicked.connect(self.collapse_all_components)
+        components_header.addWidget(collapse_all_btn)
+        layout.addLayout(components_header)
         layout.addWidget(self.components_area)
 
         self.add_component_btn = QPushButton("➕ Add Component")
         self.add_component_btn.clicked.connect(self.show_component_menu)
         layout.addWidget(self.add_component_btn)
 
-        save_btn = QPushButton("💾 Save Changes")
-        save_btn.clicked.connect(self.save_changes)
-        layout.addWidget(save_btn)
-
-        export_btn = QPushButton("📥 Export HTML+CSS")
-        export_btn.clicked.connect(self.export_page)
-        layout.addWidget(export_btn)
+        self.save_btn = QPushButton("💾 Save Changes")
+        self.save_btn.clicked.connect(self.save_changes)
+        layout.addWidget(self.save_btn)
+
+        export_row = QHBoxLayout()
+        self.export_btn = QPushButton("📥 Export HTML+CSS")
+        self.export_btn.clicked.connect(self.export_page)
+        export_row.addWidget(self.export_btn, 1)
+
+        self.minify_css_checkbox = QCheckBox("Minify CSS")
+        self.minify_css_checkbox.setToolTip("Strip comments and whitespace from the exported stylesheet")
+        export_row.addWidget(self.minify_css_checkbox)
+        self.merge_css_checkbox = QCheckBox("Merge CSS")
+        self.merge_css_checkbox.setToolTip(
+            "Merge repeated selectors and @media blocks in the exported stylesheet where the result is the same"
+        )
+        export_row.addWidget(self.merge_css_checkbox)
+        layout.addLayout(export_row)
+
+        # Progress of a running save/export (hidden when idle)
+        task_row = QHBoxLayout()
+        self.task_progress = QProgressBar()
+        self.task_progress.setVisible(False)
+        task_row.addWidget(self.task_progress, 1)
+        self.cancel_task_btn = QPushButton("Cancel")
+        self.cancel_task_btn.setVisible(False)
+        self.cancel_task_btn.clicked.connect(self.cancel_active_task)
+        task_row.addWidget(self.cancel_task_btn)
+        layout.addLayout(task_row)
+
+        # Page switch latency / memory readout
+        self.perf_label = QLabel()
+        self.perf_label.setStyleSheet("color: #666; font-size: 11px;")
+        layout.addWidget(self.perf_label)
 
         self.setLayout(layout)
 
     # ---------- helpers ----------
 
-    def _component_title_from_type(self, component_type: str) -> str:
-        mapping = {
-            'facts_table': 'Facts Table',
-            'header_section': 'Header Section',
-            'info_section': 'Info Section',
-            'cards_section': 'Cards Section',
-            'card_grid_4': '4-Card Grid Section',
-        }
-        return mapping.get(component_type, component_type)
-
-    def _make_separator(self) -> QFrame:
-        sep = QFrame()
-        sep.setFrameShape(QFrame.HLine)
-        sep.setFrameShadow(QFrame.Sunken)
-        return sep
-
-    def _add_component_row(self, comp_id, component_type, form_widget):
+    def _add_component_row(self, comp_id, component_type, data=None, saved_sort_key=None, expanded=False):
         """
-        Wrap a form in a container with a header (title + delete button) and
-        append it to the layout and the internal records list (no duplicates).
+        Append a (lazily built) component row to the layout and the internal
+        records list (no duplicates).
         """
-        container = QWidget()
-        container_layout = QVBoxLayout(container)
-        container_layout.setContentsMargins(8, 8, 8, 8)
-        container_layout.setSpacing(8)
-
-        # Header with title + delete
-        header = QWidget()
-        header_layout = QHBoxLayout(header)
-        header_layout.setContentsMargins(0, 0, 0, 0)
-
-        title_label = QLabel(self._component_title_from_type(component_type))
-        title_label.setStyleSheet("font-weight: 600;")
-        header_layout.addWidget(title_label)
-        header_layout.addStretch(1)
-
-        del_btn = QPushButton("🗑️ Delete Component")
-        del_btn.setToolTip("Remove this component from the page")
-        del_btn.setStyleSheet("QPushButton{padding:4px 8px;} QPushButton:hover{opacity:0.95;}")
-        header_layout.addWidget(del_btn)
-
-        container_layout.addWidget(header)
-        container_layout.addWidget(form_widget)
-        container_layout.addWidget(self._make_separator())
+        row = ComponentRow(
+            component_type,
+            component_registry.title_for(component_type),
+            data,
+            self.form_pool.acquire,
+            self.form_pool.release,
+        )
+        if expanded:
+            row.expand()
 
-        # Hook delete
-        del_btn.clicked.connect(lambda: self._delete_component_clicked(container, comp_id))
+        # Hook delete / edits
+        row.delete_requested.connect(lambda: self._delete_component_clicked(row))
+        row.changed.connect(self.components_changed)
 
         # Add to UI
-        self.components_layout.addWidget(container)
+        self.components_layout.addWidget(row)
 
         # Track record synchronized with layout
         record = {
             "id": comp_id,
             "type": component_type,
-            "form": form_widget,
-            "container": container
+            "row": row,
+            "saved_hash": content_hash(data) if comp_id is not None else None,
+            "saved_sort_key": saved_sort_key
         }
         self.component_records.append(record)
 
     def _clear_components_ui_and_records(self):
-        """Remove all component containers from the layout and clear records."""
+        """
+        Remove all component rows from the layout and clear records. Forms go
+        back to the pool; the rows themselves are destroyed explicitly.
+        """
+        for rec in self.component_records:
+            rec["row"].release()
         for i in reversed(range(self.components_layout.count())):
             w = self.components_layout.itemAt(i).widget()
             if w:
                 w.setParent(None)
+                w.deleteLater()
         self.component_records.clear()
 
+    def clear_page(self):
+        """Reset the editor to 'no page selected'."""
+        self.current_page_id = None
+        self._saved_title = None
+        self.page_title.clear()
+        self._clear_components_ui_and_records()
+        self.components_changed.emit()
+
+    def _update_perf_readout(self, load_ms):
+        rss = _current_rss_bytes()
+        rss_text = f"{rss / (1024 * 1024):.1f} MB" if rss is not None else "n/a"
+        pool = self.form_pool
+        self.perf_label.setText(
+            f"Page load {load_ms:.1f} ms · RSS {rss_text} · switches {self.page_switches} · "
+            f"forms created {pool.created}, reused {pool.reused}, pooled {pool.idle_count()}"
+        )
+
     # ---------- main flows ----------
 
     def load_page_details(self, page_id):
         """Populate page title and components from DB for a selected page."""
+        start = time.perf_counter()
         self.current_page_id = page_id
 
         # Always clear before reloading to avoid duplicates
         self._clear_components_ui_and_records()
 
         # Set page title
-        page_data = [p for p in self.db.get_pages() if p['id'] == page_id][0]
+        page_data = self.db.get_page(page_id)
+        if page_data is None:
+            QMessageBox.warning(self, "Load Error", f"Page {page_id} no longer exists.")
+            return
         self.page_title.setText(page_data['title'])
+        self._saved_title = page_data['title']
 
-        # Load components from DB and render
+        # Load components from DB as rows; forms are built on expand
         page_components = self.db.get_page_components(page_id)
+        expanded = len(page_components) <= AUTO_EXPAND_LIMIT
         for comp in page_components:
-            form_widget = self.get_component_form(comp['type'], comp['data'])
-            if form_widget:
-                self._add_component_row(comp['id'], comp['type'], form_widget)
+            self._add_component_row(
+                comp['id'], comp['type'], comp['data'],
+                saved_sort_key=comp['sort_key'], expanded=expanded
+            )
+
+        self.page_switches += 1
+        self._update_perf_readout((time.perf_counter() - start) * 1000)
+        self.components_changed.emit()
+
+    def reveal_components(self, component_ids):
+        """Expand the given components and scroll the first of them into view."""
+        wanted = set(component_ids)
+        rows = [rec["row"] for rec in self.component_records if rec["id"] in wanted]
+        for row in rows:
+            row.expand()
+        if rows:
+            # Let the layout account for the expanded forms before scrolling
+            QTimer.singleShot(0, lambda: self._scroll_to_row(rows[0]))
+
+    def _scroll_to_row(self, row):
+        # The page may have been switched (and the row destroyed) in the meantime
+        if any(rec["row"] is row for rec in self.component_records):
+            self.components_area.ensureWidgetVisible(row)
+
+    def expand_all_components(self):
+        for rec in self.component_records:
+            rec["row"].expand()
+
+    def collapse_all_components(self):
+        for rec in self.component_records:
+            rec["row"].collapse()
 
     def get_component_form(self, component_type, data=None):
-        if component_type == 'facts_table':
-            return FactsTableForm(data)
-        elif component_type == 'header_section':
-            return HeaderSectionForm(data)
-        elif component_type == 'info_section':
-            return InfoSectionForm(data)
-        elif component_type == 'cards_section':
-            return CardsSectionForm(data)
-        elif component_type == 'card_grid_4':
-            return CardGrid4Form(data)
-        else:
+        if not component_registry.is_registered(component_type):
             QMessageBox.warning(self, "Component Error", f"Unknown component type: {component_type}")
+            return None
+        # The form's module is imported the first time this type is edited
+        with instrumentation.span("form", f"construct {component_type}"):
+            return component_registry.get(component_type).form_class()(data)
 
     def show_component_menu(self):
         menu = QMenu()
-        menu.addAction("Facts Table",      lambda: self.add_new_component('facts_table'))
-        menu.addAction("Header Section",   lambda: self.add_new_component('header_section'))
-        menu.addAction("Info Section",     lambda: self.add_new_component('info_section'))
-        menu.addAction("Cards Section",    lambda: self.add_new_component('cards_section'))
-        menu.addAction("4-Card Grid Section", lambda: self.add_new_component('card_grid_4'))
+        for component in component_registry.all_types():
+            menu.addAction(component.title, lambda checked=False, name=component.name: self.add_new_component(name))
         menu.exec_(self.add_component_btn.mapToGlobal(self.add_component_btn.rect().bottomLeft()))
 
     def add_new_component(self, component_type):
-        form_widget = self.get_component_form(component_type)
-        if form_widget:
-            # comp_id is None for new unsaved components
-            self._add_component_row(None, component_type, form_widget)
+        if self._saving:
+            return
+        # comp_id is None for new unsaved components; open it for editing
+        self._add_component_row(None, component_type, expanded=True)
+        self.components_changed.emit()
+
+    def move_component(self, row, index):
+        """
+        Move row to insertion index (0..len, counted before the move). Only the
+        editor changes; Save writes the moved component's new sort key.
+        """
+        current = next((i for i, rec in enumerate(self.component_records) if rec["row"] is row), None)
+        if current is None:
+            return
+        if index > current:
+            index -= 1
+        if index == current:
+            return
+        self.component_records.insert(index, self.component_records.pop(current))
+        self.components_layout.removeWidget(row)
+        self.components_layout.insertWidget(index, row)
+        self.components_changed.emit()
 
-    def _delete_component_clicked(self, container, comp_id):
+    def _delete_component_clicked(self, row):
         """
         Delete handler:
         - Confirm with the user.
         - If comp is saved (comp_id not None): delete from DB.
-        - Remove container from UI.
+        - Remove the row from UI.
         - Remove matching record from component_records.
         - Do NOT full-reload here to avoid losing unsaved components and to avoid duplicates.
         """
+        if self._saving:
+            # The running save holds this row's snapshot; it would write it back
+            return
         confirm = QMessageBox.question(
             self,
             "Confirm Delete",
@@ -192,6 +432,10 @@ class RightPanel(QWidget):
         if confirm != QMessageBox.Yes:
             return
 
+        # Look the id up now: a component added in this session gets its id on Save
+        record = next((rec for rec in self.component_records if rec["row"] is row), None)
+        comp_id = record["id"] if record else None
+
         # Delete from DB if needed
         if comp_id is not None:
             try:
@@ -200,68 +444,180 @@ class RightPanel(QWidget):
                 QMessageBox.critical(self, "Delete Failed", f"Could not delete component:\n{e}")
                 return
 
-        # Remove container from UI
-        container.setParent(None)
+        # Remove row from UI (its form goes back to the pool)
+        row.release()
+        row.setParent(None)
+        row.deleteLater()
 
-        # Remove from records (by identity on container)
+        # Remove from records (by identity on row)
         self.component_records = [
-            rec for rec in self.component_records if rec["container"] is not container
+            rec for rec in self.component_records if rec["row"] is not row
         ]
+        self.components_changed.emit()
 
         QMessageBox.information(self, "Deleted", "Component deleted.")
 
-        # Optional: if you want to normalize positions visually right away
-        # (no DB write yet), you could re-render titles or numbers here.
-        # Positions are ultimately written on Save.
+        # The remaining components keep their sort keys: deleting never renumbers
 
     def save_changes(self):
         if not self.current_page_id:
             QMessageBox.warning(self, "Save Error", "Please select or create a page first!")
             return
+        if self._active_task is not None:
+            return
 
-        # Update page title
-        self.db.update_page_title(self.current_page_id, self.page_title.text())
-
-        # Persist components in current on-screen order (1..N)
-        position = 1
-        for rec in self.component_records:
-            comp_id = rec["id"]
-            form_widget = rec["form"]
-            comp_type = rec["type"]
-            comp_data = form_widget.get_data()
-
-            if comp_id is None:
-                new_id = self.db.add_component(self.current_page_id, comp_type, comp_data, position)
-                rec["id"] = new_id  # update record with real id
-            else:
-                self.db.update_component(comp_id, comp_data, position)
-            position += 1
-
-        QMessageBox.information(self, "Saved", "Changes saved successfully!")
-        # Let the left panel update titles if changed
-        self.parent().left_panel.load_pages_from_db()
+        # Snapshot on the GUI thread; hashing, JSON and SQLite run in the worker
+        page_id = self.current_page_id
+        title = self.page_title.text()
+        records = list(self.component_records)
+        snapshot = [{
+            'id': rec["id"],
+            'type': rec["type"],
+            'data': rec["row"].get_data(),
+            'saved_hash': rec["saved_hash"],
+            'saved_sort_key': rec["saved_sort_key"],
+        } for rec in records]
+        title_changed = title != self._saved_title
+
+        def on_saved(results):
+            # Let the left panel update titles if changed
+            if title_changed:
+                self.parent().left_panel.page_renamed(page_id, title)
+            # The editor may show another page by now; the records belong to this one
+            if self.current_page_id != page_id:
+                return
+            # Adopt the new ids / saved state now that the transaction has committed
+            self._saved_title = title
+            for rec, result in zip(records, results):
+                rec["id"] = result['id']  # update record with real id
+                rec["saved_hash"], rec["saved_sort_key"] = result['hash'], result['sort_key']
+
+            QMessageBox.information(self, "Saved", "Changes saved successfully!")
+
+        self._run_task(
+            "Saving...",
+            _save_page_job, self.controller, page_id,
+            title if title_changed else None, snapshot,
+            on_finished=on_saved,
+            error_title="Save Failed",
+            saving=True,
+        )
 
     def export_page(self):
         if not self.current_page_id:
             QMessageBox.warning(self, "Export Error", "Please select or create a page first!")
             return
+        if self._active_task is not None:
+            return
+
+        file_path, _ = QFileDialog.getSaveFileName(
+            self, "Save HTML+CSS",
+            f"page_{self.current_page_id}.txt",
+            "Text Files (*.txt)"
+        )
+        if not file_path:
+            return
 
         components_data = []
         for rec in self.component_records:
             components_data.append({
                 'type': rec["type"],
-                'data': rec["form"].get_data()
+                'data': rec["row"].get_data()
             })
 
-        generator = PageGenerator()
-        html_css = generator.generate_page_content(components_data)
-
-        file_path, _ = QFileDialog.getSaveFileName(
-            self, "Save HTML+CSS",
-            f"page_{self.current_page_id}.txt",
-            "Text Files (*.txt)"
+        def on_exported(css_report):
+            QMessageBox.information(
+                self, "Exported",
+                f"Page successfully exported to:\n{file_path}\n\n"
+                f"CSS: {css_report['output_bytes']:,} bytes "
+                f"({css_report['saved_bytes']:,} bytes saved)"
+            )
+
+        self._run_task(
+            "Exporting...",
+            _export_page_job, self.db, components_data, file_path,
+            self.minify_css_checkbox.isChecked(), self.merge_css_checkbox.isChecked(),
+            on_finished=on_exported,
+            error_title="Export Failed",
         )
-        if file_path:
-            with open(file_path, "w", encoding="utf-8") as f:
-                f.write(html_css)
-            QMessageBox.information(self, "Exported", f"Page successfully exported to:\n{file_path}")
+
+    # ---------- background tasks ----------
+
+    def _run_task(self, label, fn, *args, on_finished, error_title, saving=False):
+        """
+        Run fn on the thread pool with progress/cancel UI; one task at a time.
+        A save (saving=True) also locks the rows and the page selection.
+        """
+        task = Task(fn, *args)
+        self._active_task = task
+        self._saving = saving
+        self._set_busy(True, label)
+        if saving:
+            self.saving_changed.emit(True)
+
+        def done():
+            self._active_task = None
+            self._set_busy(False)
+            if self._saving:
+                self._saving = False
+                self.saving_changed.emit(False)
+
+        def finished(result):
+            done()
+            on_finished(result)
+
+        def failed(message):
+            done()
+            QMessageBox.critical(self, error_title, message)
+
+        def progress(value, total, message):
+            self.task_progress.setMaximum(max(total, 1))
+            self.task_progress.setValue(value)
+            if message:
+                self.task_progress.setFormat(f"{message} %p%")
+
+        task.signals.progress.connect(progress)
+        task.signals.finished.connect(finished)
+        task.signals.failed.connect(failed)
+        task.signals.cancelled.connect(done)
+        start_task(task)
+
+    def cancel_active_task(self):
+        if self._active_task is not None:
+            self._active_task.cancel()
+
+    def _set_busy(self, busy, label=""):
+        self.save_btn.setEnabled(not busy)
+        self.export_btn.setEnabled(not busy)
+        if self._saving:
+            self.add_component_btn.setEnabled(not busy)
+        self.task_progress.setVisible(busy)
+        self.cancel_task_btn.setVisible(busy)
+        if busy:
+            self.task_progress.setRange(0, 0)  # indeterminate until the first report
+            self.task_progress.setFormat(f"{label} %p%")
+
+
+# ---------- worker-thread jobs (plain data in, plain data out) ----------
+
+def _save_page_job(task, controller, page_id, title, components):
+    return controller.save_page_changes(
+        page_id, title, components,
+        progress=task.report, check_cancelled=task.check_cancelled
+    )
+
+def _export_page_job(task, db, components_data, file_path, minify, merge):
+    # Jinja2 is only needed once something is rendered; keep it off the startup path
+    from controllers.page_generator import get_page_generator
+
+    def on_progress(done, total):
+        # Raising Cancelled here stops the render; the temporary file is removed
+        task.check_cancelled()
+        task.report(done, total, f"Rendered {done}/{total} components")
+
+    generator = get_page_generator()
+    # Reuse components rendered by earlier exports of this database
+    generator.render_cache.attach(db)
+    return generator.export_page_to_file(
+        components_data, file_path, minify_css=minify, merge_css=merge, progress=on_progress
+    )
@@ -0,0 +1,75 @@
+import threading
+import traceback
+
+from PyQt5.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+
+from controllers import instrumentation
+
+
+class Cancelled(Exception):
+    """Raised inside a task function to stop early (see Task.check_cancelled)."""
+
+
+class TaskSignals(QObject):
+    # Emitted from the worker thread, delivered on the GUI thread
+    progress = pyqtSignal(int, int, str)  # done, total, message
+    finished = pyqtSignal(object)         # return value of the task function
+    failed = pyqtSignal(str)              # error message (with traceback)
+    cancelled = pyqtSignal()
+
+
+class Task(QRunnable):
+    """
+    Runs fn(task, *args, **kwargs) on the global QThreadPool. The function
+    reports progress with task.report(...) and should call
+    task.check_cancelled() between units of work.
+
+    Only plain data (snapshots taken on the GUI thread) should be passed in:
+    widgets must never be touched from the worker thread. Database access is
+    safe because every thread gets its own SQLite connection.
+    """
+
+    def __init__(self, fn, *args, **kwargs):
+        super().__init__()
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.signals = TaskSignals()
+        self._cancel_event = threading.Event()
+
+    def cancel(self):
+        self._cancel_event.set()
+
+    def is_cancelled(self) -> bool:
+        return self._cancel_event.is_set()
+
+    def check_cancelled(self):
+        if self._cancel_event.is_set():
+            raise Cancelled()
+
+    def report(self, done, total, message=""):
+        self.signals.progress.emit(done, total, message)
+
+    def run(self):
+        try:
+            with instrumentation.span("task", getattr(self.fn, "__name__", "task")):
+                result = self.fn(self, *self.args, **self.kwargs)
+        except Cancelled:
+            self.signals.cancelled.emit()
+        except Exception as e:
+            self.signals.failed.emit(f"{e}\n\n{traceback.format_exc()}")
+        else:
+            self.signals.finished.emit(result)
+
+
+# Tasks are kept referenced here until they complete, so their signal objects
+# aren't garbage collected while the worker thread still emits on them.
+_running = set()
+
+
+def start_task(task: Task) -> Task:
+    _running.add(task)
+    for signal in (task.signals.finished, task.signals.failed, task.signals.cancelled):
+        signal.connect(lambda *_: _running.discard(task))
+    QThreadPool.globalInstance().start(task)
+    return task